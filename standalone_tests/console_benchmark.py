@@ -0,0 +1,74 @@
+"""run console capture benchmark.
+
+Replays a tqdm progress bar and plain log lines through the terminal emulator
+console capture uses and reports MB/s for each, then reports how many writes
+per second the user's thread makes with stdout wrapped:
+
+    python standalone_tests/console_benchmark.py --bar-steps 20000 --writes 100000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import six
+import tqdm
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wandb.sdk.lib import redirect  # noqa: E402
+
+
+def replay(stream, chunk_size=4096):
+    """Returns the MB/s the emulator processes `stream` at."""
+    emulator = redirect.TerminalEmulator()
+    start = time.time()
+    for i in range(0, len(stream), chunk_size):
+        emulator.write(stream[i : i + chunk_size])
+        if i % (chunk_size * 50) == 0:
+            emulator.read()
+    emulator.read()
+    return len(stream) / (time.time() - start) / 1e6
+
+
+def write_rate(writes):
+    start = time.time()
+    for i in range(writes):
+        sys.stdout.write("step %i\n" % i)
+    return writes / (time.time() - start)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run console capture benchmark")
+    parser.add_argument("--bar-steps", type=int, default=20000)
+    parser.add_argument("--log-lines", type=int, default=50000)
+    parser.add_argument("--writes", type=int, default=100000)
+    args = parser.parse_args()
+
+    bar = six.StringIO()
+    for _ in tqdm.tqdm(range(args.bar_steps), file=bar, mininterval=0, ncols=100):
+        pass
+    log = "".join(
+        "INFO step %i loss %.4f\n" % (i, 1.0 / (i + 1)) for i in range(args.log_lines)
+    )
+    print(
+        "emulator: tqdm %.2f MB/s, log %.2f MB/s"
+        % (replay(bar.getvalue()), replay(log))
+    )
+
+    stdout = sys.stdout
+    sys.stdout = six.StringIO()
+    try:
+        raw_rate = write_rate(args.writes)
+        wrapper = redirect.StreamWrapper("stdout", [lambda data: None])
+        wrapper.install()
+        wrapped_rate = write_rate(args.writes)
+        wrapper.uninstall()
+    finally:
+        sys.stdout = stdout
+    print("writes: %.0f/sec raw, %.0f/sec wrapped" % (raw_rate, wrapped_rate))
+
+
+if __name__ == "__main__":
+    main()
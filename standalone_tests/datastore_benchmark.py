@@ -0,0 +1,69 @@
+"""run datastore benchmark.
+
+Writes many small history records to a transaction log and reports how fast
+they are written and scanned back:
+
+    python standalone_tests/datastore_benchmark.py --records 100000
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import wandb  # noqa: E402
+from wandb.proto import wandb_internal_pb2  # noqa: E402
+from wandb.sdk.internal import datastore  # noqa: E402
+
+
+def history_record(i, size):
+    rec = wandb_internal_pb2.Record()
+    item = rec.history.item.add()
+    item.key = "k"
+    item.value_json = json.dumps("x" * size + str(i))
+    return rec
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run datastore benchmark")
+    parser.add_argument("--records", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=10)
+    args = parser.parse_args()
+
+    wandb._set_internal_process()
+    tmpdir = tempfile.TemporaryDirectory()
+    fname = os.path.join(tmpdir.name, "run.wandb")
+    records = [history_record(i, args.size) for i in range(args.records)]
+
+    ds = datastore.DataStore()
+    ds.open_for_write(fname, index=True)
+    start = time.time()
+    for rec in records:
+        ds.write(rec)
+    ds.close()
+    write_elapsed = time.time() - start
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(fname)
+    start = time.time()
+    scanned = 0
+    while ds.scan_data() is not None:
+        scanned += 1
+    scan_elapsed = time.time() - start
+    ds.close()
+
+    print(
+        "%i records: write %.0f records/sec, scan %.0f records/sec"
+        % (args.records, args.records / write_elapsed, args.records / scan_elapsed)
+    )
+    if scanned != args.records:
+        print("only scanned %i of %i records" % (scanned, args.records))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+"""run file stream benchmark.
+
+Streams history lines through FileStreamApi to a local stand-in file_stream
+endpoint and reports lines/sec along with the post stats:
+
+    python standalone_tests/file_stream_benchmark.py --lines 5000 --latency 0.005
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wandb.sdk.internal import file_stream  # noqa: E402
+from tests.utils.file_stream_server import StandInApi, StandInServer  # noqa: E402
+
+
+class FileStreamApi(file_stream.FileStreamApi):
+    def rate_limit_seconds(self):
+        return 0.01
+
+
+def stream_history(args, compression, max_inflight):
+    line = json.dumps({"key_%i" % i: i * 0.5 for i in range(args.keys)})
+    server = StandInServer(latency=args.latency)
+    try:
+        fs = FileStreamApi(
+            StandInApi(server.base_url),
+            "run",
+            time.time(),
+            compression=compression,
+            max_inflight=max_inflight,
+        )
+        fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+        fs.set_file_policy("output.log", file_stream.CRDedupeFilePolicy())
+        fs.start()
+        start = time.time()
+        for i in range(args.lines):
+            fs.push("wandb-history.jsonl", line)
+            if i % 10 == 0:
+                fs.push("output.log", "2020-01-01T00:00:00 step %i\n" % i)
+        fs.finish(0)
+        elapsed = time.time() - start
+    finally:
+        server.stop()
+    return elapsed, fs.stats(), len(server.received)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run file stream benchmark")
+    parser.add_argument("--lines", type=int, default=5000)
+    parser.add_argument("--keys", type=int, default=50)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.005,
+        help="seconds the stand-in endpoint takes to answer each post",
+    )
+    args = parser.parse_args()
+
+    failed = False
+    for compression in (None, "gzip"):
+        for max_inflight in (1, 4):
+            elapsed, stats, received = stream_history(args, compression, max_inflight)
+            print(
+                "compression=%s max_inflight=%i: %.0f history lines/sec, %i posts, "
+                "%i payload bytes, %i sent bytes, %.4fs max latency"
+                % (
+                    compression,
+                    max_inflight,
+                    args.lines / elapsed,
+                    stats["posts"],
+                    stats["payload_bytes"],
+                    stats["sent_bytes"],
+                    stats["latency_max"],
+                )
+            )
+            if received != args.lines or stats["failed_posts"]:
+                print("only %i of %i lines were received" % (received, args.lines))
+                failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
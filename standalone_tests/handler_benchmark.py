@@ -0,0 +1,62 @@
+"""run history handler benchmark.
+
+Feeds wide history records through the internal process's HandleManager and
+reports records/sec:
+
+    python standalone_tests/handler_benchmark.py --keys 1000 --records 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import threading
+import time
+
+from six.moves import queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import wandb  # noqa: E402
+from wandb.proto import wandb_internal_pb2 as pb  # noqa: E402
+from wandb.sdk.internal.handler import HandleManager  # noqa: E402
+
+
+def history_record(keys, step):
+    record = pb.Record()
+    for k in range(keys):
+        item = record.history.item.add()
+        item.key = "key_%i" % k
+        item.value_json = json.dumps(step * k)
+    record.history.step.num = step
+    return record
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run history handler benchmark")
+    parser.add_argument("--keys", type=int, default=1000)
+    parser.add_argument("--records", type=int, default=50)
+    args = parser.parse_args()
+
+    records = [history_record(args.keys, step) for step in range(args.records)]
+    hm = HandleManager(
+        settings=wandb.Settings(mode="offline"),
+        record_q=queue.Queue(),
+        result_q=queue.Queue(),
+        stopped=threading.Event(),
+        sender_q=queue.Queue(),
+        writer_q=queue.Queue(),
+        interface=None,
+    )
+    start = time.time()
+    for record in records:
+        hm.handle_history(record)
+    elapsed = time.time() - start
+    print(
+        "%i records of %i keys: %.3fs, %.1f records/sec"
+        % (args.records, args.keys, elapsed, args.records / elapsed)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""run import benchmark.
+
+Times `import wandb` in fresh interpreters with `python -X importtime` and
+reports the number of modules it loads and the slowest imports:
+
+    python standalone_tests/import_benchmark.py --runs 5 --max-modules 900
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+
+
+def import_wandb():
+    """Imports wandb in a new interpreter.
+
+    Returns:
+        (modules, imports) where modules is the number of modules loaded and
+            imports is a list of (cumulative_us, module) for every import.
+    """
+    proc = subprocess.run(
+        [
+            sys.executable,
+            "-X",
+            "importtime",
+            "-c",
+            "import sys; import wandb; print(len(sys.modules))",
+        ],
+        cwd=ROOT,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        universal_newlines=True,
+        check=True,
+    )
+    imports = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        if cumulative.strip().isdigit():
+            imports.append((int(cumulative), module.strip()))
+    return int(proc.stdout.split()[-1]), imports
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run import benchmark")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=20)
+    parser.add_argument(
+        "--max-modules",
+        type=int,
+        help="fail if import wandb loads more modules than this",
+    )
+    parser.add_argument(
+        "--max-ms", type=float, help="fail if import wandb takes longer than this"
+    )
+    args = parser.parse_args()
+
+    # warm the filesystem and bytecode caches
+    import_wandb()
+    runs = [import_wandb() for _ in range(args.runs)]
+    modules = max(m for m, _ in runs)
+    # the run with the median total time
+    runs.sort(key=lambda run: dict((m, t) for t, m in run[1])["wandb"])
+    _, imports = runs[len(runs) // 2]
+    total_ms = dict((m, t) for t, m in imports)["wandb"] / 1000.0
+
+    for cumulative, module in sorted(imports, reverse=True)[: args.top]:
+        print("%10.1fms  %s" % (cumulative / 1000.0, module))
+    print("import wandb: %.1fms, %i modules loaded" % (total_ms, modules))
+
+    failed = False
+    if args.max_modules is not None and modules > args.max_modules:
+        print("loaded %i modules, more than %i" % (modules, args.max_modules))
+        failed = True
+    if args.max_ms is not None and total_ms > args.max_ms:
+        print("took %.1fms, longer than %.1fms" % (total_ms, args.max_ms))
+        failed = True
+    if failed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""run media encode benchmark.
+
+Builds a batch of wandb.Image objects from numpy arrays, synchronously and
+on the media encode pool (WANDB_MEDIA_ENCODE_THREADS), and reports the time
+spent on the caller's thread and until every file is written:
+
+    python standalone_tests/media_encode_benchmark.py --images 32 --threads 4
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import wandb  # noqa: E402
+
+
+def encode_batch(batch):
+    start = time.time()
+    images = [wandb.Image(data) for data in batch]
+    created = time.time() - start
+    for image in images:
+        image._resolve_file()
+    return created, time.time() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run media encode benchmark")
+    parser.add_argument("--images", type=int, default=32)
+    parser.add_argument("--size", type=int, default=256)
+    parser.add_argument("--threads", type=int, default=4)
+    args = parser.parse_args()
+
+    batch = [
+        np.random.randint(255, size=(args.size, args.size, 3)).astype(np.uint8)
+        for _ in range(args.images)
+    ]
+    os.environ["WANDB_MEDIA_ENCODE_THREADS"] = "0"
+    sync_created, sync_total = encode_batch(batch)
+    os.environ["WANDB_MEDIA_ENCODE_THREADS"] = str(args.threads)
+    pool_created, pool_total = encode_batch(batch)
+    print(
+        "%i images of %ix%i: sync %.3fs, pool of %i %.3fs (%.3fs on the caller)"
+        % (
+            args.images,
+            args.size,
+            args.size,
+            sync_total,
+            args.threads,
+            pool_total,
+            pool_created,
+        )
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,113 @@
+"""run public api benchmark.
+
+Reads from a stand-in server that takes `--latency` seconds to answer each
+history query and `--page-latency` seconds for each page of runs. Reports
+history rows/sec exported with and without pages prefetched, the time to
+fetch the histories of many runs one run at a time versus with
+Runs.histories, and runs/sec listed sequentially, prefetched, and prefetched
+with only the summary key projected:
+
+    python standalone_tests/public_api_benchmark.py --rows 50000 --runs 500
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wandb.apis import public  # noqa: E402
+from tests.utils.public_api_stubs import (  # noqa: E402
+    STUB_RUN,
+    StubHistoryClient,
+    StubRunsClient,
+)
+
+
+def history_scan(args):
+    rates = []
+    for prefetch in (0, 4):
+        scan = public.HistoryScan(
+            StubHistoryClient(latency=args.latency),
+            STUB_RUN,
+            0,
+            args.rows,
+            page_size=1000,
+            prefetch=prefetch,
+        )
+        start = time.time()
+        rows = sum(1 for _ in scan)
+        rates.append(rows / (time.time() - start))
+    print(
+        "history scan: %.0f rows/sec, %.0f rows/sec with 4 pages prefetched"
+        % tuple(rates)
+    )
+
+
+def run_histories(args):
+    runs = public.Runs(StubRunsClient(args.runs, latency=args.latency), "test", "test")
+    list(runs)
+
+    start = time.time()
+    for run in runs:
+        run.history(keys=["loss"], pandas=False)
+    sequential = time.time() - start
+
+    start = time.time()
+    runs.histories(keys=["loss"])
+    batched = time.time() - start
+    print(
+        "histories of %i runs: %.2fs one run at a time, %.2fs with Runs.histories"
+        % (args.runs, sequential, batched)
+    )
+
+
+def runs_list(args):
+    rates = []
+    for kwargs in [
+        {},
+        {"prefetch": True, "max_per_page": 1000},
+        {"prefetch": True, "max_per_page": 1000, "fields": ["summary.loss"]},
+    ]:
+        runs = public.Runs(
+            StubRunsClient(args.listed_runs, latency=args.page_latency),
+            "test",
+            "test",
+            **kwargs
+        )
+        start = time.time()
+        listed = sum(1 for _ in runs)
+        rates.append(listed / (time.time() - start))
+    print(
+        "runs listing: sequential %.0f runs/sec, prefetched %.0f runs/sec, "
+        "projected %.0f runs/sec" % tuple(rates)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run public api benchmark")
+    parser.add_argument("--rows", type=int, default=50000)
+    parser.add_argument("--runs", type=int, default=500)
+    parser.add_argument("--listed-runs", type=int, default=5000)
+    parser.add_argument(
+        "--latency",
+        type=float,
+        default=0.01,
+        help="seconds the stand-in server takes to answer each query",
+    )
+    parser.add_argument(
+        "--page-latency",
+        type=float,
+        default=0.05,
+        help="seconds the stand-in server takes to answer each page of runs",
+    )
+    args = parser.parse_args()
+
+    history_scan(args)
+    run_histories(args)
+    runs_list(args)
+
+
+if __name__ == "__main__":
+    main()
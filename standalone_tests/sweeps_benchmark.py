@@ -0,0 +1,128 @@
+"""run sweeps benchmark.
+
+Times Bayesian suggestions for different history and batch sizes, suggesting
+runs from a large grid in order and in randomized order, and hyperband early
+stopping over many synthetic runs, from scratch and again after a few runs
+grew:
+
+    python standalone_tests/sweeps_benchmark.py --runs 100 --hyperband-runs 10000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wandb.sweeps import (  # noqa: E402
+    bayes_search,
+    grid_search,
+    hyperband_stopping,
+    RunState,
+    SweepRun,
+)
+
+
+def bayes(args):
+    config = {
+        "method": "bayes",
+        "metric": {"name": "loss", "goal": "minimize"},
+        "parameters": {
+            "x": {"min": -2.0, "max": 2.0},
+            "y": {"min": -2.0, "max": 2.0},
+            "z": {"min": 1, "max": 10},
+        },
+    }
+    rng = np.random.RandomState(0)
+    for num_runs in (10, 50, 100):
+        runs = []
+        for _ in range(num_runs):
+            x, y, z = rng.uniform(-2, 2), rng.uniform(-2, 2), int(rng.randint(1, 10))
+            runs.append(
+                SweepRun(
+                    config={"x": {"value": x}, "y": {"value": y}, "z": {"value": z}},
+                    state=RunState.finished,
+                    summary_metrics={"loss": x ** 2 + (y - 1) ** 2 + z / 10.0},
+                )
+            )
+        for n in (1, 4, 16):
+            start = time.time()
+            bayes_search.bayes_search_next_runs(runs, config, n=n)
+            print(
+                "bayes suggestions: %i runs, batch of %i: %.3fs"
+                % (num_runs, n, time.time() - start)
+            )
+
+
+def grid(args):
+    config = {
+        "method": "grid",
+        "parameters": {
+            "p%i" % i: {"values": list(range(args.values))} for i in range(args.params)
+        },
+    }
+    start = time.time()
+    runs = grid_search.grid_search_next_runs([], config, n=args.runs)
+    ordered = time.time() - start
+    start = time.time()
+    grid_search.grid_search_next_runs(runs, config, n=args.runs, randomize_order=True)
+    randomized = time.time() - start
+    print(
+        "grid search: %i runs from a %i^%i grid in %.3fs, %i more randomized in %.3fs"
+        % (args.runs, args.values, args.params, ordered, args.runs, randomized)
+    )
+
+
+def hyperband(args):
+    config = {
+        "method": "grid",
+        "metric": {"name": "loss", "goal": "minimize"},
+        "early_terminate": {"type": "hyperband", "max_iter": 27, "eta": 3, "s": 3},
+        "parameters": {"a": {"values": [1, 2, 3]}},
+    }
+    rng = np.random.RandomState(0)
+    runs = []
+    for i in range(args.hyperband_runs):
+        losses = np.cumsum(rng.uniform(-1, 0.5, size=rng.randint(0, 30))) + 10
+        runs.append(
+            SweepRun(
+                name="run-%i" % i,
+                state=RunState.running if i % 2 else RunState.finished,
+                history=[
+                    {"loss": float(loss), "_step": j} for j, loss in enumerate(losses)
+                ],
+            )
+        )
+    state = hyperband_stopping.HyperbandState()
+    start = time.time()
+    hyperband_stopping.hyperband_stop_runs(runs, config, state=state)
+    full = time.time() - start
+    for run in runs[:100]:
+        run.history.append({"loss": 100.0})
+    start = time.time()
+    hyperband_stopping.hyperband_stop_runs(runs, config, state=state)
+    incremental = time.time() - start
+    print(
+        "hyperband over %i runs: %.3fs full, %.3fs incremental"
+        % (args.hyperband_runs, full, incremental)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run sweeps benchmark")
+    parser.add_argument("--params", type=int, default=8)
+    parser.add_argument("--values", type=int, default=10)
+    parser.add_argument("--runs", type=int, default=100)
+    parser.add_argument("--hyperband-runs", type=int, default=10000)
+    args = parser.parse_args()
+
+    bayes(args)
+    grid(args)
+    hyperband(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,43 @@
+"""run table benchmark.
+
+Builds a wandb.Table row by row with add_data and in one call with add_rows,
+and reports the time each takes:
+
+    python standalone_tests/table_benchmark.py --rows 20000
+"""
+
+import argparse
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import wandb  # noqa: E402
+
+COLUMNS = ["i", "s", "f", "b"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run table benchmark")
+    parser.add_argument("--rows", type=int, default=20000)
+    args = parser.parse_args()
+
+    rows = [[i, str(i), i / 2.0, i % 2 == 0] for i in range(args.rows)]
+
+    start = time.time()
+    table = wandb.Table(columns=COLUMNS)
+    for row in rows:
+        table.add_data(*row)
+    per_row = time.time() - start
+
+    start = time.time()
+    bulk = wandb.Table(columns=COLUMNS)
+    bulk.add_rows(rows)
+    in_bulk = time.time() - start
+
+    print("%i rows: add_data %.3fs, add_rows %.3fs" % (args.rows, per_row, in_bulk))
+
+
+if __name__ == "__main__":
+    main()
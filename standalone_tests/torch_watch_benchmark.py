@@ -0,0 +1,66 @@
+"""run torch watch benchmark.
+
+Trains stacks of linear layers in an offline run and reports the per-step
+overhead of wandb.watch(log="all"), with a histogram copied to the host per
+tensor and with the histograms computed on the device and copied in one batch
+(the path used for accelerators):
+
+    python standalone_tests/torch_watch_benchmark.py --layers 10 50 200
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+import torch
+from torch import nn
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import wandb  # noqa: E402
+from wandb import wandb_torch  # noqa: E402
+
+
+def overhead(num_layers, steps):
+    net = nn.Sequential(*[nn.Linear(64, 64) for _ in range(num_layers)])
+    inputs = torch.randn(16, 64)
+
+    def step():
+        start = time.time()
+        net(inputs).sum().backward()
+        wandb.log({"a": 1})
+        return time.time() - start
+
+    baseline = min(step() for _ in range(steps))
+    wandb.watch(net, log="all", log_freq=1, idx=num_layers)
+    per_tensor = min(step() for _ in range(steps))
+    should_defer = wandb_torch.TorchHistory._should_defer_stats
+    wandb_torch.TorchHistory._should_defer_stats = lambda self, tensor: True
+    try:
+        deferred = min(step() for _ in range(steps))
+    finally:
+        wandb_torch.TorchHistory._should_defer_stats = should_defer
+    wandb.unwatch(net)
+    return (per_tensor - baseline) * 1000, (deferred - baseline) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run torch watch benchmark")
+    parser.add_argument("--layers", type=int, nargs="+", default=[10, 50, 200])
+    parser.add_argument("--steps", type=int, default=5)
+    args = parser.parse_args()
+
+    run = wandb.init(mode="offline", dir=tempfile.mkdtemp())
+    for num_layers in args.layers:
+        print(
+            "watch overhead for %i tensors: %.2f ms/step per tensor, "
+            "%.2f ms/step deferred"
+            % ((num_layers * 2,) + overhead(num_layers, args.steps))
+        )
+    run.finish()
+
+
+if __name__ == "__main__":
+    main()
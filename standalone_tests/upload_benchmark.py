@@ -0,0 +1,94 @@
+"""run file upload benchmark.
+
+Uploads many tiny files through the file pusher's upload step to a local
+stand-in object store and reports files/sec:
+
+    python standalone_tests/upload_benchmark.py --files 100000 --jobs 64
+"""
+
+import argparse
+import os
+import sys
+import tempfile
+import time
+
+from six.moves import queue
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from wandb.apis import internal  # noqa: E402
+from wandb.filesync import stats, step_upload  # noqa: E402
+from tests.utils.object_store import ObjectStore, ObjectStoreApi  # noqa: E402
+
+
+class FileStream(object):
+    def push_success(self, artifact_id, save_name):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description="run file upload benchmark")
+    parser.add_argument("--files", type=int, default=100000)
+    parser.add_argument("--size", type=int, default=16)
+    parser.add_argument("--jobs", type=int, default=64)
+    parser.add_argument(
+        "--url-latency",
+        type=float,
+        default=0.1,
+        help="seconds the stand-in backend takes to hand out upload urls",
+    )
+    args = parser.parse_args()
+
+    os.environ.setdefault("WANDB_API_KEY", "X" * 40)
+    tmpdir = tempfile.TemporaryDirectory()
+    upload_stats = stats.Stats()
+    names = ["media/file%i.bin" % i for i in range(args.files)]
+    for name in names:
+        path = os.path.join(tmpdir.name, name)
+        if not os.path.isdir(os.path.dirname(path)):
+            os.makedirs(os.path.dirname(path))
+        with open(path, "wb") as f:
+            f.write(os.urandom(args.size))
+
+    store = ObjectStore()
+    event_queue = queue.Queue()
+    step = step_upload.StepUpload(
+        ObjectStoreApi(internal.Api().api, store, args.url_latency),
+        upload_stats,
+        event_queue,
+        args.jobs,
+        FileStream(),
+    )
+    start = time.time()
+    step.start()
+    for name in names:
+        upload_stats.init_file(name, args.size)
+        event_queue.put(
+            step_upload.RequestUpload(
+                os.path.join(tmpdir.name, name), name, None, None, False, None, None
+            )
+        )
+    event_queue.put(step_upload.RequestFinish(None))
+    step._thread.join()
+    elapsed = time.time() - start
+    store.stop()
+
+    throughput = upload_stats.throughput()
+    print(
+        "%i files of %i bytes with %i jobs: %.1fs, %.0f files/sec, %i connections"
+        % (
+            throughput["completed_files"],
+            args.size,
+            args.jobs,
+            elapsed,
+            throughput["completed_files"] / elapsed,
+            store.connections,
+        )
+    )
+    if len(store.objects) != args.files:
+        print("only %i of %i files were uploaded" % (len(store.objects), args.files))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,6 +1,9 @@
-import pytest
+import os
+import subprocess
 import sys
 
+import pytest
+
 
 def test_path_is_unchanged():
     # Ideally we would compare directly to the user's starting path,
@@ -10,3 +13,79 @@ def test_path_is_unchanged():
 
     for item in sys.path:
         assert "wandb/vendor" not in item
+
+
+def test_import_is_lazy():
+    # these are slow to import, so they're imported when first used
+    lazy_modules = [
+        "IPython",
+        "wandb.apis.public",
+        "wandb.data_types",
+        "wandb.plot",
+        "wandb.plots",
+        "wandb.sdk.internal.internal",
+        "wandb.sdk.internal.profiler",
+        "wandb.wandb_agent",
+        "wandb.wandb_torch",
+    ]
+    import wandb
+
+    output = subprocess.check_output(
+        [sys.executable, "-c", "import sys, wandb; print(' '.join(sys.modules))"],
+        cwd=os.path.dirname(os.path.dirname(wandb.__file__)),
+    )
+    modules = output.decode().split()
+    assert "wandb" in modules
+    assert [m for m in lazy_modules if m in modules] == []
+
+
+def test_lazy_attributes():
+    import wandb
+
+    assert wandb.Api is wandb.PublicApi is wandb.apis.public.Api
+    assert wandb.Image is wandb.data_types.Image
+    assert wandb.agent is wandb.wandb_agent.agent
+    assert wandb.plot.line is not None
+    assert wandb.profiler.torch_trace_handler is not None
+    assert isinstance(wandb.api, wandb.apis.InternalApi)
+    assert "Table" in dir(wandb)
+    with pytest.raises(AttributeError):
+        wandb.not_an_attribute
+
+
+def test_lazy_submodules():
+    import wandb
+
+    # submodules `import wandb` no longer imports are still attributes of
+    # their packages
+    code = (
+        "import wandb; "
+        "wandb.wandb_sdk.internal.datastore.DataStore; "
+        "wandb.filesync.step_upload.StepUpload; "
+        "wandb.sdk.lib.handler_util.WANDB_TYPES; "
+        "wandb.agents.pyagent.pyagent"
+    )
+    subprocess.check_call(
+        [sys.executable, "-c", code],
+        cwd=os.path.dirname(os.path.dirname(wandb.__file__)),
+    )
+    with pytest.raises(AttributeError):
+        wandb.sdk.internal.not_a_module
+
+
+def test_lazy_submodule_missing_dependency(tmp_path, monkeypatch):
+    package = tmp_path / "lazy_pkg"
+    package.mkdir()
+    (package / "__init__.py").write_text(
+        "def __getattr__(name):\n"
+        "    from wandb.sdk.lib.lazyloader import import_submodule\n"
+        "    return import_submodule(__name__, name)\n"
+    )
+    (package / "needs_dep.py").write_text("import not_an_installed_dependency\n")
+    monkeypatch.syspath_prepend(str(tmp_path))
+    import lazy_pkg
+
+    assert not hasattr(lazy_pkg, "needs_dep")
+    with pytest.raises(AttributeError) as e:
+        lazy_pkg.needs_dep
+    assert isinstance(e.value.__cause__, ImportError)
@@ -276,3 +276,88 @@ def test_remove_infs_nans(test_input, expected, wandb_init_run):
     torch_history = wandb.wandb_torch.TorchHistory(wandb.run.history)
 
     assert torch.equal(torch_history._remove_infs_nans(test_input), expected)
+
+
+@pytest.mark.parametrize(
+    "test_input",
+    [
+        torch.randn(1000),
+        torch.randn(30, 40) * 100,
+        torch.ones(50),
+        torch.Tensor([1.0, float("nan"), 3.0, float("inf")]),
+        torch.randn(100).half(),
+        torch.randn(100, dtype=torch.float64),
+    ],
+)
+def test_queued_tensor_stats_match(test_input, wandb_init_run, monkeypatch):
+    history = wandb.run.history
+    torch_history = wandb.wandb_torch.TorchHistory(history)
+    # exercise the deferred path used for accelerators
+    monkeypatch.setattr(torch_history, "_should_defer_stats", lambda tensor: True)
+
+    torch_history.log_tensor_stats(test_input, "direct")
+    torch_history._queue_tensor_stats(test_input, "queued")
+    assert "queued" not in history._data
+    torch_history._flush_tensor_stats()
+
+    direct = history._data["direct"]
+    queued = history._data["queued"]
+    assert queued.histogram == direct.histogram
+    assert queued.bins == direct.bins
+
+
+def test_queued_tensor_stats_bfloat16(wandb_init_run, monkeypatch):
+    history = wandb.run.history
+    torch_history = wandb.wandb_torch.TorchHistory(history)
+    monkeypatch.setattr(torch_history, "_should_defer_stats", lambda tensor: True)
+
+    tensor = torch.randn(1000).bfloat16()
+    # binned like the same values in float32
+    torch_history.log_tensor_stats(tensor.float(), "direct")
+    torch_history._queue_tensor_stats(tensor, "queued")
+    torch_history._flush_tensor_stats()
+
+    direct = history._data["direct"]
+    queued = history._data["queued"]
+    assert queued.histogram == direct.histogram
+    assert queued.bins == direct.bins
+
+
+def test_queued_tensor_stats_no_finite_values(wandb_init_run, monkeypatch):
+    history = wandb.run.history
+    torch_history = wandb.wandb_torch.TorchHistory(history)
+    monkeypatch.setattr(torch_history, "_should_defer_stats", lambda tensor: True)
+
+    torch_history._queue_tensor_stats(torch.Tensor([float("nan")] * 3), "nan")
+    torch_history._queue_tensor_stats(torch.Tensor([]), "empty")
+    torch_history._flush_tensor_stats()
+    assert "nan" not in history._data
+    assert "empty" not in history._data
+
+
+def test_watch_deferred_one_host_copy_per_step(wandb_init_run, monkeypatch):
+    net = nn.Sequential(*[nn.Linear(8, 8) for _ in range(5)])
+    inputs = dummy_torch_tensor((4, 8))
+    wandb.watch(net, log="all", log_freq=1, idx=0)
+    # force the deferred path used for accelerators
+    monkeypatch.setattr(
+        wandb.wandb_torch.TorchHistory, "_should_defer_stats", lambda self, t: True
+    )
+    cpu = torch.Tensor.cpu
+    copies = []
+
+    def counting_cpu(self, *args, **kwargs):
+        copies.append(tuple(self.shape))
+        return cpu(self, *args, **kwargs)
+
+    monkeypatch.setattr(torch.Tensor, "cpu", counting_cpu)
+    for _ in range(2):
+        net(inputs).sum().backward()
+        wandb.log({"a": 1})
+    monkeypatch.undo()
+
+    # parameters and gradients of 5 layers, copied to the host once per step
+    assert copies == [(20, 67)] * 2
+    row = wandb.run._backend.history[-1]
+    assert len(row["parameters/0.weight"]["bins"]) == 65
+    assert len(row["gradients/4.bias"]["bins"]) == 65
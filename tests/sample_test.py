@@ -38,3 +38,43 @@ def test_all():
         for n in range(1000):
             l = doit(n, samples=s)
             check(n, l, samples=s)
+
+
+def test_types():
+    s = sample.UniformSampleAccumulator()
+    s.add(0.5)
+    s.add(1.5)
+    assert s.get() == (0.5, 1.5)
+    # ints are kept exactly, even past what a double holds
+    s.add(2 ** 53 + 1)
+    s.add(10 ** 400)
+    assert s.get() == (0.5, 1.5, 2 ** 53 + 1, 10 ** 400)
+    assert isinstance(s.get()[2], int)
+
+
+def test_int_types():
+    s = sample.UniformSampleAccumulator()
+    for n in range(3):
+        s.add(n)
+    assert s.get() == (0, 1, 2)
+    assert all(type(v) is int for v in s.get())
+    assert s._bucket.typecode == "q"
+    # once a float is kept, ints are reported as floats like the rest
+    s.add(3.5)
+    assert s.get() == (0.0, 1.0, 2.0, 3.5)
+    assert all(type(v) is float for v in s.get())
+    # values outside the int64 range are kept exactly
+    s = sample.UniformSampleAccumulator()
+    s.add(1)
+    s.add(-(2 ** 70))
+    assert s.get() == (1, -(2 ** 70))
+
+
+def test_int_types_after_float_evicted():
+    s = sample.UniformSampleAccumulator()
+    s.add(0.5)
+    for n in range(1, 1000):
+        s.add(n)
+    # the float has been evicted, so the ints left are reported as ints again
+    assert all(type(v) is int for v in s.get())
+    assert s._bucket.typecode == "q"
@@ -952,6 +952,58 @@ def test_sync_wandb_run(runner, live_mock_server):
         assert "wandb: ERROR Nothing to sync." in result.output
 
 
+def test_sync_wandb_run_parallel(runner, live_mock_server):
+    with runner.isolated_filesystem():
+        run_dirs = []
+        for i in range(4):
+            run_dir = os.path.join(
+                "wandb", "offline-run-20210216_15440{}-g9dvvkua".format(i)
+            )
+            utils.fixture_copy(
+                os.path.join("wandb", "offline-run-20210216_154407-g9dvvkua"), run_dir
+            )
+            run_dirs.append(run_dir)
+
+        result = runner.invoke(cli.sync, ["--sync-all", "--parallel", "2"])
+        print(result.output)
+        print(traceback.print_tb(result.exc_info[2]))
+        assert result.exit_code == 0
+        assert result.output.count("done: ") == 4
+        assert "records/sec" in result.output
+        for run_dir in run_dirs:
+            assert os.path.exists(os.path.join(run_dir, "run-g9dvvkua.wandb.synced"))
+
+        # Check we marked the runs as synced
+        result = runner.invoke(cli.sync, ["--sync-all"])
+        assert result.exit_code == 0
+        assert "wandb: ERROR Nothing to sync." in result.output
+
+
+def test_sync_tensorboard_dir_per_item(monkeypatch, tmp_path):
+    from wandb.sdk.internal import sender
+    from wandb.sync import sync
+
+    root_dirs = []
+
+    def send_tensorboard(self, tb_root, tb_logdirs, send_manager, root_dir):
+        assert os.path.isdir(root_dir)
+        root_dirs.append(root_dir)
+
+    monkeypatch.setattr(
+        sync.SyncThread, "_find_tfevent_files", lambda self, item: (1, [item], item)
+    )
+    monkeypatch.setattr(sync.SyncThread, "_send_tensorboard", send_tensorboard)
+    monkeypatch.setattr(sender.SendManager, "setup", lambda root_dir: None)
+    items = []
+    for name in ("a", "b"):
+        (tmp_path / name).mkdir()
+        items.append(str(tmp_path / name))
+
+    sync.SyncThread(items).run()
+    assert len(set(root_dirs)) == 2
+    assert not any(os.path.exists(root_dir) for root_dir in root_dirs)
+
+
 @pytest.mark.skipif(
     sys.version_info >= (3, 9), reason="Tensorboard not currently built for 3.9"
 )
@@ -222,6 +222,83 @@ def test_max_images(caplog, mocked_run):
     assert os.path.exists(os.path.join(mocked_run.dir, "media/images/test2_0_0.png"))
 
 
+@pytest.mark.parametrize("file_type", ["png", "jpg", "webp"])
+def test_image_file_type(mocked_run, file_type):
+    wb_image = wandb.Image(
+        np.random.randint(255, size=(28, 32, 3)), file_type=file_type
+    )
+    wb_image.bind_to_run(mocked_run, "types", 0)
+    json_dict = wb_image.to_json(mocked_run)
+    assert json_dict["format"] == file_type
+    assert json_dict["path"].endswith("." + file_type)
+    assert PIL.Image.open(os.path.join(mocked_run.dir, json_dict["path"])).size == (
+        32,
+        28,
+    )
+
+
+def test_image_file_type_invalid():
+    with pytest.raises(ValueError):
+        wandb.Image(image, file_type="tiff")
+
+
+def test_image_png_compress_level(monkeypatch):
+    data = np.tile(np.arange(64, dtype=np.uint8), (64, 1))
+    monkeypatch.setenv("WANDB_IMAGE_PNG_COMPRESS_LEVEL", "0")
+    stored = wandb.Image(data)
+    monkeypatch.setenv("WANDB_IMAGE_PNG_COMPRESS_LEVEL", "9")
+    compressed = wandb.Image(data)
+    assert compressed._size < stored._size
+    assert list(compressed.image.getdata()) == list(stored.image.getdata())
+
+
+def test_image_encode_pool(monkeypatch, mocked_run):
+    pil_image = PIL.Image.fromarray(
+        np.random.randint(255, size=(28, 28, 3)).astype(np.uint8)
+    )
+    expected = wandb.Image(pil_image)
+
+    monkeypatch.setenv("WANDB_MEDIA_ENCODE_THREADS", "2")
+    wb_image = wandb.Image(pil_image)
+    assert wb_image._pending_file is not None
+    assert (wb_image._width, wb_image._height) == (28, 28)
+    # changes to the caller's image after logging don't leak into the file
+    pil_image.paste((0, 0, 0), (0, 0, 28, 28))
+
+    wb_image.bind_to_run(mocked_run, "pooled", 0)
+    assert wb_image._pending_file is None
+    assert wb_image._sha256 == expected._sha256
+    assert wb_image.to_json(mocked_run)["path"].endswith(".png")
+    assert os.path.exists(wb_image._path)
+
+
+def test_image_encode_pool_frees_ram(monkeypatch, mocked_run):
+    data = np.random.randint(255, size=(28, 28, 3)).astype(np.uint8)
+    assert wandb.Image(data)._image is None
+
+    monkeypatch.setenv("WANDB_MEDIA_ENCODE_THREADS", "2")
+    wb_image = wandb.Image(data)
+    assert wb_image._image is None
+    assert np.array_equal(np.array(wb_image.image), data)
+    assert wb_image._pending_file is None
+
+
+def test_image_encode_pool_follows_setting(monkeypatch):
+    monkeypatch.setenv("WANDB_MEDIA_ENCODE_THREADS", "2")
+    pool = wandb.wandb_sdk.data_types._media_encode_pool()
+    assert pool._max_workers == 2
+    assert wandb.wandb_sdk.data_types._media_encode_pool() is pool
+
+    monkeypatch.setenv("WANDB_MEDIA_ENCODE_THREADS", "4")
+    resized = wandb.wandb_sdk.data_types._media_encode_pool()
+    assert resized is not pool
+    assert resized._max_workers == 4
+
+    monkeypatch.setenv("WANDB_MEDIA_ENCODE_THREADS", "0")
+    assert wandb.wandb_sdk.data_types._media_encode_pool() is None
+    assert wandb.Image(np.zeros((4, 4), dtype=np.uint8))._pending_file is None
+
+
 def test_audio_sample_rates():
     audio1 = np.random.uniform(-1, 1, 44100)
     audio2 = np.random.uniform(-1, 1, 88200)
@@ -432,6 +509,17 @@ def test_video_numpy_multi(mocked_run):
     assert vid.to_json(mocked_run)["path"].endswith(".gif")
 
 
+@pytest.mark.skipif(sys.version_info < (3, 6), reason="No moviepy.editor in py2")
+def test_video_numpy_encode_pool(monkeypatch, mocked_run):
+    monkeypatch.setenv("WANDB_MEDIA_ENCODE_THREADS", "2")
+    video = np.random.randint(255, size=(10, 3, 28, 28))
+    vid = wandb.Video(video, format="gif")
+    assert vid._pending_file is not None
+    vid.bind_to_run(mocked_run, "videos", 0)
+    assert vid.to_json(mocked_run)["path"].endswith(".gif")
+    assert os.path.getsize(vid._path) == vid._size
+
+
 @pytest.mark.skipif(sys.version_info < (3, 6), reason="No moviepy.editor in py2")
 def test_video_numpy_invalid():
     video = np.random.random(size=(3, 28, 28))
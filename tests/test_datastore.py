@@ -2,6 +2,7 @@
 
 from __future__ import print_function
 
+import collections
 import json
 import os
 
@@ -143,3 +144,100 @@ def test_data_write_fill(with_datastore):
         expected_records=records,
         expected_record_sizes=lengths,
     )
+
+
+def _history_record(i, size=10):
+    rec = wandb_internal_pb2.Record()
+    item = rec.history.item.add()
+    item.key = "k"
+    item.value_json = json.dumps("x" * size + str(i))
+    return rec
+
+
+def _scan_all(ds):
+    records = []
+    while True:
+        data = ds.scan_data()
+        if data is None:
+            return records
+        records.append(data)
+
+
+def test_scan_roundtrip(with_datastore):
+    """Read back records of all sizes, including ones spanning blocks."""
+    sizes = [1, 100, 32768, 10, 70000, 0, 5]
+    expected = []
+    for i, size in enumerate(sizes):
+        rec = _history_record(i, size)
+        with_datastore.write(rec)
+        expected.append(rec.SerializeToString())
+    with_datastore.close()
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    assert _scan_all(ds) == expected
+    ds.close()
+
+
+def test_write_buffered(with_datastore):
+    """Records are buffered until a block is filled or flush is called."""
+    with_datastore.write(_history_record(0))
+    assert os.stat(FNAME).st_size == 0
+    with_datastore.flush()
+    assert os.stat(FNAME).st_size == with_datastore._index
+
+    for i in range(2000):
+        with_datastore.write(_history_record(i))
+    # completed blocks were written, the partial last block is still buffered
+    size = os.stat(FNAME).st_size
+    assert 0 < size < with_datastore._index
+    with_datastore.close()
+    assert os.stat(FNAME).st_size == with_datastore._index
+
+
+def test_writer_syncs_lifecycle_records(tmp_path):
+    """The writer puts records like exit on disk right away."""
+    wandb._set_internal_process()
+    sync_file = str(tmp_path / "run.wandb")
+    settings = collections.namedtuple("Settings", "sync_file")(sync_file)
+    wm = wandb.wandb_sdk.internal.writer.WriteManager(settings, None, None)
+    wm.write(_history_record(0))
+    assert os.stat(sync_file).st_size == 0
+    rec = wandb_internal_pb2.Record()
+    rec.exit.exit_code = 0
+    wm.write(rec)
+    assert os.stat(sync_file).st_size == wm._ds._index
+    wm.finish()
+
+
+def test_index_seek():
+    """The side index lets a scan seek directly to a record."""
+    wandb._set_internal_process()
+    ds = datastore.DataStore()
+    ds.open_for_write(FNAME, index=True)
+    summaries = []
+    for i in range(500):
+        ds.write(_history_record(i, size=i * 10))
+        if i % 100 == 0:
+            rec = wandb_internal_pb2.Record()
+            rec.summary.update.add(key="i", value_json=str(i))
+            ds.write(rec)
+            summaries.append(rec.SerializeToString())
+    ds.close()
+
+    ds = datastore.DataStore()
+    ds.open_for_scan(FNAME)
+    entries = ds.scan_index()
+    assert len(entries) == 505
+    assert [e[2] for e in entries].count("summary") == 5
+    summary_offset = [e[0] for e in entries if e[2] == "summary"][-1]
+    ds.seek(summary_offset)
+    assert ds.scan_data() == summaries[-1]
+
+    # resume a sequential scan from an indexed record
+    offset, _, _ = entries[-1]
+    ds.seek(offset)
+    assert len(_scan_all(ds)) == 1
+    ds.close()
+    os.unlink(FNAME)
+    os.unlink(FNAME + datastore.INDEX_SUFFIX)
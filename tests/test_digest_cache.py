@@ -0,0 +1,84 @@
+"""
+digest cache tests.
+"""
+
+import os
+import time
+
+import wandb.util
+from wandb.filesync import digest_cache
+
+
+def _write(path, contents, age=10):
+    with open(path, "w") as f:
+        f.write(contents)
+    # older than the racy window, so the digest can be cached
+    mtime = time.time() - age
+    os.utime(path, (mtime, mtime))
+
+
+def _count_hashes(monkeypatch):
+    calls = []
+    md5_file = wandb.util.md5_file
+
+    def counting_md5_file(path):
+        calls.append(path)
+        return md5_file(path)
+
+    monkeypatch.setattr(wandb.util, "md5_file", counting_md5_file)
+    return calls
+
+
+def test_digest_cache_hit(tmp_path, monkeypatch):
+    calls = _count_hashes(monkeypatch)
+    path = str(tmp_path / "file.txt")
+    _write(path, "hello")
+    cache = digest_cache.DigestCache(str(tmp_path / "digests.jsonl"))
+    assert cache.md5(path) == wandb.util.md5_file(path)
+    calls[:] = []
+    assert cache.md5(path) == wandb.util.md5_file(path)
+    assert len(calls) == 1
+
+
+def test_digest_cache_changed_file(tmp_path, monkeypatch):
+    path = str(tmp_path / "file.txt")
+    _write(path, "hello")
+    cache = digest_cache.DigestCache(str(tmp_path / "digests.jsonl"))
+    cache.md5(path)
+    _write(path, "goodbye", age=5)
+    assert cache.md5(path) == wandb.util.md5_file(path)
+
+
+def test_digest_cache_persists(tmp_path, monkeypatch):
+    calls = _count_hashes(monkeypatch)
+    path = str(tmp_path / "file.txt")
+    _write(path, "hello")
+    digest = digest_cache.DigestCache(str(tmp_path / "digests.jsonl")).md5(path)
+    cache = digest_cache.DigestCache(str(tmp_path / "digests.jsonl"))
+    assert cache.md5(path) == digest
+    assert len(calls) == 1
+
+
+def test_digest_cache_racy_file(tmp_path, monkeypatch):
+    calls = _count_hashes(monkeypatch)
+    path = str(tmp_path / "file.txt")
+    with open(path, "w") as f:
+        f.write("hello")
+    cache = digest_cache.DigestCache(str(tmp_path / "digests.jsonl"))
+    cache.md5(path)
+    cache.md5(path)
+    assert len(calls) == 2
+    assert not os.path.exists(str(tmp_path / "digests.jsonl"))
+
+
+def test_digest_cache_compacts(tmp_path, monkeypatch):
+    monkeypatch.setattr(digest_cache.DigestCache, "COMPACT_MIN_LINES", 2)
+    path = str(tmp_path / "file.txt")
+    cache_path = str(tmp_path / "digests.jsonl")
+    for i in range(5):
+        _write(path, "hello %i" % i, age=10 + i)
+        digest_cache.DigestCache(cache_path).md5(path)
+    digest_cache.DigestCache(cache_path)._load()
+    with open(cache_path) as f:
+        assert len(f.readlines()) == 1
+    assert digest_cache.DigestCache(cache_path).md5(path) == wandb.util.md5_file(path)
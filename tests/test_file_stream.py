@@ -8,10 +8,13 @@ from dataclasses import dataclass
 import json
 import pytest
 import os
+import time
 
+from wandb.sdk.internal import file_stream
 from wandb.sdk.internal.file_stream import CRDedupeFilePolicy
 from wandb.sdk.lib import file_stream_utils
 from wandb import util
+from tests.utils.file_stream_server import StandInApi, StandInServer
 
 
 def generate_history():
@@ -126,6 +129,157 @@ def test_fstream_requests_error(
     assert "Dropped streaming file chunk" in stderr
 
 
+@pytest.mark.parametrize("compression", ["gzip", "deflate"])
+def test_fstream_compression(publish_util, mock_server, monkeypatch, compression):
+    monkeypatch.setenv("WANDB_FILE_STREAM_COMPRESSION", compression)
+    assert_history(publish_util)
+
+
+def test_fstream_max_inflight(publish_util, mock_server, monkeypatch):
+    monkeypatch.setenv("WANDB_FILE_STREAM_MAX_INFLIGHT", "4")
+    assert_history(publish_util)
+
+
+class FastFileStreamApi(file_stream.FileStreamApi):
+    def rate_limit_seconds(self):
+        return 0.01
+
+
+@pytest.mark.parametrize(
+    "compression,max_inflight", [(None, 1), ("gzip", 1), (None, 4), ("gzip", 4)]
+)
+def test_fstream_history_delivered(compression, max_inflight):
+    num_lines = 500
+    line = json.dumps({"key_{}".format(i): i * 0.5 for i in range(50)})
+    server = StandInServer()
+    try:
+        fs = FastFileStreamApi(
+            StandInApi(server.base_url),
+            "run",
+            time.time(),
+            compression=compression,
+            max_inflight=max_inflight,
+        )
+        fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+        fs.set_file_policy("output.log", file_stream.CRDedupeFilePolicy())
+        fs.start()
+        for i in range(num_lines):
+            fs.push("wandb-history.jsonl", line)
+            if i % 10 == 0:
+                fs.push("output.log", "2020-01-01T00:00:00 step {}\n".format(i))
+        fs.finish(0)
+    finally:
+        server.stop()
+
+    stats = fs.stats()
+    assert server.received == [line] * num_lines
+    assert stats["failed_posts"] == 0
+    if compression:
+        assert stats["sent_bytes"] < stats["payload_bytes"]
+
+
+class RecordingFileStreamApi(FastFileStreamApi):
+    """Records the files of each post instead of sending them."""
+
+    def __init__(self, *args, **kwargs):
+        super(RecordingFileStreamApi, self).__init__(*args, **kwargs)
+        self.posted = []
+
+    def _post(self, payload, **kwargs):
+        if "files" in payload:
+            self.posted.append(payload["files"])
+        return None
+
+
+def test_fstream_coalesce_summary():
+    fs = RecordingFileStreamApi(StandInApi("http://localhost"), "run", time.time())
+    fs.set_file_policy("wandb-summary.json", file_stream.SummaryFilePolicy())
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    for i in range(100):
+        fs.push("wandb-summary.json", json.dumps({"a": i}))
+        fs.push("wandb-history.jsonl", json.dumps({"a": i}))
+    fs.start()
+    fs.finish(0)
+
+    summaries = [
+        f["wandb-summary.json"] for f in fs.posted if "wandb-summary.json" in f
+    ]
+    history = [
+        f["wandb-history.jsonl"] for f in fs.posted if "wandb-history.jsonl" in f
+    ]
+    assert summaries[-1]["content"] == [json.dumps({"a": 99})]
+    assert sum(len(h["content"]) for h in history) == 100
+    status = fs.status()
+    assert status["coalesced_chunks"] == 99 - (len(summaries) - 1)
+    assert status["pending_bytes"] == 0
+    assert status["queue_depth"] == 0
+
+
+def test_fstream_pending_bytes_encoded():
+    fs = RecordingFileStreamApi(StandInApi("http://localhost"), "run", time.time())
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    line = json.dumps({"loss": "\u6570\u5b66"}, ensure_ascii=False)
+    fs.push("wandb-history.jsonl", line)
+    assert fs.status()["pending_bytes"] == len(line.encode("utf-8"))
+    fs.start()
+    fs.finish(0)
+    assert fs.status()["pending_bytes"] == 0
+
+
+def test_fstream_prunes_file_tails():
+    fs = RecordingFileStreamApi(
+        StandInApi("http://localhost"), "run", time.time(), max_inflight=2
+    )
+    fs.start()
+    for i in range(20):
+        fs.push("file_{}.txt".format(i), "line {}\n".format(i))
+        time.sleep(0.02)
+        assert len(fs._file_tails) < 5
+    fs.finish(0)
+    assert sum(len(f) for f in fs.posted) == 20
+    assert fs._file_tails == {}
+
+
+def test_fstream_pooled_post_error():
+    class FailingFileStreamApi(RecordingFileStreamApi):
+        def _post(self, payload, **kwargs):
+            if "files" in payload:
+                raise ValueError("can't encode")
+            return None
+
+    fs = FailingFileStreamApi(
+        StandInApi("http://localhost"), "run", time.time(), max_inflight=2
+    )
+    fs.start()
+    fs.push("output.log", "line\n")
+    with pytest.raises(ValueError):
+        fs.finish(0)
+
+
+def test_fstream_backlog_flush(monkeypatch):
+    class SlowFileStreamApi(RecordingFileStreamApi):
+        def rate_limit_seconds(self):
+            return 60
+
+    monkeypatch.setattr(SlowFileStreamApi, "BACKLOG_FLUSH_BYTES", 1000)
+    fs = SlowFileStreamApi(StandInApi("http://localhost"), "run", time.time())
+    fs.set_file_policy("wandb-history.jsonl", file_stream.JsonlFilePolicy())
+    fs.start()
+    line = json.dumps({"a": "x" * 100})
+    for _ in range(20):
+        fs.push("wandb-history.jsonl", line)
+    # the backlog exceeds the budget, so it is flushed without waiting out
+    # the rate limit
+    for _ in range(100):
+        if fs.posted:
+            break
+        time.sleep(0.05)
+    assert fs.posted
+    fs.finish(0)
+    history = [f["wandb-history.jsonl"] for f in fs.posted]
+    assert sum(len(h["content"]) for h in history) == 20
+
+
 def test_crdedupe_consecutive_offsets():
     fp = CRDedupeFilePolicy()
     console = {1: "a", 2: "a", 3: "a", 8: "a", 12: "a", 13: "a", 30: "a"}
@@ -7,6 +7,22 @@ from __future__ import print_function
 import json
 import os
 import pytest
+from six.moves import queue
+import tempfile
+import threading
+import time
+
+import wandb.errors
+import wandb.filesync.stats
+from wandb.apis import internal
+from wandb.filesync import step_checksum, step_upload, step_upload_urls
+
+from tests.utils.object_store import ObjectStore, ObjectStoreApi
+
+try:
+    from unittest import mock
+except ImportError:  # TODO: this is only for python2
+    import mock
 
 
 def test_file_upload_good(mocked_run, publish_util, mock_server):
@@ -31,3 +47,314 @@ def test_file_upload_inject(mocked_run, publish_util, mock_server, inject_reques
     files = [dict(files_dict=dict(files=[("test.txt", "now")]))]
     ctx_util = publish_util(files=files, begin_cb=begin_fn)
     assert "test.txt" in ctx_util.file_names
+
+
+def test_step_checksum_orders_uploads(tmp_path):
+    request_queue = queue.Queue()
+    output_queue = queue.Queue()
+    tempdir = tempfile.TemporaryDirectory()
+    stats = wandb.filesync.stats.Stats()
+    step = step_checksum.StepChecksum(
+        None, tempdir, request_queue, output_queue, stats, max_workers=4
+    )
+    step.start()
+    for i in range(20):
+        path = str(tmp_path / ("version%i.txt" % i))
+        with open(path, "w") as f:
+            f.write("version %i" % i)
+        request_queue.put(
+            step_checksum.RequestUpload(
+                path, "file%i.txt" % (i % 5), None, True, False, None, None
+            )
+        )
+    request_queue.put(step_checksum.RequestCommitArtifact("id", True, None, None))
+    step.finish()
+    step._thread.join()
+
+    out = [output_queue.get() for _ in range(output_queue.qsize())]
+    assert all(isinstance(req, step_upload.RequestUpload) for req in out[:20])
+    assert isinstance(out[20], step_upload.RequestCommitArtifact)
+    assert isinstance(out[21], step_upload.RequestFinish)
+    versions = {}
+    for req in out[:20]:
+        with open(req.path) as f:
+            versions.setdefault(req.save_name, []).append(f.read())
+    for i in range(5):
+        assert versions["file%i.txt" % i] == ["version %i" % v for v in range(i, 20, 5)]
+    tempdir.cleanup()
+
+
+def test_step_checksum_missing_file(tmp_path):
+    request_queue = queue.Queue()
+    output_queue = queue.Queue()
+    tempdir = tempfile.TemporaryDirectory()
+    stats = wandb.filesync.stats.Stats()
+    step = step_checksum.StepChecksum(None, tempdir, request_queue, output_queue, stats)
+    step.start()
+    request_queue.put(
+        step_checksum.RequestUpload(
+            str(tmp_path / "deleted.txt"), "deleted.txt", None, True, False, None, None
+        )
+    )
+    step.finish()
+    step._thread.join()
+
+    out = [output_queue.get() for _ in range(output_queue.qsize())]
+    assert len(out) == 1 and isinstance(out[0], step_upload.RequestFinish)
+    assert stats._stats["deleted.txt"]["failed"]
+    tempdir.cleanup()
+
+
+def _start_step_upload(api, max_jobs, stats=None):
+    event_queue = queue.Queue()
+    step = step_upload.StepUpload(
+        api, stats or wandb.filesync.stats.Stats(), event_queue, max_jobs, mock.Mock()
+    )
+    step.start()
+    return step, event_queue
+
+
+def _finish_step_upload(step, event_queue):
+    event_queue.put(step_upload.RequestFinish(None))
+    step._thread.join()
+
+
+def test_step_upload_small_files_first(tmp_path, monkeypatch):
+    monkeypatch.setattr(step_upload.StepUpload, "LARGE_FILE_BYTES", 10)
+    (tmp_path / "small").write_bytes(b"x")
+    (tmp_path / "large").write_bytes(b"x" * 100)
+    release = threading.Event()
+    submitted = []
+    running_large = []
+    start_upload_job = step_upload.StepUpload._start_upload_job
+
+    def record_start(self, event, url_response, large):
+        start_upload_job(self, event, url_response, large)
+        submitted.append(event.save_name)
+        running_large.append(len(self._running_large_jobs))
+
+    monkeypatch.setattr(step_upload.StepUpload, "_start_upload_job", record_start)
+
+    def save_fn(name):
+        def save(progress_callback):
+            release.wait()
+            return False
+
+        return save
+
+    def request(name, kind):
+        # artifact files, which all have a digest
+        return step_upload.RequestUpload(
+            str(tmp_path / kind), name, "artifact", "digest", False, save_fn(name), None
+        )
+
+    step, event_queue = _start_step_upload(None, 4)
+    # keep every worker busy while the rest are queued
+    for i in range(4):
+        event_queue.put(request("blocker%i" % i, "small"))
+    for i in range(3):
+        event_queue.put(request("large%i" % i, "large"))
+    for i in range(6):
+        event_queue.put(request("small%i" % i, "small"))
+    while len(step._pending_jobs) + len(step._pending_large_jobs) < 9:
+        time.sleep(0.01)
+    release.set()
+    _finish_step_upload(step, event_queue)
+
+    # jobs are submitted in order by the step thread, unlike the order the
+    # worker threads happen to start them in
+    assert len(submitted) == 13
+    # the first worker freed up is kept for a large file, the rest go to the
+    # small files before the other large ones
+    assert submitted[4] == "large0"
+    assert all(name.startswith("small") for name in submitted[5:11])
+    assert max(running_large) == 1
+    manifest = step_upload.RequestUpload(
+        str(tmp_path / "large"), "manifest", "artifact", "digest", False, None, None
+    )
+    assert not step._is_large(manifest)
+
+
+def test_step_upload_large_file_not_starved(tmp_path, monkeypatch):
+    monkeypatch.setattr(step_upload.StepUpload, "LARGE_FILE_BYTES", 10)
+    (tmp_path / "small").write_bytes(b"x")
+    (tmp_path / "large").write_bytes(b"x" * 100)
+    releases = {}
+    started = []
+    large_started = threading.Event()
+
+    def save_fn(name):
+        release = releases.setdefault(name, threading.Event())
+
+        def save(progress_callback):
+            started.append(name)
+            if name == "large":
+                large_started.set()
+            else:
+                release.wait()
+            return False
+
+        return save
+
+    def request(name, kind):
+        return step_upload.RequestUpload(
+            str(tmp_path / kind), name, "artifact", "digest", False, save_fn(name), None
+        )
+
+    step, event_queue = _start_step_upload(None, 2)
+    event_queue.put(request("small0", "small"))
+    event_queue.put(request("small1", "small"))
+    event_queue.put(request("large", "large"))
+    for i in range(2, 10):
+        event_queue.put(request("small%i" % i, "small"))
+    while len(step._pending_jobs) + len(step._pending_large_jobs) < 9:
+        time.sleep(0.01)
+
+    # small files are still queued, but the first free worker goes to the large one
+    releases["small0"].set()
+    assert large_started.wait(timeout=10)
+
+    for release in releases.values():
+        release.set()
+    _finish_step_upload(step, event_queue)
+    assert started.index("large") < started.index("small2")
+
+
+def test_step_upload_serializes_file_uploads(tmp_path):
+    lock = threading.Lock()
+    running = set()
+    uploads = []
+
+    def save_fn(version):
+        def save(progress_callback):
+            with lock:
+                assert "file" not in running
+                running.add("file")
+            time.sleep(0.01)
+            with lock:
+                running.remove("file")
+                uploads.append(version)
+            return False
+
+        return save
+
+    step, event_queue = _start_step_upload(None, 8)
+    for i in range(5):
+        path = tmp_path / ("version%i" % i)
+        path.write_bytes(b"x")
+        event_queue.put(
+            step_upload.RequestUpload(
+                str(path), "file", None, None, False, save_fn(i), None
+            )
+        )
+    _finish_step_upload(step, event_queue)
+    assert uploads == list(range(5))
+
+
+def test_step_upload_many_files(test_settings, tmp_path):
+    num_files = 200
+    store = ObjectStore()
+    stats = wandb.filesync.stats.Stats()
+    try:
+        api = ObjectStoreApi(internal.Api().api, store)
+        step, event_queue = _start_step_upload(api, 8, stats)
+        for i in range(num_files):
+            path = tmp_path / ("file%i" % i)
+            path.write_bytes(b"%i" % i)
+            stats.init_file("file%i" % i, path.stat().st_size)
+            event_queue.put(
+                step_upload.RequestUpload(
+                    str(path), "file%i" % i, None, None, False, None, None
+                )
+            )
+        _finish_step_upload(step, event_queue)
+    finally:
+        store.stop()
+
+    throughput = stats.throughput()
+    assert len(store.objects) == num_files
+    assert throughput["completed_files"] == num_files
+    assert store.connections <= 8
+
+
+class CountingObjectStoreApi(ObjectStoreApi):
+    def __init__(self, *args, **kwargs):
+        super(CountingObjectStoreApi, self).__init__(*args, **kwargs)
+        self.project_lookups = 0
+        self.batches = []
+
+    def get_project(self):
+        self.project_lookups += 1
+        return super(CountingObjectStoreApi, self).get_project()
+
+    def upload_urls(self, project, files):
+        self.batches.append(files)
+        return super(CountingObjectStoreApi, self).upload_urls(project, files)
+
+
+def test_step_upload_batches_upload_urls(test_settings, tmp_path):
+    num_files = 500
+    store = ObjectStore()
+    stats = wandb.filesync.stats.Stats()
+    try:
+        api = CountingObjectStoreApi(internal.Api().api, store, latency=0.02)
+        step, event_queue = _start_step_upload(api, 64, stats)
+        for i in range(num_files):
+            path = tmp_path / ("file%i" % i)
+            path.write_bytes(b"%i" % i)
+            stats.init_file("file%i" % i, path.stat().st_size)
+            event_queue.put(
+                step_upload.RequestUpload(
+                    str(path), "file%i" % i, None, None, False, None, None
+                )
+            )
+        _finish_step_upload(step, event_queue)
+    finally:
+        store.stop()
+
+    assert len(store.objects) == num_files
+    assert sorted(sum(api.batches, [])) == sorted(
+        "file%i" % i for i in range(num_files)
+    )
+    assert len(api.batches) < num_files // 10
+    assert api.project_lookups == 1
+
+
+def test_step_upload_urls_error():
+    class FailingApi(object):
+        def get_project(self):
+            return "project"
+
+        def upload_urls(self, project, files):
+            raise wandb.errors.CommError("Run does not exist")
+
+    step = step_upload_urls.StepUploadUrls(FailingApi(), 0.1, 0.01, 10)
+    step.start()
+    with pytest.raises(wandb.errors.CommError):
+        step.upload_url("file.txt")
+    step.shutdown()
+
+
+def test_step_upload_urls_bad_response():
+    class BadApi(object):
+        def get_project(self):
+            return "project"
+
+        def upload_urls(self, project, files):
+            return "bucket", [], None
+
+    step = step_upload_urls.StepUploadUrls(BadApi(), 0.1, 0.01, 10)
+    step.start()
+    with pytest.raises(AttributeError):
+        step.upload_url("file.txt")
+    assert step.is_alive()
+    step.shutdown()
+
+
+def test_step_upload_urls_stopped(monkeypatch):
+    monkeypatch.setattr(step_upload_urls.PendingUploadUrl, "POLL_INTERVAL", 0.01)
+    step = step_upload_urls.StepUploadUrls(None, 0.1, 0.01, 10)
+    step.start()
+    step.shutdown()
+    with pytest.raises(RuntimeError):
+        step.upload_url("file.txt")
@@ -0,0 +1,121 @@
+"""
+handler tests.
+"""
+
+from __future__ import print_function
+
+import json
+
+from wandb.proto import wandb_internal_pb2 as pb
+
+
+def _make_history_record(data, step=None):
+    record = pb.Record()
+    for k, v in data.items():
+        item = record.history.item.add()
+        item.key = k
+        item.value_json = json.dumps(v)
+    if step is not None:
+        record.history.step.num = step
+    return record
+
+
+def _sampled_history(hm, internal_result_q):
+    record = pb.Record()
+    record.request.sampled_history.CopyFrom(pb.SampledHistoryRequest())
+    hm.handle_request_sampled_history(record)
+    result = internal_result_q.get()
+    return {
+        item.key: list(item.values_int) or list(item.values_float)
+        for item in result.response.sampled_history_response.item
+    }
+
+
+def test_handle_history_sampled(internal_hm, internal_result_q):
+    for i in range(5):
+        internal_hm.handle_history(
+            _make_history_record(dict(a=i, b=i / 2.0, c="str{}".format(i)))
+        )
+
+    sampled = _sampled_history(internal_hm, internal_result_q)
+    assert sampled["a"] == [0, 1, 2, 3, 4]
+    assert sampled["b"] == [0.0, 0.5, 1.0, 1.5, 2.0]
+    assert sampled["_step"] == [0, 1, 2, 3, 4]
+    assert "c" not in sampled
+    assert internal_hm._consolidated_summary == dict(a=4, b=2.0, c="str4", _step=4)
+
+
+def test_handle_history_wide(internal_hm, internal_result_q):
+    num_keys = 100
+    num_records = 5
+    for step in range(num_records):
+        internal_hm.handle_history(
+            _make_history_record(
+                {"key_{}".format(k): step * k for k in range(num_keys)}, step=step
+            )
+        )
+
+    sampled = _sampled_history(internal_hm, internal_result_q)
+    assert len(sampled) == num_keys + 1
+    assert sampled["key_99"] == [step * 99 for step in range(num_records)]
+    assert internal_hm._consolidated_summary["key_99"] == (num_records - 1) * 99
+
+
+def _summary_records(internal_sender_q):
+    records = []
+    while not internal_sender_q.empty():
+        record = internal_sender_q.get()
+        if record.WhichOneof("record_type") == "summary":
+            records.append(record.summary)
+    return records
+
+
+def test_handle_history_summary_delta(internal_hm, internal_sender_q):
+    internal_hm.handle_history(_make_history_record(dict(a=1, b=2)))
+    internal_hm.handle_history(_make_history_record(dict(b=3)))
+
+    first, second = _summary_records(internal_sender_q)
+    assert first.delta and second.delta
+    assert {item.key for item in first.update} == {"a", "b", "_step"}
+    assert {item.key: json.loads(item.value_json) for item in second.update} == {
+        "b": 3,
+        "_step": 1,
+    }
+    assert internal_hm._consolidated_summary == dict(a=1, b=3, _step=1)
+
+
+def test_handle_summary_delta_remove(internal_hm, internal_sender_q):
+    record = pb.Record()
+    record.summary.update.add(key="a", value_json=json.dumps({"x": 1}))
+    record.summary.update.add(key="b", value_json="2")
+    internal_hm.handle_summary(record)
+
+    record = pb.Record()
+    record.summary.remove.add(key="b")
+    update = record.summary.update.add(value_json="3")
+    update.nested_key.extend(["a", "y"])
+    internal_hm.handle_summary(record)
+
+    first, second = _summary_records(internal_sender_q)
+    assert {item.key for item in first.update} == {"a", "b"}
+    assert [item.key for item in second.update] == ["a"]
+    assert json.loads(second.update[0].value_json) == {"x": 1, "y": 3}
+    assert [item.key for item in second.remove] == ["b"]
+
+
+def test_handle_summary_flush_full(internal_hm, internal_sender_q):
+    internal_hm.handle_history(_make_history_record(dict(a=1, b=2)))
+    internal_hm.handle_history(_make_history_record(dict(b=3)))
+    _summary_records(internal_sender_q)
+
+    record = pb.Record()
+    record.request.defer.state = pb.DeferRequest.FLUSH_SUM
+    internal_hm.handle_request_defer(record)
+
+    (summary,) = _summary_records(internal_sender_q)
+    assert not summary.delta
+    assert {item.key: json.loads(item.value_json) for item in summary.update} == {
+        "a": 1,
+        "b": 3,
+        "_step": 1,
+    }
@@ -1,8 +1,100 @@
+import os
+
 import pytest
 from wandb.apis import internal
+from wandb.sdk.lib import retry
+
+from tests.utils.object_store import ObjectStore
 
 
 def test_agent_heartbeat_with_no_agent_id_fails(test_settings):
     a = internal.Api()
     with pytest.raises(ValueError):
         a.agent_heartbeat(None, {}, {})
+
+
+@pytest.fixture
+def object_store():
+    store = ObjectStore()
+    yield store
+    store.stop()
+
+
+@pytest.fixture
+def upload_api(test_settings):
+    return internal.Api().api
+
+
+def _make_file(tmp_path, size, name="file.bin"):
+    path = tmp_path / name
+    path.write_bytes(os.urandom(size))
+    return path
+
+
+def test_upload_file_reuses_connections(upload_api, object_store, tmp_path):
+    path = _make_file(tmp_path, 1000)
+    for i in range(20):
+        with open(path, "rb") as f:
+            upload_api.upload_file("{}/file{}".format(object_store.url, i), f)
+    assert len(object_store.objects) == 20
+    assert object_store.connections == 1
+
+
+def test_upload_file_ssl_disabled(upload_api, object_store, tmp_path, monkeypatch):
+    monkeypatch.setenv("WANDB_INSECURE_DISABLE_SSL", "true")
+    put = upload_api.upload_session.put
+    verify = []
+
+    def recording_put(url, **kwargs):
+        verify.append(kwargs.get("verify"))
+        return put(url, **kwargs)
+
+    monkeypatch.setattr(upload_api.upload_session, "put", recording_put)
+    path = _make_file(tmp_path, 1000)
+    with open(path, "rb") as f:
+        upload_api.upload_file("{}/file".format(object_store.url), f)
+    assert verify == [False]
+
+
+def test_upload_file_resumes(upload_api, object_store, tmp_path):
+    upload_api.RESUMABLE_UPLOAD_MIN_BYTES = 0
+    path = _make_file(tmp_path, 3 * 1024 * 1024)
+    url = object_store.url + "/checkpoint?upload_id=1"
+    first, resumed = [], []
+    object_store.fail(after_bytes=1024 * 1024)
+    with open(path, "rb") as f:
+        with pytest.raises(retry.TransientError):
+            upload_api.upload_file(url, f, lambda _, total: first.append(total))
+        # the next attempt continues from the bytes the server kept
+        assert f.tell() == first[-1] == 1024 * 1024
+        upload_api.upload_file(url, f, lambda _, total: resumed.append(total))
+    assert object_store.objects["checkpoint"] == path.read_bytes()
+    assert resumed[0] > 1024 * 1024
+    assert resumed[-1] == 3 * 1024 * 1024
+
+
+def test_upload_file_restarts_small_files(upload_api, object_store, tmp_path):
+    path = _make_file(tmp_path, 100 * 1024)
+    url = object_store.url + "/small"
+    object_store.fail(after_bytes=1024)
+    with open(path, "rb") as f:
+        with pytest.raises(retry.TransientError):
+            upload_api.upload_file(url, f)
+        assert f.tell() == 0
+        upload_api.upload_file(url, f)
+    assert object_store.objects["small"] == path.read_bytes()
+
+
+def test_upload_file_restarts_signed_url(upload_api, object_store, tmp_path):
+    upload_api.RESUMABLE_UPLOAD_MIN_BYTES = 0
+    path = _make_file(tmp_path, 3 * 1024 * 1024)
+    url = object_store.url + "/signed"
+    object_store.fail(after_bytes=1024 * 1024)
+    with open(path, "rb") as f:
+        with pytest.raises(retry.TransientError):
+            upload_api.upload_file(url, f)
+        # a plain signed url isn't a session that can be asked what it kept
+        assert f.tell() == 0
+        upload_api.upload_file(url, f)
+    assert object_store.status_requests == 0
+    assert object_store.objects["signed"] == path.read_bytes()
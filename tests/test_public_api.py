@@ -14,6 +14,7 @@ import requests
 import wandb
 from wandb import Api
 from tests import utils
+from tests.utils.public_api_stubs import STUB_RUN, StubHistoryClient, StubRunsClient
 
 
 @pytest.fixture
@@ -201,6 +202,164 @@ def test_run_history_keys_bad_arg(mock_server, api, capsys):
     assert "wandb: ERROR keys argument must be a list of strings\n" in captured.err
 
 
+@pytest.mark.parametrize("prefetch", [0, 4])
+def test_history_scan_order(prefetch):
+    client = StubHistoryClient(latency=0.01)
+    scan = wandb.apis.public.HistoryScan(
+        client, STUB_RUN, 0, 1050, page_size=100, prefetch=prefetch
+    )
+    rows = list(scan)
+    assert [row["_step"] for row in rows] == list(range(1050))
+    assert rows[3] == {"_step": 3, "acc": 3}
+    assert client.max_in_flight == (1 if prefetch == 0 else 4)
+    # scans can be iterated again
+    assert len(list(scan)) == 1050
+
+
+def test_history_scan_close():
+    client = StubHistoryClient(latency=0.01)
+    with wandb.apis.public.HistoryScan(
+        client, STUB_RUN, 0, 10000, page_size=100, prefetch=4
+    ) as scan:
+        for row in scan:
+            if row["_step"] == 150:
+                break
+    assert scan._executor is None
+    assert not scan._pages
+    assert list(scan)[-1]["_step"] == 9999
+
+    with pytest.raises(TypeError):
+        wandb.apis.public._HistoryScanBase(client, STUB_RUN, 0, 10, 10, 0, False)
+
+
+def test_history_scan_batches():
+    pandas = pytest.importorskip("pandas")
+    scan = wandb.apis.public.HistoryScan(
+        StubHistoryClient(), STUB_RUN, 10, 250, page_size=100, as_batches=True
+    )
+    batches = list(scan)
+    assert [len(batch) for batch in batches] == [100, 100, 40]
+    assert isinstance(batches[0], pandas.DataFrame)
+    assert list(batches[0].columns) == ["_step", "acc"]
+    assert batches[2]["_step"].tolist() == list(range(210, 250))
+    assert batches[0]["acc"][1] == 11
+    assert pandas.isna(batches[0]["acc"][0])
+
+    scan = wandb.apis.public.SampledHistoryScan(
+        StubHistoryClient(),
+        STUB_RUN,
+        ["acc"],
+        0,
+        150,
+        page_size=100,
+        prefetch=2,
+        as_batches=True,
+    )
+    assert [batch["acc"].sum() for batch in scan] == [
+        sum(range(100)),
+        sum(range(100, 150)),
+    ]
+
+
+def test_runs_histories(capsys):
+    pandas = pytest.importorskip("pandas")
+    runs = wandb.apis.public.Runs(StubRunsClient(23), "test", "test")
+    df = runs.histories(keys=["loss", "acc"], runs_per_query=4, max_workers=3)
+    assert list(df.columns) == ["run_id", "_step", "loss", "acc"]
+    assert len(df) == sum(i % 5 for i in range(23))
+    assert df["run_id"].tolist()[:3] == ["run-1", "run-2", "run-2"]
+    run_3 = df[df["run_id"] == "run-3"]
+    assert run_3["_step"].tolist() == [0, 1, 2]
+    assert run_3["acc"].tolist() == [0.0, 0.1, 0.2]
+    assert pandas.isna(run_3["loss"].tolist()[1])
+
+    arrays = runs.histories(keys=["loss"], format="numpy")
+    assert sorted(arrays) == ["_step", "loss", "run_id"]
+    assert arrays["_step"].tolist() == df["_step"].tolist()
+
+    assert runs.histories(keys="loss") == []
+    captured = capsys.readouterr()
+    assert "wandb: ERROR keys must be specified in a list\n" in captured.err
+    with pytest.raises(wandb.CommError, match="format must be"):
+        runs.histories(keys=["loss"], format="arrow")
+
+
+def test_runs_fields():
+    client = StubRunsClient(3)
+    runs = wandb.apis.public.Runs(
+        client, "test", "test", fields=["name", "summary.loss", "config.lr"]
+    )
+    run = runs[2]
+    assert "summaryMetrics" in str(client.last_query)
+    assert "systemMetrics" not in str(client.last_query)
+    assert run.id == "run-2"
+    assert run.name == "Run 2"
+    assert run.summary_metrics == {"loss": 2}
+    assert run.config == {"lr": 0.1}
+    with pytest.raises(AttributeError):
+        run.tags
+    with pytest.raises(wandb.CommError, match="subset of its fields"):
+        run.update()
+
+    with pytest.raises(ValueError, match="Unknown run field"):
+        wandb.apis.public.Runs(client, "test", "test", fields=["summary", "loss"])
+
+
+def test_runs_fields_summary():
+    client = StubRunsClient(3)
+    runs = wandb.apis.public.Runs(client, "test", "test", fields=["summary.loss"])
+    run = runs[2]
+    queries = client.queries
+    assert run.summary["loss"] == 2
+    assert "acc" not in run.summary
+    assert client.queries == queries
+
+    # writes keep the keys that weren't fetched
+    run.summary.update({"loss": 1})
+    assert client.summary_writes == [{"loss": 1, "acc": 0.5}]
+    assert client.queries == queries + 2
+
+    # runs listed without their summary load it when it's read
+    runs = wandb.apis.public.Runs(client, "test", "test", fields=["name"])
+    assert runs[1].summary["acc"] == 0.5
+
+
+def test_runs_prefetch_shutdown():
+    runs = wandb.apis.public.Runs(StubRunsClient(120), "test", "test", prefetch=True)
+    assert len(list(runs)) == 120
+    assert runs._executor is None
+
+
+def test_runs_prefetch_close():
+    client = StubRunsClient(120)
+    with wandb.apis.public.Runs(client, "test", "test", prefetch=True) as runs:
+        for run in runs:
+            if run.id == "run-10":
+                break
+    assert runs._executor is None
+    assert runs._next_response is None
+    # pages are still loaded when they are needed
+    assert runs[100].id == "run-100"
+
+
+def test_runs_prefetch_adaptive_page_size():
+    client = StubRunsClient(1000)
+    runs = wandb.apis.public.Runs(
+        client, "test", "test", per_page=50, prefetch=True, max_per_page=400
+    )
+    assert [run.id for run in runs] == ["run-%d" % i for i in range(1000)]
+    # fast pages double the page size up to max_per_page
+    assert client.pages == [50, 100, 200, 400, 400]
+
+    client = StubRunsClient(200, latency=0.01)
+    runs = wandb.apis.public.Runs(client, "test", "test", per_page=50)
+    runs.PAGE_SECONDS = 0.001
+    runs.max_per_page = 400
+    assert len(list(runs)) == 200
+    # slow pages keep the page size at per_page
+    assert client.pages == [50, 50, 50, 50]
+
+
 def test_run_config(mock_server, api):
     run = api.run("test/test/test")
     assert run.config == {"epochs": 10}
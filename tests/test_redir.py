@@ -11,6 +11,7 @@ import os
 import wandb
 import numpy as np
 import re
+import six
 import time
 import tqdm
 
@@ -155,6 +156,96 @@ def test_erase_screen(cls, capfd):
         assert o == []
 
 
+@pytest.mark.parametrize("cls", impls)
+def test_multibyte_across_reads(cls, capfd):
+    # each line is longer than a pipe read, so its characters are split between reads
+    line = "x" + "\u00e9" * 3000
+    with capfd.disabled():
+        o = CapList()
+        r = cls("stdout", cbs=[o.append])
+        r.install()
+        for _ in range(5):
+            print(line)
+        r.uninstall()
+        assert o == [line.encode("utf-8")] * 5
+
+
+def test_emulator_overwrite_styles():
+    emulator = wandb.wandb_sdk.lib.redirect.TerminalEmulator()
+    emulator.write("\x1b[31mred\x1b[0m plain\rab\x1b[1mc")
+    emulator.write("\x1b[22m\x1b[4C\x1b[42mX\n")
+    assert emulator.read() == ("ab\x1b[1mc\x1b[22m pla\x1b[42mX\x1b[49mn" + os.linesep)
+    emulator.write("\x1b[1A\x1b[3C\x1b[K")
+    assert emulator.read() == "\r" + "ab\x1b[1mc" + os.linesep
+
+
+def _replay(stream, chunk_size=4096):
+    """Returns the lines the emulator outputs for `stream`."""
+    emulator = wandb.wandb_sdk.lib.redirect.TerminalEmulator()
+    out = []
+    for i in range(0, len(stream), chunk_size):
+        emulator.write(stream[i : i + chunk_size])
+        if i % (chunk_size * 50) == 0:
+            out.append(emulator.read())
+    out.append(emulator.read())
+
+    lines = []
+    for line in "".join(out).split(os.linesep)[:-1]:
+        # a line starting with \r replaces the last line that was output
+        if line.startswith("\r"):
+            lines.pop()
+            line = line[1:]
+        lines.append(line)
+    return lines
+
+
+def test_emulator_replay():
+    """Replay a tqdm progress bar and plain log lines through the emulator."""
+    bar = six.StringIO()
+    for _ in tqdm.tqdm(range(2000), file=bar, mininterval=0, ncols=100):
+        pass
+    log = "".join(
+        "INFO step {} loss {:.4f}\n".format(i, 1.0 / (i + 1)) for i in range(5000)
+    )
+
+    bar_out = _replay(bar.getvalue())
+    log_out = _replay(log)
+    assert len(bar_out) == 1 and bar_out[0].startswith("100%")
+    assert len(log_out) == 5000
+    assert log_out[-1] == "INFO step 4999 loss 0.0002"
+
+
+def test_output_buffer_drops_oldest():
+    buf = wandb.wandb_sdk.lib.redirect._OutputBuffer(max_size=10)
+    for chunk in ("abcd", "efgh", "ijkl"):
+        buf.put(chunk)
+    buf.stop()
+    assert buf.get(timeout=0) == (["efgh", "ijkl"], True)
+    assert buf.dropped == 1
+
+
+def test_redirect_base_requires_decode():
+    class NoDecode(wandb.wandb_sdk.lib.redirect.RedirectBase):
+        pass
+
+    with pytest.raises(TypeError):
+        NoDecode("stdout")
+
+
+def test_wrapped_writes(monkeypatch):
+    monkeypatch.setattr(sys, "stdout", six.StringIO())
+    o = CapList()
+    r = wandb.wandb_sdk.lib.redirect.StreamWrapper(
+        "stdout", [o.append], flush_interval=0.5
+    )
+    r.install()
+    for i in range(10000):
+        sys.stdout.write("step {}\n".format(i))
+    r.uninstall()
+    assert sys.stdout.getvalue().count("\n") == 10000
+    assert o[-1] == b"step 9999"
+
+
 @pytest.mark.parametrize("cls", impls)
 def test_interactive(cls, capfd):
     with capfd.disabled():
@@ -281,48 +372,24 @@ def test_offline_compression(console_settings, capfd, runner):
 
 
 @pytest.mark.parametrize("console_settings", console_modes, indirect=True)
-@pytest.mark.parametrize("numpy", [True, False])
 @pytest.mark.timeout(120)
-def test_very_long_output(console_settings, capfd, runner, numpy):
+def test_very_long_output(console_settings, capfd, runner):
     # https://wandb.atlassian.net/browse/WB-5437
     with capfd.disabled():
-        if not numpy:
-            wandb.wandb_sdk.lib.redirect.np = wandb.wandb_sdk.lib.redirect._Numpy()
-        try:
-            run = wandb.init(settings=console_settings)
-            print("LOG" * 1000000)
-            print("\x1b[31m\x1b[40m\x1b[1mHello\x01\x1b[22m\x1b[39m" * 100)
-            print("===finish===")
-            run.finish()
-            binary_log_file = (
-                os.path.join(os.path.dirname(run.dir), "run-" + run.id) + ".wandb"
-            )
-            binary_log = runner.invoke(
-                cli.sync, ["--view", "--verbose", binary_log_file]
-            ).stdout
-            assert "\\033[31m\\033[40m\\033[1mHello" in binary_log
-            assert binary_log.count("LOG") == 1000000
-            assert "===finish===" in binary_log
-        finally:
-            wandb.wandb_sdk.lib.redirect.np = np
-
-
-@pytest.mark.parametrize("console_settings", console_modes, indirect=True)
-def test_no_numpy(console_settings, capfd, runner):
-    with capfd.disabled():
-        wandb.wandb_sdk.lib.redirect.np = wandb.wandb_sdk.lib.redirect._Numpy()
-        try:
-            run = wandb.init(settings=console_settings)
-            print("\x1b[31m\x1b[40m\x1b[1mHello\x01\x1b[22m\x1b[39m")
-            run.finish()
-            binary_log_file = (
-                os.path.join(os.path.dirname(run.dir), "run-" + run.id) + ".wandb"
-            )
-            binary_log = runner.invoke(
-                cli.sync, ["--view", "--verbose", binary_log_file]
-            ).stdout
-        finally:
-            wandb.wandb_sdk.lib.redirect.np = np
+        run = wandb.init(settings=console_settings)
+        print("LOG" * 1000000)
+        print("\x1b[31m\x1b[40m\x1b[1mHello\x01\x1b[22m\x1b[39m" * 100)
+        print("===finish===")
+        run.finish()
+        binary_log_file = (
+            os.path.join(os.path.dirname(run.dir), "run-" + run.id) + ".wandb"
+        )
+        binary_log = runner.invoke(
+            cli.sync, ["--view", "--verbose", binary_log_file]
+        ).stdout
+        assert "\\033[31m\\033[40m\\033[1mHello" in binary_log
+        assert binary_log.count("LOG") == 1000000
+        assert "===finish===" in binary_log
 
 
 @pytest.mark.parametrize("console_settings", console_modes, indirect=True)
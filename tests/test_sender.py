@@ -1,5 +1,6 @@
 from __future__ import print_function
 
+import json
 import os
 import pytest
 import six
@@ -10,6 +11,7 @@ import shutil
 import sys
 
 import wandb
+from wandb.proto import wandb_internal_pb2 as pb
 from wandb.util import mkdir_exists_ok
 
 from .utils import first_filestream
@@ -63,6 +65,16 @@ def test_send_status_request_network(mock_server, backend_interface):
         assert status_resp.network_responses[0].http_status_code == 429
 
 
+def test_send_status_request_file_stream(mock_server, backend_interface):
+    with backend_interface() as interface:
+        interface.publish_files({"files": [("test.txt", "live")]})
+
+        status_resp = interface.communicate_network_status()
+        assert status_resp is not None
+        assert status_resp.HasField("file_stream_status")
+        assert status_resp.file_stream_status.dropped_chunks == 0
+
+
 def test_resume_success(mocked_run, test_settings, mock_server, backend_interface):
     test_settings.resume = "allow"
     mock_server.ctx["resume"] = True
@@ -458,3 +470,31 @@ def test_exit_poll_local(
         assert not out_of_date
     else:
         assert out_of_date == outdated
+
+
+def test_summary_delta_coalesced(internal_sm, test_settings):
+    mkdir_exists_ok(test_settings.files_dir)
+    summary_path = os.path.join(test_settings.files_dir, "wandb-summary.json")
+
+    def send_delta(update=None, remove=()):
+        record = pb.Record()
+        record.summary.delta = True
+        for k, v in six.iteritems(update or {}):
+            record.summary.update.add(key=k, value_json=json.dumps(v))
+        for k in remove:
+            record.summary.remove.add(key=k)
+        internal_sm.send_summary(record)
+
+    def saved_summary():
+        with open(summary_path) as f:
+            return json.load(f)
+
+    send_delta(dict(a=1, b=2))
+    assert saved_summary() == dict(a=1, b=2)
+
+    # deltas arriving within the debounce window are only merged in memory
+    send_delta(dict(a=3), remove=["b"])
+    assert saved_summary() == dict(a=1, b=2)
+
+    internal_sm.debounce()
+    assert saved_summary() == dict(a=3)
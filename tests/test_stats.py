@@ -0,0 +1,199 @@
+"""
+system stats tests.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from wandb.sdk.internal import stats
+
+
+class CountingCollector(stats.Collector):
+    name = "counting"
+    interval = 0.01
+    aggregates = ("mean", "min", "max", "last")
+
+    def __init__(self):
+        super(CountingCollector, self).__init__(pid=os.getpid())
+        self.count = 0
+
+    def sample(self):
+        self.count += 1
+        return {"count": self.count}
+
+
+class ConstantCollector(stats.Collector):
+    name = "constant"
+    interval = 5
+
+    def sample(self):
+        return {"constant": 1}
+
+
+def _published(fake_interface):
+    records = []
+    while not fake_interface.record_q.empty():
+        record = fake_interface.record_q.get()
+        records.append(
+            {item.key: json.loads(item.value_json) for item in record.stats.item}
+        )
+    return records
+
+
+def test_collectors_aggregate_independently(fake_interface):
+    counting = CountingCollector()
+    constant = ConstantCollector(pid=os.getpid())
+    system_stats = stats.SystemStats(
+        pid=os.getpid(),
+        interface=fake_interface,
+        collectors=[counting, constant],
+    )
+    # each collector is aggregated on its own, however often it is sampled
+    for _ in range(10):
+        system_stats._collect(counting)
+    system_stats._collect(constant)
+    system_stats.flush()
+
+    (published,) = _published(fake_interface)
+    assert counting.count == 10
+    assert published["constant"] == 1
+    assert published["count.min"] == 1
+    assert published["count.max"] == published["count.last"] == counting.count
+    assert published["count"] == round((counting.count + 1) / 2.0, 2)
+
+
+def test_failing_collector_is_skipped(fake_interface):
+    class Failing(stats.Collector):
+        name = "failing"
+
+        def sample(self):
+            raise ValueError("no stats")
+
+    system_stats = stats.SystemStats(
+        pid=os.getpid(),
+        interface=fake_interface,
+        collectors=[Failing(pid=os.getpid()), CountingCollector()],
+    )
+    assert system_stats.stats() == {"count": 1}
+
+
+def test_collector_requires_sample():
+    class NoSample(stats.Collector):
+        name = "no_sample"
+
+    with pytest.raises(TypeError):
+        NoSample(pid=os.getpid())
+
+
+def test_default_collectors(fake_interface):
+    system_stats = stats.SystemStats(pid=os.getpid(), interface=fake_interface)
+    sample = system_stats.stats()
+    for key in ("cpu", "memory", "disk", "network.sent", "proc.memory.rssMB"):
+        assert key in sample
+    assert sample["proc.tree.memory.rssMB"] >= sample["proc.memory.rssMB"]
+
+
+def test_cgroup_v2_limits(tmp_path):
+    (tmp_path / "memory.max").write_text(u"1048576000")
+    (tmp_path / "memory.current").write_text(u"524288000")
+    (tmp_path / "cpu.max").write_text(u"200000 100000")
+    (tmp_path / "cpu.stat").write_text(u"usage_usec 1000000\nuser_usec 900000\n")
+
+    collector = stats.CgroupCollector(pid=os.getpid())
+    collector.root = str(tmp_path)
+    sample = collector.sample()
+    assert sample == {
+        "cgroup.memory.limitMB": 1000.0,
+        "cgroup.memory.usedMB": 500.0,
+        "cgroup.memory.percent": 50.0,
+        "cgroup.cpu.limit": 2.0,
+    }
+
+    (tmp_path / "cpu.stat").write_text(u"usage_usec 2000000\n")
+    collector._last_usage = (time.time() - 1, 1.0)
+    assert 40 < collector.sample()["cgroup.cpu.percent"] <= 50
+
+
+def test_cgroup_unlimited(tmp_path):
+    (tmp_path / "memory.max").write_text(u"max")
+    (tmp_path / "cpu.max").write_text(u"max 100000")
+
+    collector = stats.CgroupCollector(pid=os.getpid())
+    collector.root = str(tmp_path)
+    assert not collector.is_available()
+
+
+@pytest.fixture
+def children():
+    procs = [
+        subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        for _ in range(3)
+    ]
+    yield procs
+    for proc in procs:
+        proc.kill()
+        proc.wait()
+
+
+def test_process_tree(children):
+    collector = stats.ProcessCollector(pid=os.getpid())
+    sample = collector.sample()
+
+    assert sample["proc.tree.processes"] == 4
+    assert sample["proc.tree.memory.rssMB"] > sample["proc.memory.rssMB"]
+    assert sample["proc.tree.cpu.threads"] >= sample["proc.cpu.threads"] + 3
+    for slot in range(3):
+        assert sample["proc.child.{}.memory.rssMB".format(slot)] > 0
+    assert "proc.child.3.memory.rssMB" not in sample
+    assert collector.get_aggregates("proc.tree.io.readMB") == ("last",)
+
+
+def test_process_child_slots():
+    collector = stats.ProcessCollector(pid=os.getpid())
+    collector.max_reported_children = 2
+    collector._update_slots({10, 11, 12})
+    assert collector._slots == {10: 0, 11: 1, 12: 2}
+    # a new child takes the lowest free slot
+    collector._update_slots({11, 12, 20, 21})
+    assert collector._slots == {20: 0, 11: 1, 12: 2, 21: 3}
+
+
+def test_process_tree_bounded_sampling(children):
+    tree = stats.ProcessTree(os.getpid(), max_samples=2)
+    _, info = tree.sample()
+    assert len(tree.children) == 3
+    assert len(info) == 2
+    _, info = tree.sample()
+    assert set(info) == {child.pid for child in children}
+
+    children[0].kill()
+    children[0].wait()
+    tree.refresh()
+    _, info = tree.sample()
+    assert set(info) == {child.pid for child in children[1:]}
+
+
+def test_process_tree_uss_interval(children, monkeypatch):
+    calls = []
+    memory_full_info = stats.psutil.Process.memory_full_info
+
+    def count_calls(self):
+        calls.append(self.pid)
+        return memory_full_info(self)
+
+    monkeypatch.setattr(stats.psutil.Process, "memory_full_info", count_calls)
+    tree = stats.ProcessTree(os.getpid())
+    root, info = tree.sample()
+    assert len(calls) == 1 + len(tree.children)
+    # the last USS is reported until it's due again
+    root_again, info_again = tree.sample()
+    assert len(calls) == 1 + len(tree.children)
+    if "uss" in root:
+        assert root_again["uss"] == root["uss"]
+        assert all("uss" in child for child in info_again.values())
+
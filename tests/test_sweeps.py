@@ -0,0 +1,273 @@
+"""
+sweep search algorithm tests.
+"""
+
+from __future__ import print_function
+
+import sys
+
+import numpy as np
+import pytest
+
+if sys.version_info >= (3, 10):
+    pytest.importorskip("pydantic")
+pytest.importorskip("sklearn")
+
+from wandb.sweeps import (  # noqa: E402
+    bayes_search,
+    grid_search,
+    hyperband_stopping,
+    SweepRun,
+    RunState,
+)
+
+
+def _bayes_config():
+    return {
+        "method": "bayes",
+        "metric": {"name": "loss", "goal": "minimize"},
+        "parameters": {
+            "x": {"min": -2.0, "max": 2.0},
+            "y": {"min": -2.0, "max": 2.0},
+            "z": {"min": 1, "max": 10},
+        },
+    }
+
+
+def _finished_runs(num_runs, seed=0):
+    rng = np.random.RandomState(seed)
+    runs = []
+    for _ in range(num_runs):
+        x, y, z = rng.uniform(-2, 2), rng.uniform(-2, 2), int(rng.randint(1, 10))
+        runs.append(
+            SweepRun(
+                config={"x": {"value": x}, "y": {"value": y}, "z": {"value": z}},
+                state=RunState.finished,
+                summary_metrics={"loss": x ** 2 + (y - 1) ** 2 + z / 10.0},
+            )
+        )
+    return runs
+
+
+def test_random_sample_bounds():
+    test_X = bayes_search.random_sample([[0.0, 1.0], [3, 7], [-5.0, -4.0]], 10000)
+    assert test_X.shape == (10000, 3)
+    assert (test_X[:, 0] >= 0).all() and (test_X[:, 0] < 1).all()
+    assert set(test_X[:, 1]) == {3, 4, 5, 6}
+    assert (test_X[:, 2] >= -5).all() and (test_X[:, 2] < -4).all()
+
+
+def test_next_samples_batch():
+    rng = np.random.RandomState(0)
+    sample_X = rng.uniform(size=(30, 2))
+    sample_y = np.sin(3 * sample_X.sum(axis=1))
+    test_X = rng.uniform(size=(500, 2))
+
+    batch = bayes_search.next_samples(
+        sample_X=sample_X, sample_y=sample_y, test_X=test_X, n=5
+    )
+    single = bayes_search.next_sample(
+        sample_X=sample_X, sample_y=sample_y, test_X=test_X
+    )
+    assert len(batch) == 5
+    # the first suggestion of a batch is the single best one
+    np.testing.assert_allclose(batch[0][0], single[0])
+    assert len({tuple(suggestion[0]) for suggestion in batch}) == 5
+
+
+def test_bayes_search_next_runs_batch():
+    suggestions = bayes_search.bayes_search_next_runs(
+        _finished_runs(20), _bayes_config(), n=4
+    )
+    configs = [
+        tuple(run.config[name]["value"] for name in "xyz") for run in suggestions
+    ]
+    assert len(set(configs)) == 4
+    for run in suggestions:
+        assert -2 <= run.config["x"]["value"] <= 2
+        assert run.search_info["expected_improvement"] >= 0
+
+
+def _grid_config(num_params, num_values):
+    return {
+        "method": "grid",
+        "parameters": {
+            "p{}".format(i): {"values": list(range(num_values))}
+            for i in range(num_params)
+        },
+    }
+
+
+def _values(runs):
+    return [tuple(v["value"] for v in run.config.values()) for run in runs]
+
+
+def test_feistel_permutation():
+    for size in (1, 2, 7, 64, 1000):
+        permutation = grid_search.FeistelPermutation(size, seed="sweep")
+        assert sorted(permutation(i) for i in range(size)) == list(range(size))
+    permutation = grid_search.FeistelPermutation(1000, seed="sweep")
+    assert [permutation(i) for i in range(20)] != list(range(20))
+    assert permutation(3) == grid_search.FeistelPermutation(1000, seed="sweep")(3)
+
+
+def test_grid_search_order_and_completed_runs():
+    config = {
+        "method": "grid",
+        "parameters": {
+            "a": {"values": [1, 2]},
+            "b": {"values": ["x", [1, 2], 1.0]},
+            "c": {"value": "const"},
+        },
+    }
+    first = grid_search.grid_search_next_runs([], config, n=3)
+    assert _values(first) == [
+        (1, "x", "const"),
+        (1, [1, 2], "const"),
+        (1, 1.0, "const"),
+    ]
+
+    runs = [
+        SweepRun(config={"a": {"value": 1}, "b": {"value": [1, 2]}}),
+        # 1 and 1.0 are different grid values
+        SweepRun(config={"a": {"value": 1}, "b": {"value": 1}}),
+    ]
+    following = grid_search.grid_search_next_runs(runs, config, n=6)
+    assert _values(following[:4]) == [
+        (1, "x", "const"),
+        (1, 1.0, "const"),
+        (2, "x", "const"),
+        (2, [1, 2], "const"),
+    ]
+    assert following[-1] is None
+
+
+@pytest.mark.parametrize("randomize_order", [False, True])
+def test_grid_search_duplicate_and_nan_values(randomize_order):
+    config = {
+        "method": "grid",
+        "parameters": {
+            "a": {"values": [1, 2, 1]},
+            "b": {"values": [float("nan"), 0.5]},
+        },
+    }
+    runs = [SweepRun(config={"a": {"value": 1}, "b": {"value": float("nan")}})]
+    following = grid_search.grid_search_next_runs(
+        runs, config, n=4, randomize_order=randomize_order
+    )
+    assert following[-1] is None
+    values = [(a, "nan" if b != b else b) for a, b in _values(following[:-1])]
+    assert len(values) == 3
+    assert set(values) == {(1, 0.5), (2, 0.5), (2, "nan")}
+
+
+def test_grid_search_randomized_covers_grid():
+    config = _grid_config(3, 4)
+    runs = []
+    while True:
+        (run,) = grid_search.grid_search_next_runs(runs, config, randomize_order=True)
+        if run is None:
+            break
+        runs.append(run)
+    assert len(runs) == 64
+    assert len(set(_values(runs))) == 64
+    assert _values(runs[:16]) != sorted(_values(runs[:16]))
+
+
+def test_grid_search_large_grid():
+    """A 10^8 point grid is enumerated lazily."""
+    config = _grid_config(8, 10)
+    runs = grid_search.grid_search_next_runs([], config, n=100)
+    runs += grid_search.grid_search_next_runs(runs, config, n=100, randomize_order=True)
+    assert len(set(_values(runs))) == 200
+    assert _values(runs[:2]) == [(0,) * 8, (0,) * 7 + (1,)]
+
+
+def _hyperband_config(goal="minimize"):
+    return {
+        "method": "grid",
+        "metric": {"name": "loss", "goal": goal},
+        "early_terminate": {"type": "hyperband", "max_iter": 27, "eta": 3, "s": 3},
+        "parameters": {"a": {"values": [1, 2, 3]}},
+    }
+
+
+def _synthetic_runs(num_runs, seed=0):
+    rng = np.random.RandomState(seed)
+    runs = []
+    for i in range(num_runs):
+        losses = np.cumsum(rng.uniform(-1, 0.5, size=rng.randint(0, 30))) + 10
+        runs.append(
+            SweepRun(
+                name="run-{}".format(i),
+                state=RunState.running if i % 2 else RunState.finished,
+                history=[
+                    {"loss": float(loss), "_step": j} for j, loss in enumerate(losses)
+                ],
+            )
+        )
+    return runs
+
+
+def _reference_stop(runs, config):
+    """Unvectorized hyperband decisions for comparison."""
+    bands = [1, 3, 9]
+    sign = -1 if config["metric"]["goal"] == "maximize" else 1
+    histories = [[sign * v for v in run.metric_history("loss", True)] for run in runs]
+    thresholds = []
+    for band in bands:
+        values = sorted(h[band] for h in histories if len(h) > band)
+        thresholds.append(values[int(len(values) / 3.0)] if values else np.inf)
+    stopped = []
+    for run, history in zip(runs, histories):
+        passed = [t for b, t in zip(bands, thresholds) if b < len(history)]
+        if run.state == RunState.running and passed and min(history) > passed[-1]:
+            stopped.append(run.name)
+    return stopped
+
+
+@pytest.mark.parametrize("goal", ["minimize", "maximize"])
+def test_hyperband_matches_reference(goal):
+    runs = _synthetic_runs(200)
+    config = _hyperband_config(goal)
+    stopped = hyperband_stopping.hyperband_stop_runs(runs, config)
+    assert [run.name for run in stopped] == _reference_stop(runs, config)
+    assert stopped[0].early_terminate_info["bands"] == [1, 3, 9]
+
+
+def test_hyperband_incremental():
+    runs = _synthetic_runs(200)
+    config = _hyperband_config()
+    state = hyperband_stopping.HyperbandState()
+    hyperband_stopping.hyperband_stop_runs(runs[:150], config, state=state)
+    for run in runs[:50]:
+        run.history.extend({"loss": 20.0 + i} for i in range(10))
+    incremental = hyperband_stopping.hyperband_stop_runs(runs, config, state=state)
+    assert [run.name for run in incremental] == _reference_stop(runs, config)
+
+
+def test_hyperband_resampled_history():
+    runs = _synthetic_runs(200)
+    config = _hyperband_config()
+    state = hyperband_stopping.HyperbandState()
+    hyperband_stopping.hyperband_stop_runs(runs, config, state=state)
+    # a sampled history changes its earlier rows as the run grows
+    for run in runs[:100]:
+        rows = run.history + [{"loss": 0.0, "_step": len(run.history)}]
+        run.history = [dict(row) for row in rows[::2]]
+        for row in run.history:
+            row["loss"] = row["loss"] + 5.0
+    resampled = hyperband_stopping.hyperband_stop_runs(runs, config, state=state)
+    assert [run.name for run in resampled] == _reference_stop(runs, config)
+
+
+def test_hyperband_rewritten_history():
+    runs = _synthetic_runs(200)
+    config = _hyperband_config()
+    state = hyperband_stopping.HyperbandState()
+    hyperband_stopping.hyperband_stop_runs(runs, config, state=state)
+    # same length, different rows
+    for run in runs[:100]:
+        run.history = [dict(row, loss=row["loss"] + 5.0) for row in run.history]
+    rewritten = hyperband_stopping.hyperband_stop_runs(runs, config, state=state)
+    assert [run.name for run in rewritten] == _reference_stop(runs, config)
@@ -184,3 +184,72 @@ def test_fk_from_pk_local_draft():
             for row in table.data
         ]
     )
+
+
+def _rows():
+    return [
+        [1, "a", 0.5, None],
+        [2, "b", float("nan"), True],
+        [3, None, 1.5, False],
+    ]
+
+
+def test_add_rows_matches_add_data():
+    expected = wandb.Table(columns=["i", "s", "f", "b"])
+    for row in _rows():
+        expected.add_data(*row)
+
+    table = wandb.Table(columns=["i", "s", "f", "b"])
+    table.add_rows(_rows())
+    assert table.data[0] == expected.data[0]
+    assert len(table.data) == 3
+    assert table._column_types == expected._column_types
+
+
+def test_add_rows_incompatible():
+    table = wandb.Table(columns=["i", "s"], optional=False)
+    table.add_rows([[1, "a"]])
+    with pytest.raises(TypeError, match="Data row contained incompatible types"):
+        table.add_rows([[2, "b"], [3, 4]])
+    # nothing from the failed batch is kept
+    assert table.data == [[1, "a"]]
+    with pytest.raises(ValueError):
+        table.add_rows([[1]])
+
+
+def test_add_rows_pk():
+    table = wandb.Table(columns=["id", "b"], data=[["1", "a"]])
+    table.set_pk("id")
+    table.add_rows([["2", "b"], ["3", "c"]])
+    assert [row[0] for row in table.data] == ["1", "2", "3"]
+    assert all(row[0]._table == table for row in table.data)
+
+
+def test_from_columns():
+    np = pytest.importorskip("numpy")
+    table = wandb.Table.from_columns(
+        {"x": np.arange(4), "y": ["a", "b", "c", "d"]}, optional=False
+    )
+    assert table.columns == ["x", "y"]
+    assert table.get_column("y") == ["a", "b", "c", "d"]
+    assert table.data[2] == [2, "c"]
+    assert (
+        table._column_types
+        == wandb.Table(
+            columns=["x", "y"], data=[[0, "a"], [1, "b"]], optional=False
+        )._column_types
+    )
+
+    with pytest.raises(ValueError):
+        wandb.Table.from_columns({"x": [1, 2], "y": [1]})
+
+
+def test_to_json_columns():
+    table = wandb.Table(columns=["i", "s", "f", "b"], data=_rows())
+    json_dict = table.to_json(wandb.Artifact("A", "dataset"))
+    assert json_dict["data"] == [
+        [1, "a", 0.5, None],
+        [2, "b", None, True],
+        [3, None, 1.5, False],
+    ]
+    assert json_dict["nrows"] == 3
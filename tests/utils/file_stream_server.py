@@ -0,0 +1,69 @@
+"""
+A local stand-in for the file_stream endpoint, for file stream tests and
+benchmarks. `StandInServer` records the history lines it receives and
+`StandInApi` points a FileStreamApi at it.
+"""
+
+import gzip
+import http.server
+import json
+import threading
+import time
+import zlib
+
+
+class StandInServer(object):
+    """Local file_stream endpoint that records received history lines."""
+
+    def __init__(self, latency=0.0):
+        received = self.received = []
+        lock = self.lock = threading.Lock()
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            def do_POST(self):
+                data = self.rfile.read(int(self.headers["Content-Length"]))
+                encoding = self.headers.get("Content-Encoding")
+                if encoding == "gzip":
+                    data = gzip.decompress(data)
+                elif encoding == "deflate":
+                    data = zlib.decompress(data)
+                files = json.loads(data).get("files", {})
+                if latency:
+                    time.sleep(latency)
+                with lock:
+                    for k, v in files.items():
+                        if k == "wandb-history.jsonl":
+                            received.extend(v["content"])
+                body = json.dumps({"exitcode": None, "limits": {}}).encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.base_url = "http://127.0.0.1:{}".format(self.httpd.server_port)
+        self._thread = threading.Thread(target=self.httpd.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+class StandInApi(object):
+    api_key = "X" * 40
+    user_agent = "wandb-test"
+
+    def __init__(self, base_url):
+        self._base_url = base_url
+        self.dynamic_settings = {"heartbeat_seconds": 30}
+
+    def settings(self):
+        return {"base_url": self._base_url, "entity": "e", "project": "p"}
+
+    def retry_callback(self, status, response_text):
+        pass
@@ -1,7 +1,9 @@
+import gzip
 import json
 import requests
 import threading
 import urllib
+import zlib
 
 
 class ResponseMock(object):
@@ -98,6 +100,9 @@ class RequestsMock(object):
     def mount(self, *args):
         pass
 
+    def merge_environment_settings(self, url, proxies, stream, verify, cert):
+        return {"proxies": proxies, "stream": stream, "verify": verify, "cert": cert}
+
     def _clean_kwargs(self, kwargs):
         if "auth" in kwargs:
             del kwargs["auth"]
@@ -113,6 +118,10 @@ class RequestsMock(object):
             del kwargs["verify"]
         if "allow_redirects" in kwargs:
             del kwargs["allow_redirects"]
+        if "proxies" in kwargs:
+            del kwargs["proxies"]
+        if "cert" in kwargs:
+            del kwargs["cert"]
         return kwargs
 
     def _store_request(self, url, body):
@@ -125,6 +134,20 @@ class RequestsMock(object):
             self.ctx[key] = self.ctx.get(key, [])
             self.ctx[key].append(body)
 
+    def _request_json(self, kwargs):
+        if "json" in kwargs or "data" not in kwargs:
+            return kwargs.get("json")
+        headers = kwargs.get("headers") or {}
+        if headers.get("Content-Type") != "application/json":
+            return None
+        data = kwargs["data"]
+        encoding = headers.get("Content-Encoding")
+        if encoding == "gzip":
+            data = gzip.decompress(data)
+        elif encoding == "deflate":
+            data = zlib.decompress(data)
+        return json.loads(data)
+
     def _inject(self, method, url, kwargs):
         pre_request = dict(method=method, url=url, kwargs=kwargs)
         inject = InjectRequestsParse(self.ctx).find(pre_request=pre_request)
@@ -136,7 +159,7 @@ class RequestsMock(object):
 
     def post(self, url, **kwargs):
         self._inject("post", url, kwargs)
-        self._store_request(url, kwargs.get("json"))
+        self._store_request(url, self._request_json(kwargs))
         return ResponseMock(self.client.post(url, **self._clean_kwargs(kwargs)))
 
     def put(self, url, **kwargs):
@@ -1,6 +1,7 @@
 """Mock Server for simple calls the cli and public api make"""
 
 from flask import Flask, request, g, jsonify
+import gzip
 import os
 import sys
 import re
@@ -9,6 +10,7 @@ import json
 import platform
 import yaml
 import six
+import zlib
 
 # HACK: restore first two entries of sys path after wandb load
 save_path = sys.path[:2]
@@ -408,29 +410,29 @@ def create_app(user_ctx=None):
             ctx["current_run"] = body["variables"]["run"]
 
         if body["variables"].get("files"):
-            requested_file = body["variables"]["files"][0]
-            ctx["requested_file"] = requested_file
-            url = base_url + "/storage?file={}&run={}".format(
-                urllib.parse.quote(requested_file), ctx["current_run"]
-            )
+            requested_files = body["variables"]["files"]
+            ctx["requested_file"] = requested_files[0]
+            edges = []
+            for requested_file in requested_files:
+                url = base_url + "/storage?file={}&run={}".format(
+                    urllib.parse.quote(requested_file), ctx["current_run"]
+                )
+                edges.append(
+                    {
+                        "node": {
+                            "name": requested_file,
+                            "url": url,
+                            "directUrl": url + "&direct=true",
+                        }
+                    }
+                )
             return json.dumps(
                 {
                     "data": {
                         "model": {
                             "bucket": {
                                 "id": "storageid",
-                                "files": {
-                                    "uploadHeaders": [],
-                                    "edges": [
-                                        {
-                                            "node": {
-                                                "name": requested_file,
-                                                "url": url,
-                                                "directUrl": url + "&direct=true",
-                                            }
-                                        }
-                                    ],
-                                },
+                                "files": {"uploadHeaders": [], "edges": edges},
                             }
                         }
                     }
@@ -1699,13 +1701,21 @@ index 30d74d2..9a2c773 100644
 
         return "ARTIFACT %s" % digest, 200
 
+    def _file_stream_json():
+        encoding = request.headers.get("Content-Encoding")
+        if encoding == "gzip":
+            return json.loads(gzip.decompress(request.get_data()))
+        if encoding == "deflate":
+            return json.loads(zlib.decompress(request.get_data()))
+        return request.get_json()
+
     @app.route("/files/<entity>/<project>/<run>/file_stream", methods=["POST"])
     def file_stream(entity, project, run):
         ctx = get_ctx()
         run_ctx = get_run_ctx(run)
         for c in ctx, run_ctx:
             c["file_stream"] = c.get("file_stream", [])
-            c["file_stream"].append(request.get_json())
+            c["file_stream"].append(_file_stream_json())
         response = json.dumps({"exitcode": None, "limits": {}})
 
         inject = InjectRequestsParse(ctx).find(request=request)
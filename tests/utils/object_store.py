@@ -0,0 +1,173 @@
+"""
+A stand-in cloud object store that injects failures, for upload tests.
+
+Objects are PUT to /<name>. Requests with a `Content-Range: bytes start-end/total`
+header continue an upload where it was interrupted, like a resumable upload
+session: the bytes received before a dropped connection are kept, and a
+`Content-Range: bytes */total` request is answered with 308 and the `Range`
+kept so far. `ObjectStoreApi` uploads run files to it.
+"""
+
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import re
+import socket
+import threading
+import time
+import urllib.parse
+
+
+class ObjectStoreHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super(ObjectStoreHandler, self).setup()
+        self.server.store.connection_opened()
+
+    def log_message(self, format, *args):
+        pass
+
+    def do_PUT(self):  # noqa: N802
+        store = self.server.store
+        url = urllib.parse.urlparse(self.path)
+        name = url.path.lstrip("/")
+        length = int(self.headers.get("Content-Length", 0))
+        content_range = self.headers.get("Content-Range")
+
+        if content_range and content_range.startswith("bytes */"):
+            store.status_request()
+            kept = len(store.partial.get(name, b""))
+            if kept:
+                return self._respond(308, {"Range": "bytes=0-%i" % (kept - 1)})
+            return self._respond(308)
+
+        failure = store.next_failure()
+
+        start = 0
+        if content_range:
+            match = re.match(r"bytes (\d+)-(\d+)/(\d+)$", content_range)
+            start, total = int(match.group(1)), int(match.group(3))
+            if start != len(store.partial.get(name, b"")):
+                self._read(length)
+                return self._respond(400)
+        else:
+            total = length
+
+        if failure is not None and failure[0] is None:
+            data = self._read(failure[1])
+            store.keep(name, start, data)
+            # drop the connection without answering
+            self.close_connection = True
+            self.connection.shutdown(socket.SHUT_RDWR)
+            return
+        data = self._read(length)
+        if failure is not None:
+            return self._respond(failure[0])
+
+        store.keep(name, start, data)
+        if start + len(data) < total:
+            kept = len(store.partial[name])
+            return self._respond(308, {"Range": "bytes=0-%i" % (kept - 1)})
+        store.complete(name)
+        self._respond(200)
+
+    def _read(self, length):
+        chunks = []
+        while length > 0:
+            chunk = self.rfile.read(min(length, 65536))
+            if not chunk:
+                break
+            chunks.append(chunk)
+            length -= len(chunk)
+        return b"".join(chunks)
+
+    def _respond(self, status, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+
+class ObjectStore(object):
+    """Runs the object store on a local port until `stop()`
+
+    Objects completed by uploads are in `objects`. `fail()` makes the next
+    requests fail.
+    """
+
+    def __init__(self):
+        self.objects = {}
+        self.partial = {}
+        self.connections = 0
+        self.requests = 0
+        self.status_requests = 0
+        self._failures = deque()
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), ObjectStoreHandler)
+        self._server.daemon_threads = True
+        self._server.store = self
+        self._thread = threading.Thread(target=self._server.serve_forever)
+        self._thread.daemon = True
+        self._thread.start()
+
+    @property
+    def url(self):
+        return "http://127.0.0.1:%i" % self._server.server_address[1]
+
+    def fail(self, count=1, status=None, after_bytes=0, skip=0):
+        """Fails `count` requests, after letting `skip` more through, with `status`
+        or by dropping the connection after receiving `after_bytes` of the body"""
+        with self._lock:
+            self._failures.extend([None] * skip + [(status, after_bytes)] * count)
+
+    def next_failure(self):
+        with self._lock:
+            self.requests += 1
+            return self._failures.popleft() if self._failures else None
+
+    def connection_opened(self):
+        with self._lock:
+            self.connections += 1
+
+    def keep(self, name, start, data):
+        with self._lock:
+            self.partial[name] = self.partial.get(name, b"")[:start] + data
+
+    def complete(self, name):
+        with self._lock:
+            self.objects[name] = self.partial.pop(name)
+
+    def status_request(self):
+        with self._lock:
+            self.status_requests += 1
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+
+class ObjectStoreApi(object):
+    """The parts of the internal api run file uploads use, handing out urls on
+    an ObjectStore after `latency` seconds and uploading to them with a real
+    `internal_api.Api`"""
+
+    def __init__(self, api, store, latency=0):
+        self._api = api
+        self.api_url = store.url
+        self._latency = latency
+
+    def get_project(self):
+        return "project"
+
+    def upload_urls(self, project, files):
+        # a round trip to the backend
+        time.sleep(self._latency)
+        return (
+            None,
+            [],
+            {name: {"url": "%s/%s" % (self.api_url, name)} for name in files},
+        )
+
+    def upload_file_retry(self, *args, **kwargs):
+        return self._api.upload_file_retry(*args, **kwargs)
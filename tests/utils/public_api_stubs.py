@@ -0,0 +1,120 @@
+"""
+Stand-in GraphQL clients for public api tests and benchmarks. They answer the
+queries the public api makes with generated runs and history rows, optionally
+after a fixed latency per query.
+"""
+
+import json
+import threading
+import time
+from types import SimpleNamespace
+
+
+class StubHistoryClient(object):
+    """A GraphQL client serving history rows for steps [0, num_steps)."""
+
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.lock = threading.Lock()
+
+    def execute(self, query, variable_values):
+        with self.lock:
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(self.latency)
+        with self.lock:
+            self.in_flight -= 1
+        if "spec" in variable_values:
+            spec = json.loads(variable_values["spec"])
+            steps = range(spec["minStep"], spec["maxStep"])
+            rows = [{"_step": step, "acc": step} for step in steps]
+            return {"project": {"run": {"sampledHistory": [rows]}}}
+        steps = range(variable_values["minStep"], variable_values["maxStep"])
+        rows = [
+            json.dumps(dict({"_step": step}, **({"acc": step} if step % 2 else {})))
+            for step in steps
+        ]
+        return {"project": {"run": {"history": rows}}}
+
+
+class StubRunsClient(object):
+    """A GraphQL client serving a project of runs with sampled histories.
+
+    Run `run-i` has `i % 5` history rows where `loss` is logged on even steps.
+    """
+
+    def __init__(self, num_runs, latency=0.0):
+        self.num_runs = num_runs
+        self.latency = latency
+        self.queries = 0
+        self.last_query = None
+        self.pages = []
+        self.summary_writes = []
+        self.lock = threading.Lock()
+
+    def run(self, i):
+        return {
+            "id": "storage-%d" % i,
+            "name": "run-%d" % i,
+            "displayName": "Run %d" % i,
+            "state": "finished",
+            "config": json.dumps({"lr": {"value": 0.1}, "epochs": 10}),
+            "summaryMetrics": json.dumps({"loss": i, "acc": 0.5}),
+            "sweepName": None,
+        }
+
+    def history(self, name, spec):
+        rows = []
+        for step in range(int(name.split("-")[1]) % 5):
+            row = {"_step": step, "acc": step / 10.0}
+            if step % 2 == 0:
+                row["loss"] = step
+            rows.append({k: v for k, v in row.items() if k in spec["keys"]})
+        return rows
+
+    def execute(self, query, variable_values):
+        with self.lock:
+            self.queries += 1
+        time.sleep(self.latency)
+        if "summaryMetrics" in variable_values:
+            self.summary_writes.append(json.loads(variable_values["summaryMetrics"]))
+            return {"upsertBucket": {"bucket": {"id": variable_values["id"]}}}
+        if "specs" not in variable_values and "name" in variable_values:
+            i = int(variable_values["name"].split("-")[1])
+            return {"project": {"run": self.run(i)}}
+        if "specs" not in variable_values:
+            self.last_query = query
+            self.pages.append(variable_values["perPage"])
+            start = int(variable_values["cursor"] or 0)
+            end = min(start + variable_values["perPage"], self.num_runs)
+            edges = [
+                {"node": self.run(i), "cursor": str(i + 1)} for i in range(start, end)
+            ]
+            return {
+                "project": {
+                    "runCount": self.num_runs,
+                    "runs": {
+                        "edges": edges,
+                        "pageInfo": {"hasNextPage": end < self.num_runs},
+                    },
+                }
+            }
+        spec = json.loads(variable_values["specs"][0])
+        if "name" in variable_values:
+            rows = self.history(variable_values["name"], spec)
+            return {"project": {"run": {"sampledHistory": [rows]}}}
+        names = sorted(k for k in variable_values if k.startswith("name"))
+        return {
+            "project": {
+                "run%s"
+                % key[4:]: {
+                    "sampledHistory": [self.history(variable_values[key], spec)]
+                }
+                for key in names
+            }
+        }
+
+
+STUB_RUN = SimpleNamespace(entity="test", project="test", id="test")
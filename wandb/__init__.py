@@ -54,7 +54,7 @@ AlertLevel = wandb_sdk.AlertLevel
 Settings = wandb_sdk.Settings
 Config = wandb_sdk.Config
 
-from wandb.apis import InternalApi, PublicApi
+from wandb.apis import InternalApi
 from wandb.errors import CommError, UsageError
 
 _preinit = wandb_lib.preinit
@@ -63,32 +63,58 @@ _lazyloader = wandb_lib.lazyloader
 # Call import module hook to setup any needed require hooks
 wandb.sdk.wandb_require._import_module_hook()
 
-from wandb import wandb_torch
-
-# Move this (keras.__init__ expects it at top level)
-from wandb.data_types import Graph
-from wandb.data_types import Image
-from wandb.data_types import Plotly
-
-# from wandb.data_types import Bokeh # keeping out of top level for now since Bokeh plots have poor UI
-from wandb.data_types import Video
-from wandb.data_types import Audio
-from wandb.data_types import Table
-from wandb.data_types import Html
-from wandb.data_types import Object3D
-from wandb.data_types import Molecule
-from wandb.data_types import Histogram
-from wandb.data_types import Classes
-from wandb.data_types import JoinedTable
-
-from wandb.wandb_agent import agent
-
-# from wandb.core import *
-from wandb.viz import visualize
-from wandb import plot
-from wandb import plots  # deprecating this
-from wandb.integration.sagemaker import sagemaker_auth
-from wandb.sdk.internal import profiler
+# These are slow to import, so they're imported the first time they're used.
+# Maps each attribute to the module it comes from and its name there, None for
+# the module itself.
+_LAZY_ATTRIBUTES = {
+    "PublicApi": ("wandb.apis", "PublicApi"),
+    "Api": ("wandb.apis", "PublicApi"),
+    "api": (None, None),
+    "wandb_torch": ("wandb.wandb_torch", None),
+    "data_types": ("wandb.data_types", None),
+    # keras.__init__ expects these at top level
+    "Graph": ("wandb.data_types", "Graph"),
+    "Image": ("wandb.data_types", "Image"),
+    "Plotly": ("wandb.data_types", "Plotly"),
+    # Bokeh is kept out of top level for now since Bokeh plots have poor UI
+    "Video": ("wandb.data_types", "Video"),
+    "Audio": ("wandb.data_types", "Audio"),
+    "Table": ("wandb.data_types", "Table"),
+    "Html": ("wandb.data_types", "Html"),
+    "Object3D": ("wandb.data_types", "Object3D"),
+    "Molecule": ("wandb.data_types", "Molecule"),
+    "Histogram": ("wandb.data_types", "Histogram"),
+    "Classes": ("wandb.data_types", "Classes"),
+    "JoinedTable": ("wandb.data_types", "JoinedTable"),
+    "wandb_agent": ("wandb.wandb_agent", None),
+    "agent": ("wandb.wandb_agent", "agent"),
+    "viz": ("wandb.viz", None),
+    "visualize": ("wandb.viz", "visualize"),
+    "plot": ("wandb.plot", None),
+    "plots": ("wandb.plots", None),  # deprecating this
+    "sagemaker_auth": ("wandb.integration.sagemaker", "sagemaker_auth"),
+    "profiler": ("wandb.sdk.internal.profiler", None),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_ATTRIBUTES:
+        return _lazyloader.import_submodule(__name__, name)
+    import importlib
+
+    module_name, attr = _LAZY_ATTRIBUTES[name]
+    if module_name is None:
+        value = InternalApi()
+    else:
+        value = importlib.import_module(module_name)
+        if attr is not None:
+            value = getattr(value, attr)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
 
 
 # Used to make sure we don't use some code in the incorrect process context
@@ -125,8 +151,6 @@ def _assert_is_user_process():
 # agent()
 
 # globals
-Api = PublicApi
-api = InternalApi()
 run = None
 config = _preinit.PreInitCallable(
     _preinit.PreInitObject("wandb.config"), wandb_sdk.wandb_config.Config
@@ -195,6 +219,12 @@ def load_ipython_extension(ipython):
     ipython.register_magics(wandb.jupyter.WandBMagics)
 
 
+if sys.version_info < (3, 7):
+    # modules can't define __getattr__ before python 3.7
+    for _name in _LAZY_ATTRIBUTES:
+        __getattr__(_name)
+    import wandb.sdk.internal.internal  # noqa: F401
+
 if wandb_sdk.lib.ipython.in_jupyter():
     from IPython import get_ipython
 
@@ -27,11 +27,36 @@ if env.ssl_disabled():
 
     requests.Session.merge_environment_settings = merge_environment_settings
 
+import importlib
+import sys
+
 reset_path = util.vendor_setup()
 
 from .internal import Api as InternalApi  # noqa
-from .public import Api as PublicApi  # noqa
 
 reset_path()
 
+
+def _import_public():
+    """Imports the public api, which is slow, on first use"""
+    reset_path = util.vendor_setup()
+    try:
+        return importlib.import_module(".public", __name__)
+    finally:
+        reset_path()
+
+
+def __getattr__(name):
+    if name == "public":
+        return _import_public()
+    elif name == "PublicApi":
+        globals()[name] = _import_public().Api
+        return globals()[name]
+    raise AttributeError("module {!r} has no attribute {!r}".format(__name__, name))
+
+
+if sys.version_info < (3, 7):
+    # modules can't define __getattr__ before python 3.7
+    PublicApi = _import_public().Api
+
 __all__ = ["InternalApi", "PublicApi"]
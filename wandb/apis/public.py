@@ -10,6 +10,9 @@ You might use the Public API to
 
 For more on using the Public API, check out [our guide](https://docs.wandb.com/guides/track/public-api-guide).
 """
+import abc
+from collections import deque
+from concurrent import futures
 import datetime
 from functools import partial
 import json
@@ -80,6 +83,57 @@ RUN_FRAGMENT = """fragment RunFragment on Run {
     historyKeys
 }"""
 
+# The RunFragment fields each Run attribute needs, for `Api.runs(fields=...)`
+RUN_FIELDS = {
+    "id": "name",
+    "storage_id": "id",
+    "name": "displayName",
+    "display_name": "displayName",
+    "tags": "tags",
+    "sweep_name": "sweepName",
+    "state": "state",
+    "config": "config",
+    "group": "group",
+    "job_type": "jobType",
+    "commit": "commit",
+    "read_only": "readOnly",
+    "created_at": "createdAt",
+    "heartbeat_at": "heartbeatAt",
+    "description": "description",
+    "notes": "notes",
+    "system_metrics": "systemMetrics",
+    "summary": "summaryMetrics",
+    "summary_metrics": "summaryMetrics",
+    "history_line_count": "historyLineCount",
+    "user": "user {\n        name\n        username\n    }",
+    "history_keys": "historyKeys",
+}
+
+
+def _run_fragment(fields):
+    """Returns a RunFragment selecting only what the Run attributes in `fields` need,
+    and the keys to keep of the selected config and summary (None to keep all of them).
+
+    Fields like "summary.loss" or "config.lr" select a single summary or config key.
+    """
+    selection = ["id", "name", "state", "sweepName"]
+    keys = {}
+    for field in fields:
+        attr, _, key = field.partition(".")
+        if attr not in RUN_FIELDS:
+            raise ValueError("Unknown run field: %s" % field)
+        name = RUN_FIELDS[attr]
+        if name not in selection:
+            selection.append(name)
+        if name in ("config", "summaryMetrics"):
+            if not key:
+                keys[name] = None
+            elif keys.get(name, set()) is not None:
+                keys.setdefault(name, set()).add(key)
+    fragment = "fragment RunFragment on Run {\n    %s\n}" % "\n    ".join(selection)
+    return fragment, keys
+
+
 FILE_FRAGMENT = """fragment RunFilesFragment on Run {
     files(names: $fileNames, after: $fileCursor, first: $fileLimit) {
         edges {
@@ -610,7 +664,16 @@ class Api(object):
         res = self._client.execute(self.USERS_QUERY, {"query": username_or_email})
         return [User(self._client, edge["node"]) for edge in res["users"]["edges"]]
 
-    def runs(self, path=None, filters=None, order="-created_at", per_page=50):
+    def runs(
+        self,
+        path=None,
+        filters=None,
+        order="-created_at",
+        per_page=50,
+        fields=None,
+        prefetch=False,
+        max_per_page=None,
+    ):
         """
         Return a set of runs from a project that match the filters provided.
 
@@ -651,6 +714,11 @@ class Api(object):
             api.runs(path="my_entity/my_project", order="+summary_metrics.loss")
             ```
 
+            List the names and final loss of all the runs in my_project, without fetching the rest
+            ```
+            api.runs(path="my_entity/my_project", fields=["name", "summary.loss"])
+            ```
+
         Arguments:
             path: (str) path to project, should be in the form: "entity/project"
             filters: (dict) queries for specific runs using the MongoDB query language.
@@ -663,13 +731,20 @@ class Api(object):
                 If you prepend order with a + order is ascending.
                 If you prepend order with a - order is descending (default).
                 The default order is run.created_at from newest to oldest.
+            per_page: (int) the number of runs fetched per request
+            fields: ([str]) only fetch these run attributes, e.g. `name`, `tags`, `config` or `summary`.
+                `config.key` and `summary.key` only keep that key of the config or summary.
+                The runs can't be updated until they are reloaded with `run.load(force=True)`.
+            prefetch: (bool) fetch the next page of runs in the background while the current one is used
+            max_per_page: (int) grow the page size up to this many runs while requests are fast,
+                by default the page size stays at `per_page`
 
         Returns:
             A `Runs` object, which is an iterable collection of `Run` objects.
         """
         entity, project = self._parse_project_path(path)
         filters = filters or {}
-        key = (path or "") + str(filters) + str(order)
+        key = (path or "") + str(filters) + str(order) + str(fields)
         if not self._runs.get(key):
             self._runs[key] = Runs(
                 self.client,
@@ -678,6 +753,9 @@ class Api(object):
                 filters=filters,
                 order=order,
                 per_page=per_page,
+                fields=fields,
+                prefetch=prefetch,
+                max_per_page=max_per_page,
             )
         return self._runs[key]
 
@@ -805,23 +883,63 @@ class Attrs(object):
 
 
 class Paginator(object):
+    """Pages through the results of `QUERY`.
+
+    With `prefetch` the next page is requested in the background while the current
+    one is converted and consumed. When `max_per_page` is larger than `per_page` the
+    page size doubles while pages take less than half of `PAGE_SECONDS` to fetch,
+    and halves (down to `per_page`) while they take more than twice as long.
+
+    A listing that isn't read to the end stops prefetching when it's closed or
+    used as a context manager.
+    """
+
     QUERY = None
+    PAGE_SECONDS = 1.0
 
-    def __init__(self, client, variables, per_page=None):
+    def __init__(
+        self, client, variables, per_page=None, prefetch=False, max_per_page=None
+    ):
         self.client = client
         self.variables = variables
         # We don't allow unbounded paging
         self.per_page = per_page
         if self.per_page is None:
             self.per_page = 50
+        self.min_per_page = self.per_page
+        self.max_per_page = max(self.per_page, max_per_page or 0)
+        self.prefetch = prefetch
         self.objects = []
         self.index = -1
         self.last_response = None
+        self._next_response = None  # future of the prefetched page
+        self._executor = None
 
     def __iter__(self):
         self.index = -1
         return self
 
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # the page being prefetched holds on to the paginator, so this only
+        # runs once it's done, and just shuts down the idle worker thread
+        if getattr(self, "_executor", None) is not None:
+            self.close()
+
+    def close(self):
+        """Stops prefetching, pages are still loaded as they are needed."""
+        if self._next_response is not None:
+            self._next_response.cancel()
+            self._next_response = None
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
     def __len__(self):
         if self.length is None:
             self._load_page()
@@ -850,13 +968,43 @@ class Paginator(object):
     def _load_page(self):
         if not self.more:
             return False
-        self.update_variables()
-        self.last_response = self.client.execute(
-            self.QUERY, variable_values=self.variables
-        )
+        if self._next_response is not None:
+            future, self._next_response = self._next_response, None
+            response, elapsed = future.result()
+        else:
+            response, elapsed = self._execute(self._next_variables())
+        self.last_response = response
+        self._adapt_page_size(elapsed)
+        if self.prefetch and self.more:
+            if self._executor is None:
+                self._executor = futures.ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix=type(self).__name__
+                )
+            self._next_response = self._executor.submit(
+                self._execute, self._next_variables()
+            )
+        elif self._executor is not None:
+            # that was the last page
+            self.close()
         self.objects.extend(self.convert_objects())
         return True
 
+    def _next_variables(self):
+        self.update_variables()
+        return dict(self.variables)
+
+    def _execute(self, variables):
+        """Returns the response to QUERY and the seconds it took"""
+        start = time.time()
+        response = self.client.execute(self.QUERY, variable_values=variables)
+        return response, time.time() - start
+
+    def _adapt_page_size(self, elapsed):
+        if elapsed < self.PAGE_SECONDS / 2:
+            self.per_page = min(self.per_page * 2, self.max_per_page)
+        elif elapsed > self.PAGE_SECONDS * 2:
+            self.per_page = max(self.per_page // 2, self.min_per_page)
+
     def __getitem__(self, index):
         loaded = True
         while loaded and index > len(self.objects) - 1:
@@ -1292,10 +1440,11 @@ class Project(Attrs):
 class Runs(Paginator):
     """An iterable collection of runs associated with a project and optional filter.
     This is generally used indirectly via the `Api`.runs method
+
+    When `fields` is given only those run attributes are fetched and parsed, see `Api.runs`.
     """
 
-    QUERY = gql(
-        """
+    QUERY_TEMPLATE = """
         query Runs($project: String!, $entity: String!, $cursor: String, $perPage: Int = 50, $order: String, $filters: JSONString) {
             project(name: $project, entityName: $entity) {
                 runCount(filters: $filters)
@@ -1316,22 +1465,38 @@ class Runs(Paginator):
         }
         %s
         """
-        % RUN_FRAGMENT
-    )
+    QUERY = gql(QUERY_TEMPLATE % RUN_FRAGMENT)
 
-    def __init__(self, client, entity, project, filters={}, order=None, per_page=50):
+    def __init__(
+        self,
+        client,
+        entity,
+        project,
+        filters={},
+        order=None,
+        per_page=50,
+        fields=None,
+        prefetch=False,
+        max_per_page=None,
+    ):
         self.entity = entity
         self.project = project
         self.filters = filters
         self.order = order
+        self.fields = fields
+        self._keys = {}
+        if fields is not None:
+            fragment, self._keys = _run_fragment(fields)
+            self.QUERY = gql(self.QUERY_TEMPLATE % fragment)
         self._sweeps = {}
+        self._histories_queries = {}
         variables = {
             "project": self.project,
             "entity": self.entity,
             "order": self.order,
             "filters": json.dumps(self.filters),
         }
-        super(Runs, self).__init__(client, variables, per_page)
+        super(Runs, self).__init__(client, variables, per_page, prefetch, max_per_page)
 
     @property
     def length(self):
@@ -1366,6 +1531,8 @@ class Runs(Paginator):
                 run_response["node"]["name"],
                 run_response["node"],
             )
+            if self.fields is not None:
+                run._project(self._keys)
             objs.append(run)
 
             if run.sweep_name:
@@ -1387,6 +1554,112 @@ class Runs(Paginator):
 
         return objs
 
+    @normalize_exceptions
+    def histories(
+        self,
+        keys,
+        samples=500,
+        x_axis="_step",
+        format="pandas",
+        runs_per_query=10,
+        max_workers=8,
+    ):
+        """
+        Returns sampled history metrics for every run in the collection as one long-format table.
+
+        Histories of `runs_per_query` runs are requested in a single query, with up to
+        `max_workers` queries in flight at once.
+
+        Example:
+            Compare the loss curves of all the runs in a project
+
+            ```python
+            runs = api.runs("l2k2/examples-numpy-boston")
+            df = runs.histories(keys=["loss"])
+            df.pivot(index="_step", columns="run_id", values="loss").plot()
+            ```
+
+        Arguments:
+            keys ([str]): metrics to fetch
+            samples (int, optional): the number of samples to return per run
+            x_axis (str, optional): use this metric as the xAxis, defaults to _step
+            format (str, optional): "pandas" for a `pandas.DataFrame`, "numpy" for a dict of numpy arrays
+            runs_per_query (int, optional): the number of runs whose histories are fetched in one query
+            max_workers (int, optional): the maximum number of queries in flight
+
+        Returns:
+            A table with a "run_id" column, the x_axis column and a column for each key,
+            with one row per sample of each run. Missing values are None (NaN with pandas).
+        """
+        if not isinstance(keys, list):
+            wandb.termerror("keys must be specified in a list")
+            return []
+        if not all(isinstance(key, str) for key in keys):
+            wandb.termerror("keys argument must be a list of strings")
+            return []
+        if format not in ("pandas", "numpy"):
+            raise ValueError('format must be "pandas" or "numpy"')
+        module = util.get_module(
+            format,
+            required="Runs.histories requires {0}, run `pip install {0}`".format(
+                format
+            ),
+        )
+
+        names = [x_axis] + [key for key in keys if key != x_axis]
+        spec = json.dumps({"keys": names, "samples": samples})
+        runs = list(self)
+        batches = [
+            runs[i : i + runs_per_query] for i in range(0, len(runs), runs_per_query)
+        ]
+        columns = {name: [] for name in ["run_id"] + names}
+        with futures.ThreadPoolExecutor(max_workers=max_workers) as executor:
+            for batch, histories in zip(
+                batches, executor.map(partial(self._sampled_histories, spec), batches)
+            ):
+                for run, rows in zip(batch, histories):
+                    columns["run_id"].extend([run.id] * len(rows))
+                    for name in names:
+                        columns[name].extend([row.get(name) for row in rows])
+
+        if format == "pandas":
+            return module.DataFrame(columns, columns=list(columns))
+        return {name: module.asarray(column) for name, column in columns.items()}
+
+    def _sampled_histories(self, spec, runs):
+        """Fetches the sampled history of several runs, using one aliased field per run"""
+        count = len(runs)
+        if count not in self._histories_queries:
+            self._histories_queries[count] = gql(
+                """
+            query RunsSampledHistory($project: String!, $entity: String!, $specs: [JSONString!]!, %s) {
+                project(name: $project, entityName: $entity) {
+                    %s
+                }
+            }
+            """
+                % (
+                    ", ".join("$name%d: String!" % i for i in range(count)),
+                    " ".join(
+                        "run%d: run(name: $name%d) { sampledHistory(specs: $specs) }"
+                        % (i, i)
+                        for i in range(count)
+                    ),
+                )
+            )
+        variables = {"project": self.project, "entity": self.entity, "specs": [spec]}
+        for i, run in enumerate(runs):
+            variables["name%d" % i] = run.id
+        response = self.client.execute(
+            self._histories_queries[count], variable_values=variables
+        )
+        project = response["project"]
+        # sampledHistory returns one list per spec, we only send one spec
+        return [
+            project["run%d" % i]["sampledHistory"][0] if project["run%d" % i] else []
+            for i in range(count)
+        ]
+
     def __repr__(self):
         return "<Runs {}/{}>".format(self.entity, self.project)
 
@@ -1493,13 +1766,11 @@ class Run(Attrs):
         self._base_dir = env.get_dir(tempfile.gettempdir())
         self.id = run_id
         self.sweep = None
-        self.dir = os.path.join(self._base_dir, *self.path)
-        try:
-            os.makedirs(self.dir)
-        except OSError:
-            pass
         self._summary = None
         self._state = attrs.get("state", "not found")
+        self._projected = False
+        # the summary keys held by a projected run, None when it has all of them
+        self._summary_keys = None
 
         self.load(force=not attrs)
 
@@ -1507,6 +1778,16 @@ class Run(Attrs):
     def state(self):
         return self._state
 
+    @property
+    def dir(self):
+        # created on first use, listing many runs shouldn't create a directory for each
+        path = os.path.join(self._base_dir, *self.path)
+        try:
+            os.makedirs(path)
+        except OSError:
+            pass
+        return path
+
     @property
     def entity(self):
         return self._entity
@@ -1585,20 +1866,20 @@ class Run(Attrs):
         )
 
     def load(self, force=False):
-        query = gql(
-            """
-        query Run($project: String!, $entity: String!, $name: String!) {
-            project(name: $project, entityName: $entity) {
-                run(name: $name) {
-                    ...RunFragment
+        if force or not self._attrs:
+            query = gql(
+                """
+            query Run($project: String!, $entity: String!, $name: String!) {
+                project(name: $project, entityName: $entity) {
+                    run(name: $name) {
+                        ...RunFragment
+                    }
                 }
             }
-        }
-        %s
-        """
-            % RUN_FRAGMENT
-        )
-        if force or not self._attrs:
+            %s
+            """
+                % RUN_FRAGMENT
+            )
             response = self._exec(query)
             if (
                 response is None
@@ -1608,6 +1889,8 @@ class Run(Attrs):
                 raise ValueError("Could not find run %s" % self)
             self._attrs = response["project"]["run"]
             self._state = self._attrs["state"]
+            self._projected = False
+            self._summary_keys = None
 
             if self.sweep_name and not self.sweep:
                 # There may be a lot of runs. Don't bother pulling them all
@@ -1644,6 +1927,28 @@ class Run(Attrs):
         self._attrs["rawconfig"] = config_raw
         return self._attrs
 
+    def _project(self, keys):
+        """Marks the run as only holding some of its attributes, see `Api.runs(fields=...)`,
+        and drops the config and summary keys that weren't selected.
+        """
+        self._projected = True
+        if "summaryMetrics" not in keys:
+            self._summary_keys = set()
+        elif keys["summaryMetrics"] is not None:
+            self._summary_keys = set(keys["summaryMetrics"])
+            self._attrs["summaryMetrics"] = {
+                key: value
+                for key, value in self._attrs["summaryMetrics"].items()
+                if key in keys["summaryMetrics"]
+            }
+        if keys.get("config"):
+            for name in ("config", "rawconfig"):
+                self._attrs[name] = {
+                    key: value
+                    for key, value in self._attrs[name].items()
+                    if key in keys["config"]
+                }
+
     @normalize_exceptions
     def wait_until_finished(self):
         query = gql(
@@ -1672,6 +1977,11 @@ class Run(Attrs):
         """
         Persists changes to the run object to the wandb backend.
         """
+        if self._projected:
+            raise ValueError(
+                "Run %s was fetched with a subset of its fields, call load(force=True) before updating it"
+                % self
+            )
         mutation = gql(
             """
         mutation UpsertBucket($id: String!, $description: String, $display_name: String, $notes: String, $tags: [String!], $config: JSONString!, $groupName: String) {
@@ -1869,7 +2179,15 @@ class Run(Attrs):
         return lines
 
     @normalize_exceptions
-    def scan_history(self, keys=None, page_size=1000, min_step=None, max_step=None):
+    def scan_history(
+        self,
+        keys=None,
+        page_size=1000,
+        min_step=None,
+        max_step=None,
+        prefetch=0,
+        as_batches=False,
+    ):
         """
         Returns an iterable collection of all history records for a run.
 
@@ -1882,13 +2200,33 @@ class Run(Attrs):
             losses = [row["Loss"] for row in history]
             ```
 
+            Export a long run one page at a time as dataframes
+
+            ```python
+            for df in run.scan_history(page_size=10000, as_batches=True):
+                df.to_parquet("history-{}.parquet".format(df["_step"].iloc[0]))
+            ```
+
+            Fetch pages ahead in the background, stopping when leaving the loop early
+
+            ```python
+            with run.scan_history(keys=["Loss"], prefetch=4) as history:
+                for row in history:
+                    if row["Loss"] < 0.1:
+                        break
+            ```
+
 
         Arguments:
             keys ([str], optional): only fetch these keys, and only fetch rows that have all of keys defined.
             page_size (int, optional): size of pages to fetch from the api
+            prefetch (int, optional): number of pages fetched concurrently ahead of the one being read,
+                0 to fetch each page only when it is needed
+            as_batches (bool, optional): iterate over pages as `pandas.DataFrame`s, or dicts of
+                numpy arrays if pandas isn't installed, instead of over rows
 
         Returns:
-            An iterable collection over history records (dict).
+            An iterable collection over history records (dict), or over batches of them.
         """
         if keys is not None and not isinstance(keys, list):
             wandb.termerror("keys must be specified in a list")
@@ -1913,6 +2251,8 @@ class Run(Attrs):
                 page_size=page_size,
                 min_step=min_step,
                 max_step=max_step,
+                prefetch=prefetch,
+                as_batches=as_batches,
             )
         else:
             return SampledHistoryScan(
@@ -1922,6 +2262,8 @@ class Run(Attrs):
                 page_size=page_size,
                 min_step=min_step,
                 max_step=max_step,
+                prefetch=prefetch,
+                as_batches=as_batches,
             )
 
     @normalize_exceptions
@@ -2001,8 +2343,18 @@ class Run(Attrs):
     @property
     def summary(self):
         if self._summary is None:
-            # TODO: fix the outdir issue
-            self._summary = HTTPSummary(self, self.client, summary=self.summary_metrics)
+            if self._summary_keys is not None and not self._summary_keys:
+                # the run was listed without its summary
+                self.load(force=True)
+            if self._summary_keys is None:
+                # TODO: fix the outdir issue
+                self._summary = HTTPSummary(
+                    self, self.client, summary=self.summary_metrics
+                )
+            else:
+                self._summary = _ProjectedSummary(
+                    self, self.client, summary=self.summary_metrics
+                )
         return self._summary
 
     @property
@@ -2058,6 +2410,31 @@ class Run(Attrs):
         return "<Run {} ({})>".format("/".join(self.path), self.state)
 
 
+class _ProjectedSummary(HTTPSummary):
+    """The summary of a run listed with only some summary keys, see `Api.runs(fields=...)`.
+
+    Reads are served from the keys that were fetched. Since the summary is written
+    back as a whole, the run is reloaded and the keys that weren't fetched are kept
+    before the first write.
+    """
+
+    def _write(self, commit=False):
+        if commit and self._run._summary_keys is not None:
+            keys = self._run._summary_keys
+            self._run.load(force=True)
+            summary = {
+                key: value
+                for key, value in self._run.summary_metrics.items()
+                if key not in keys
+            }
+            summary.update(self._json_dict)
+            # children of the summary hold on to this dict
+            self._json_dict.clear()
+            self._json_dict.update(summary)
+            self._run._attrs["summaryMetrics"] = self._json_dict
+        return super(_ProjectedSummary, self)._write(commit)
+
+
 class Sweep(Attrs):
     """A set of runs associated with a sweep.
 
@@ -2678,30 +3055,60 @@ class BetaReport(Attrs):
         return self.to_html()
 
 
-class HistoryScan(object):
-    QUERY = gql(
-        """
-        query HistoryPage($entity: String!, $project: String!, $run: String!, $minStep: Int64!, $maxStep: Int64!, $pageSize: Int!) {
-            project(name: $project, entityName: $entity) {
-                run(name: $run) {
-                    history(minStep: $minStep, maxStep: $maxStep, samples: $pageSize)
-                }
-            }
-        }
-        """
-    )
+def _history_batch(rows):
+    """Converts a page of history rows to columns, None where a row has no value"""
+    keys = {}
+    for row in rows:
+        keys.update(dict.fromkeys(row))
+    columns = {key: [row.get(key) for row in rows] for key in keys}
+    pandas = util.get_module("pandas")
+    if pandas:
+        return pandas.DataFrame(columns, columns=list(keys))
+    np = util.get_module("numpy")
+    if np:
+        return {key: np.asarray(column) for key, column in columns.items()}
+    return columns
+
+
+@six.add_metaclass(abc.ABCMeta)
+class _HistoryScanBase(object):
+    """Iterates over a run's history page by page, fetching up to `prefetch` pages
+    concurrently while returning rows (or batches, see `as_batches`) in step order.
+
+    A scan that isn't read to the end stops fetching pages when it's closed or
+    used as a context manager.
+    """
 
-    def __init__(self, client, run, min_step, max_step, page_size=1000):
+    def __init__(
+        self, client, run, min_step, max_step, page_size, prefetch, as_batches
+    ):
         self.client = client
         self.run = run
         self.page_size = page_size
         self.min_step = min_step
         self.max_step = max_step
+        self.prefetch = prefetch
+        self.as_batches = as_batches
         self.page_offset = min_step  # minStep for next page
         self.scan_offset = 0  # index within current page of rows
         self.rows = []  # current page of rows
+        self._pages = deque()  # futures of the pages being fetched, in order
+        self._executor = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __del__(self):
+        # pages being fetched hold on to the scan, so this only runs once they
+        # are done, and just shuts down the idle worker threads
+        if getattr(self, "_executor", None) is not None:
+            self._cancel()
 
     def __iter__(self):
+        self._cancel()
         self.page_offset = self.min_step
         self.scan_offset = 0
         self.rows = []
@@ -2713,38 +3120,115 @@ class HistoryScan(object):
                 row = self.rows[self.scan_offset]
                 self.scan_offset += 1
                 return row
-            if self.page_offset >= self.max_step:
+            rows = self._next_page()
+            if rows is None:
                 raise StopIteration()
-            self._load_next()
+            if self.as_batches:
+                if rows:
+                    return _history_batch(rows)
+            else:
+                self.rows = rows
+                self.scan_offset = 0
 
     next = __next__
 
+    def _next_range(self):
+        min_step = self.page_offset
+        max_step = min(min_step + self.page_size, self.max_step)
+        self.page_offset += self.page_size
+        return min_step, max_step
+
+    def _next_page(self):
+        """Returns the rows of the next page, or None after the last one"""
+        if self.prefetch <= 0:
+            if self.page_offset >= self.max_step:
+                return None
+            return self._load_page(*self._next_range())
+
+        if self._executor is None:
+            self._executor = futures.ThreadPoolExecutor(
+                max_workers=self.prefetch, thread_name_prefix="HistoryScan"
+            )
+        while len(self._pages) < self.prefetch and self.page_offset < self.max_step:
+            self._pages.append(
+                self._executor.submit(self._load_page, *self._next_range())
+            )
+        if not self._pages:
+            self._cancel()
+            return None
+        try:
+            return self._pages.popleft().result()
+        except Exception:
+            self._cancel()
+            raise
+
+    def _cancel(self):
+        for page in self._pages:
+            page.cancel()
+        self._pages.clear()
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+
+    def close(self):
+        """Stops fetching pages, the scan can still be iterated again."""
+        self._cancel()
+        self.rows = []
+        self.page_offset = self.max_step
+
+    @abc.abstractmethod
+    def _load_page(self, min_step, max_step):
+        raise NotImplementedError
+
+
+class HistoryScan(_HistoryScanBase):
+    QUERY = gql(
+        """
+        query HistoryPage($entity: String!, $project: String!, $run: String!, $minStep: Int64!, $maxStep: Int64!, $pageSize: Int!) {
+            project(name: $project, entityName: $entity) {
+                run(name: $run) {
+                    history(minStep: $minStep, maxStep: $maxStep, samples: $pageSize)
+                }
+            }
+        }
+        """
+    )
+
+    def __init__(
+        self,
+        client,
+        run,
+        min_step,
+        max_step,
+        page_size=1000,
+        prefetch=0,
+        as_batches=False,
+    ):
+        super(HistoryScan, self).__init__(
+            client, run, min_step, max_step, page_size, prefetch, as_batches
+        )
+
     @normalize_exceptions
     @retry.retriable(
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def _load_next(self):
-        max_step = self.page_offset + self.page_size
-        if max_step > self.max_step:
-            max_step = self.max_step
+    def _load_page(self, min_step, max_step):
         variables = {
             "entity": self.run.entity,
             "project": self.run.project,
             "run": self.run.id,
-            "minStep": int(self.page_offset),
+            "minStep": int(min_step),
             "maxStep": int(max_step),
             "pageSize": int(self.page_size),
         }
 
         res = self.client.execute(self.QUERY, variable_values=variables)
         res = res["project"]["run"]["history"]
-        self.rows = [json.loads(row) for row in res]
-        self.page_offset += self.page_size
-        self.scan_offset = 0
+        return [json.loads(row) for row in res]
 
 
-class SampledHistoryScan(object):
+class SampledHistoryScan(_HistoryScanBase):
     QUERY = gql(
         """
         query SampledHistoryPage($entity: String!, $project: String!, $run: String!, $spec: JSONString!) {
@@ -2757,44 +3241,28 @@ class SampledHistoryScan(object):
         """
     )
 
-    def __init__(self, client, run, keys, min_step, max_step, page_size=1000):
-        self.client = client
-        self.run = run
+    def __init__(
+        self,
+        client,
+        run,
+        keys,
+        min_step,
+        max_step,
+        page_size=1000,
+        prefetch=0,
+        as_batches=False,
+    ):
+        super(SampledHistoryScan, self).__init__(
+            client, run, min_step, max_step, page_size, prefetch, as_batches
+        )
         self.keys = keys
-        self.page_size = page_size
-        self.min_step = min_step
-        self.max_step = max_step
-        self.page_offset = min_step  # minStep for next page
-        self.scan_offset = 0  # index within current page of rows
-        self.rows = []  # current page of rows
-
-    def __iter__(self):
-        self.page_offset = self.min_step
-        self.scan_offset = 0
-        self.rows = []
-        return self
-
-    def __next__(self):
-        while True:
-            if self.scan_offset < len(self.rows):
-                row = self.rows[self.scan_offset]
-                self.scan_offset += 1
-                return row
-            if self.page_offset >= self.max_step:
-                raise StopIteration()
-            self._load_next()
-
-    next = __next__
 
     @normalize_exceptions
     @retry.retriable(
         check_retry_fn=util.no_retry_auth,
         retryable_exceptions=(RetryError, requests.RequestException),
     )
-    def _load_next(self):
-        max_step = self.page_offset + self.page_size
-        if max_step > self.max_step:
-            max_step = self.max_step
+    def _load_page(self, min_step, max_step):
         variables = {
             "entity": self.run.entity,
             "project": self.run.project,
@@ -2802,7 +3270,7 @@ class SampledHistoryScan(object):
             "spec": json.dumps(
                 {
                     "keys": self.keys,
-                    "minStep": int(self.page_offset),
+                    "minStep": int(min_step),
                     "maxStep": int(max_step),
                     "samples": int(self.page_size),
                 }
@@ -2811,9 +3279,7 @@ class SampledHistoryScan(object):
 
         res = self.client.execute(self.QUERY, variable_values=variables)
         res = res["project"]["run"]["sampledHistory"]
-        self.rows = res[0]
-        self.page_offset += self.page_size
-        self.scan_offset = 0
+        return res[0]
 
 
 class ProjectArtifactTypes(Paginator):
@@ -3817,7 +4283,8 @@ class Artifact(artifacts.Artifact):
         for entry in manifest.entries.values():
             if entry.ref is None:
                 if (
-                    artifacts.md5_file_b64(os.path.join(dirpath, entry.path))
+                    # hash again instead of trusting the digest cache
+                    util.md5_file(os.path.join(dirpath, entry.path))
                     != entry.digest
                 ):
                     raise ValueError("Digest mismatch for file: %s" % entry.path)
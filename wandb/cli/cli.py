@@ -468,6 +468,9 @@ def init(ctx, project, entity, reset, mode):
 )
 @click.option("--ignore", hidden=True)
 @click.option("--show", default=5, help="Number of runs to show")
+@click.option(
+    "--parallel", default=1, type=int, help="Number of runs to sync concurrently."
+)
 @display_error
 def sync(
     ctx,
@@ -490,6 +493,7 @@ def sync(
     clean=None,
     clean_old_hours=24,
     clean_force=None,
+    parallel=None,
 ):
     # TODO: rather unfortunate, needed to avoid creating a `wandb` directory
     os.environ["WANDB_DIR"] = TMPDIR.name
@@ -561,6 +565,7 @@ def sync(
             view=view,
             verbose=verbose,
             sync_tensorboard=sync_tensorboard,
+            parallel=parallel,
         )
         for p in path:
             sm.add(p)
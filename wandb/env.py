@@ -14,7 +14,6 @@ import os
 import sys
 import json
 import wandb
-from distutils.util import strtobool
 
 CONFIG_PATHS = "WANDB_CONFIG_PATHS"
 SWEEP_PARAM_PATH = "WANDB_SWEEP_PARAM_PATH"
@@ -68,6 +67,11 @@ CONFIG_DIR = "WANDB_CONFIG_DIR"
 CACHE_DIR = "WANDB_CACHE_DIR"
 DISABLE_SSL = "WANDB_INSECURE_DISABLE_SSL"
 SERVICE = "WANDB_SERVICE"
+FILE_STREAM_COMPRESSION = "WANDB_FILE_STREAM_COMPRESSION"
+FILE_STREAM_MAX_INFLIGHT = "WANDB_FILE_STREAM_MAX_INFLIGHT"
+MEDIA_ENCODE_THREADS = "WANDB_MEDIA_ENCODE_THREADS"
+IMAGE_PNG_COMPRESS_LEVEL = "WANDB_IMAGE_PNG_COMPRESS_LEVEL"
+CONSOLE_FLUSH_INTERVAL = "WANDB_CONSOLE_FLUSH_INTERVAL"
 
 # For testing, to be removed in future version
 USE_V1_ARTIFACTS = "_WANDB_USE_V1_ARTIFACTS"
@@ -109,6 +113,21 @@ def immutable_keys():
     ]
 
 
+def strtobool(val):
+    """Convert a string representation of truth to 1 or 0, like distutils'
+    strtobool (importing distutils is slow and it's deprecated).
+
+    Raises ValueError if `val` is anything else.
+    """
+    val = val.lower()
+    if val in ("y", "yes", "t", "true", "on", "1"):
+        return 1
+    elif val in ("n", "no", "f", "false", "off", "0"):
+        return 0
+    else:
+        raise ValueError("invalid truth value %r" % (val,))
+
+
 def _env_as_bool(var, default=None, env=None):
     if env is None:
         env = os.environ
@@ -172,6 +191,57 @@ def get_http_timeout(default=10, env=None):
     return int(env.get(HTTP_TIMEOUT, default))
 
 
+def get_file_stream_compression(default=None, env=None):
+    if env is None:
+        env = os.environ
+
+    return env.get(FILE_STREAM_COMPRESSION, default)
+
+
+def get_file_stream_max_inflight(default=1, env=None):
+    if env is None:
+        env = os.environ
+    val = env.get(FILE_STREAM_MAX_INFLIGHT, default)
+    try:
+        val = int(val)
+    except ValueError:
+        val = default
+    return max(1, val)
+
+
+def get_console_flush_interval(default=None, env=None):
+    if env is None:
+        env = os.environ
+    val = env.get(CONSOLE_FLUSH_INTERVAL, default)
+    try:
+        val = float(val)
+    except (TypeError, ValueError):
+        return default
+    return max(0.0, val)
+
+
+def get_media_encode_threads(default=0, env=None):
+    if env is None:
+        env = os.environ
+    val = env.get(MEDIA_ENCODE_THREADS, default)
+    try:
+        val = int(val)
+    except ValueError:
+        val = default
+    return max(0, val)
+
+
+def get_image_png_compress_level(default=None, env=None):
+    if env is None:
+        env = os.environ
+    val = env.get(IMAGE_PNG_COMPRESS_LEVEL, default)
+    try:
+        val = int(val)
+    except (TypeError, ValueError):
+        return default
+    return min(9, max(0, val))
+
+
 def get_ignore(default=None, env=None):
     if env is None:
         env = os.environ
@@ -0,0 +1,115 @@
+"""Persistent cache of file digests.
+
+Maps a file's path to its md5 as long as its size, mtime and inode are
+unchanged, so files that didn't change aren't hashed again by later saves or
+by other processes, e.g. a resumed run.
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+
+from wandb import env
+import wandb.util
+
+logger = logging.getLogger(__name__)
+
+# Files modified this recently could still change without their mtime changing
+# on filesystems with coarse timestamps, so their digests aren't cached.
+RACY_SECONDS = 1.0
+
+
+def _file_key(path):
+    stat = os.stat(path)
+    return [stat.st_size, stat.st_mtime_ns, stat.st_ino]
+
+
+class DigestCache(object):
+    """Base64 md5 digests of files, kept in a log of JSON lines at `path`.
+
+    Entries are appended as they're computed and the log is compacted when
+    it's loaded with more than twice as many lines as entries.
+    """
+
+    COMPACT_MIN_LINES = 1000
+
+    def __init__(self, path):
+        self.path = path
+        self._entries = None
+        self._lock = threading.Lock()
+
+    def md5(self, path):
+        path = os.path.abspath(path)
+        key = _file_key(path)
+        with self._lock:
+            entries = self._load()
+            entry = entries.get(path)
+            if entry is not None and entry[:3] == key:
+                return entry[3]
+        start = time.time()
+        digest = wandb.util.md5_file(path)
+        if _file_key(path) != key or key[1] / 1e9 > start - RACY_SECONDS:
+            return digest
+        with self._lock:
+            self._entries[path] = key + [digest]
+            self._append({path: self._entries[path]})
+        return digest
+
+    def _load(self):
+        if self._entries is not None:
+            return self._entries
+        self._entries = {}
+        lines = 0
+        try:
+            with open(self.path) as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        self._entries.update(json.loads(line))
+                    except ValueError:
+                        # a line cut short by a crash
+                        continue
+        except (IOError, OSError):
+            return self._entries
+        if lines > max(self.COMPACT_MIN_LINES, 2 * len(self._entries)):
+            self._compact()
+        return self._entries
+
+    def _append(self, entries):
+        try:
+            wandb.util.mkdir_exists_ok(os.path.dirname(self.path))
+            with open(self.path, "a") as f:
+                f.write(json.dumps(entries) + "\n")
+        except (IOError, OSError) as e:
+            logger.warning("Unable to write digest cache %s: %s", self.path, e)
+
+    def _compact(self):
+        tmp_path = "%s.%s.tmp" % (self.path, wandb.util.generate_id())
+        try:
+            with open(tmp_path, "w") as f:
+                for path, entry in self._entries.items():
+                    f.write(json.dumps({path: entry}) + "\n")
+            os.replace(tmp_path, self.path)
+        except (IOError, OSError) as e:
+            logger.warning("Unable to compact digest cache %s: %s", self.path, e)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_digest_cache():
+    """The digest cache shared by this process, kept in the wandb cache dir"""
+    global _cache
+    path = os.path.join(env.get_cache_dir(), "digests.jsonl")
+    with _cache_lock:
+        if _cache is None or _cache.path != path:
+            _cache = DigestCache(path)
+        return _cache
+
+
+def md5_file(path):
+    """The base64 md5 of the file at `path`, cached while the file is unchanged"""
+    return get_digest_cache().md5(path)
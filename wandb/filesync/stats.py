@@ -1,4 +1,5 @@
 import threading
+import time
 
 import wandb
 
@@ -7,9 +8,16 @@ class Stats(object):
     def __init__(self):
         self._stats = {}
         self._lock = threading.Lock()
+        # throughput of completed uploads, measured from the first file queued
+        self._started = None
+        self._last_completed = None
+        self._completed_files = 0
+        self._completed_bytes = 0
 
     def init_file(self, save_name, size, is_artifact_file=False):
         with self._lock:
+            if self._started is None:
+                self._started = time.time()
             self._stats[save_name] = {
                 "deduped": False,
                 "total": size,
@@ -30,6 +38,32 @@ class Stats(object):
         self._stats[save_name]["uploaded"] = 0
         self._stats[save_name]["failed"] = True
 
+    def set_file_completed(self, save_name):
+        with self._lock:
+            file_stats = self._stats.get(save_name)
+            self._completed_files += 1
+            if file_stats is not None:
+                self._completed_bytes += file_stats["total"]
+            self._last_completed = time.time()
+            if self._started is None:
+                self._started = self._last_completed
+
+    def throughput(self):
+        with self._lock:
+            files = self._completed_files
+            total_bytes = self._completed_bytes
+            if self._last_completed is None:
+                elapsed = 0.0
+            else:
+                elapsed = self._last_completed - self._started
+        return {
+            "completed_files": files,
+            "completed_bytes": total_bytes,
+            "elapsed": elapsed,
+            "files_per_sec": files / elapsed if elapsed else 0.0,
+            "bytes_per_sec": total_bytes / elapsed if elapsed else 0.0,
+        }
+
     def summary(self):
         # Need to use list to ensure we get a copy, since other threads may
         # modify this while we iterate
@@ -1,12 +1,26 @@
 """Batching file prepare requests to our API."""
 
 import collections
+from concurrent import futures
+import logging
 import os
 import shutil
+import sys
 import threading
 import wandb.util
 
-from wandb.filesync import step_upload
+from wandb.filesync import digest_cache, step_upload
+
+try:
+    import fcntl
+except ImportError:  # windows
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+# ioctl cloning a file's extents into another on linux filesystems with
+# copy on write support (btrfs, xfs, ...)
+FICLONE = 0x40049409
 
 
 RequestUpload = collections.namedtuple(
@@ -30,56 +44,137 @@ RequestCommitArtifact = collections.namedtuple(
 RequestFinish = collections.namedtuple("RequestFinish", ("callback"))
 
 
+def _reflink(src, dst):
+    """Clones src to dst without copying its data, returns whether it could"""
+    if fcntl is None or not sys.platform.startswith("linux"):
+        return False
+    try:
+        with open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+            fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+    except (IOError, OSError):
+        return False
+    shutil.copystat(src, dst)
+    return True
+
+
+def snapshot_file(src, dst):
+    """Copies src to dst, cloning it where the filesystem supports copy on write"""
+    if _reflink(src, dst):
+        return
+    try:
+        # certain linux distros throw an exception when copying
+        # large files: https://bugs.python.org/issue43743
+        shutil.copy2(src, dst)
+    except OSError:
+        shutil._USE_CP_SENDFILE = False
+        shutil.copy2(src, dst)
+
+
 class StepChecksum(object):
-    def __init__(self, api, tempdir, request_queue, output_queue, stats):
+    """Copies and hashes files to upload on a pool of `max_workers` threads.
+
+    Uploads are passed on as soon as they're ready, in any order, but every
+    other request waits for the uploads queued before it.
+    """
+
+    MAX_WORKERS = min(8, (os.cpu_count() or 1) + 4)
+
+    def __init__(
+        self, api, tempdir, request_queue, output_queue, stats, max_workers=None
+    ):
         self._api = api
         self._tempdir = tempdir
         self._request_queue = request_queue
         self._output_queue = output_queue
         self._stats = stats
+        self._max_workers = max_workers or self.MAX_WORKERS
+
+        self._executor = None
+        self._pending = 0
+        self._pending_cond = threading.Condition()
+        # uploads waiting for one of the same file to be prepared, by save_name
+        self._waiting = {}
 
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
 
+    def _prepare_upload(self, req):
+        path = req.path
+        if req.copy:
+            path = os.path.join(
+                self._tempdir.name, "%s-%s" % (wandb.util.generate_id(), req.save_name),
+            )
+            wandb.util.mkdir_exists_ok(os.path.dirname(path))
+            snapshot_file(req.path, path)
+        checksum = None
+        if req.use_prepare_flow:
+            # passing a checksum through indicates that we'd like to use the
+            # "prepare" file upload flow, in which we prepare the files in
+            # the database before uploading them. This is currently only
+            # used for artifact manifests
+            if req.copy:
+                checksum = wandb.util.md5_file(path)
+            else:
+                checksum = digest_cache.md5_file(path)
+        self._stats.init_file(req.save_name, os.path.getsize(path))
+        self._output_queue.put(
+            step_upload.RequestUpload(
+                path,
+                req.save_name,
+                req.artifact_id,
+                checksum,
+                req.copy,
+                req.save_fn,
+                req.digest,
+            )
+        )
+
+    def _submit_upload(self, req):
+        future = self._executor.submit(self._prepare_upload, req)
+        future.add_done_callback(lambda future: self._upload_done(req, future))
+
+    def _upload_done(self, req, future):
+        save_name = req.save_name
+        if future.exception() is not None:
+            logger.error("Failed to prepare upload", exc_info=future.exception())
+            # the file never reaches StepUpload, so count it as failed here
+            self._stats.init_file(save_name, 0)
+            self._stats.update_failed_file(save_name)
+        with self._pending_cond:
+            self._pending -= 1
+            self._pending_cond.notify_all()
+            waiting = self._waiting[save_name]
+            if not waiting:
+                del self._waiting[save_name]
+                return
+            req = waiting.popleft()
+        self._submit_upload(req)
+
+    def _wait_for_uploads(self):
+        with self._pending_cond:
+            while self._pending:
+                self._pending_cond.wait()
+
     def _thread_body(self):
-        finished = False
+        self._executor = futures.ThreadPoolExecutor(
+            max_workers=self._max_workers, thread_name_prefix="StepChecksum"
+        )
         while True:
             req = self._request_queue.get()
             if isinstance(req, RequestUpload):
-                path = req.path
-                if req.copy:
-                    path = os.path.join(
-                        self._tempdir.name,
-                        "%s-%s" % (wandb.util.generate_id(), req.save_name),
-                    )
-                    wandb.util.mkdir_exists_ok(os.path.dirname(path))
-                    try:
-                        # certain linux distros throw an exception when copying
-                        # large files: https://bugs.python.org/issue43743
-                        shutil.copy2(req.path, path)
-                    except OSError:
-                        shutil._USE_CP_SENDFILE = False
-                        shutil.copy2(req.path, path)
-                checksum = None
-                if req.use_prepare_flow:
-                    # passing a checksum through indicates that we'd like to use the
-                    # "prepare" file upload flow, in which we prepare the files in
-                    # the database before uploading them. This is currently only
-                    # used for artifact manifests
-                    checksum = wandb.util.md5_file(path)
-                self._stats.init_file(req.save_name, os.path.getsize(path))
-                self._output_queue.put(
-                    step_upload.RequestUpload(
-                        path,
-                        req.save_name,
-                        req.artifact_id,
-                        checksum,
-                        req.copy,
-                        req.save_fn,
-                        req.digest,
-                    )
-                )
-            elif isinstance(req, RequestStoreManifestFiles):
+                with self._pending_cond:
+                    self._pending += 1
+                    # uploads of the same file stay in order, the last one wins
+                    if req.save_name in self._waiting:
+                        self._waiting[req.save_name].append(req)
+                        continue
+                    self._waiting[req.save_name] = collections.deque()
+                self._submit_upload(req)
+                continue
+
+            # artifact commits count on their files being queued for upload
+            self._wait_for_uploads()
+            if isinstance(req, RequestStoreManifestFiles):
                 for entry in req.manifest.entries.values():
                     if entry.local_path:
                         # This stupid thing is needed so the closure works correctly.
@@ -113,6 +208,7 @@ class StepChecksum(object):
             else:
                 raise Exception("internal error")
 
+        self._executor.shutdown()
         self._output_queue.put(step_upload.RequestFinish(req.callback))
 
     def start(self):
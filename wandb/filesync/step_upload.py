@@ -1,10 +1,13 @@
 """Batching file prepare requests to our API."""
 
 import collections
+from concurrent import futures
+import logging
+import os
 import threading
 from six.moves import queue
 
-from wandb.filesync import upload_job
+from wandb.filesync import step_upload_urls, upload_job
 from wandb.errors.term import termerror
 
 
@@ -17,21 +20,56 @@ RequestCommitArtifact = collections.namedtuple(
 )
 RequestFinish = collections.namedtuple("RequestFinish", ("callback"))
 
+logger = logging.getLogger(__name__)
+
 
 class StepUpload(object):
+    """Uploads files on a pool of `max_jobs` worker threads.
+
+    Queued uploads of small files and artifact manifests are started before
+    large files, and at most a quarter of the workers stream large files at
+    once so they don't hold up the rest. One worker is kept for queued large
+    files though, so a steady stream of small ones can't hold them up
+    indefinitely. Upload urls for run files are
+    requested in batches, ahead of time for the next queued small files.
+    """
+
+    LARGE_FILE_BYTES = 16 * 1024 * 1024
+    # queued small files whose upload urls are requested before they start
+    PREFETCH_UPLOAD_URLS = 1000
+
     def __init__(self, api, stats, event_queue, max_jobs, file_stream, silent=False):
         self._api = api
         self._stats = stats
         self._event_queue = event_queue
         self._max_jobs = max_jobs
+        self._max_large_jobs = max(1, max_jobs // 4)
         self._file_stream = file_stream
 
         self._thread = threading.Thread(target=self._thread_body)
         self._thread.daemon = True
+        self._pool = futures.ThreadPoolExecutor(
+            max_workers=max_jobs, thread_name_prefix="UploadJob"
+        )
+        self._upload_urls = step_upload_urls.StepUploadUrls(
+            api,
+            batch_time=0.1,
+            inter_event_time=0.01,
+            max_batch_size=self.PREFETCH_UPLOAD_URLS,
+        )
 
         # Indexed by files' `save_name`'s, which are their ID's in the Run.
         self._running_jobs = {}
-        self._pending_jobs = []
+        self._running_large_jobs = set()
+        # (event, upload url response queue) pairs, the small files' pairs
+        # have their upload urls requested, in order, before the rest
+        self._pending_jobs = collections.deque()
+        self._unprefetched_jobs = collections.deque()
+        self._pending_large_jobs = collections.deque()
+        # Later uploads of files that are already queued or running, by
+        # `save_name`, since operations on a single backend file must be
+        # serialized.
+        self._waiting_jobs = {}
 
         self._artifacts = {}
 
@@ -65,6 +103,16 @@ class StepUpload(object):
                 self._handle_event(event)
             elif not self._running_jobs:
                 # Queue was empty and no jobs left.
+                self._pool.shutdown()
+                self._upload_urls.shutdown()
+                throughput = self._stats.throughput()
+                logger.info(
+                    "Uploaded %i files in %.1fs (%.1f files/sec, %.1f MB/sec)",
+                    throughput["completed_files"],
+                    throughput["elapsed"],
+                    throughput["files_per_sec"],
+                    throughput["bytes_per_sec"] / 1048576.0,
+                )
                 if finish_callback:
                     finish_callback()
                 break
@@ -72,7 +120,6 @@ class StepUpload(object):
     def _handle_event(self, event):
         if isinstance(event, upload_job.EventJobDone):
             job = event.job
-            job.join()
             if job.artifact_id:
                 if event.success:
                     self._artifacts[job.artifact_id]["pending_count"] -= 1
@@ -82,10 +129,13 @@ class StepUpload(object):
                         "Uploading artifact file failed. Artifact won't be committed."
                     )
             self._running_jobs.pop(job.save_name)
-            # If we have any pending jobs, start one now
-            if self._pending_jobs:
-                event = self._pending_jobs.pop(0)
-                self._start_upload_job(event)
+            self._running_large_jobs.discard(job.save_name)
+            waiting = self._waiting_jobs.get(job.save_name)
+            if waiting:
+                self._queue_upload_job(waiting.popleft())
+            else:
+                self._waiting_jobs.pop(job.save_name, None)
+            self._start_upload_jobs()
         elif isinstance(event, RequestCommitArtifact):
             if event.artifact_id not in self._artifacts:
                 self._init_artifact(event.artifact_id)
@@ -105,29 +155,71 @@ class StepUpload(object):
                 if event.artifact_id not in self._artifacts:
                     self._init_artifact(event.artifact_id)
                 self._artifacts[event.artifact_id]["pending_count"] += 1
-            if len(self._running_jobs) == self._max_jobs:
-                self._pending_jobs.append(event)
+            if event.save_name in self._waiting_jobs:
+                self._waiting_jobs[event.save_name].append(event)
             else:
-                self._start_upload_job(event)
+                self._waiting_jobs[event.save_name] = collections.deque()
+                self._queue_upload_job(event)
+                self._start_upload_jobs()
         else:
             raise Exception("Programming error: unhandled event: %s" % str(event))
 
-    def _start_upload_job(self, event):
-        if not isinstance(event, RequestUpload):
-            raise Exception("Programming error: invalid event")
+    def _is_large(self, event):
+        if event.md5 and not event.save_fn:
+            # artifact manifests, which artifact commits wait on
+            return False
+        try:
+            return os.path.getsize(event.path) >= self.LARGE_FILE_BYTES
+        except OSError:
+            return False
 
-        # Operations on a single backend file must be serialized. if
-        # we're already uploading this file, put the event on the
-        # end of the queue
-        if event.save_name in self._running_jobs:
-            self._pending_jobs.append(event)
-            return
+    def _queue_upload_job(self, event):
+        if self._is_large(event):
+            self._pending_large_jobs.append((event, None))
+        else:
+            self._unprefetched_jobs.append(event)
+
+    def _request_upload_url(self, event):
+        if event.save_fn or event.md5:
+            # artifact files and manifests get their urls elsewhere
+            return None
+        return self._upload_urls.upload_url_async(event.save_name)
+
+    def _prefetch_upload_urls(self):
+        while (
+            self._unprefetched_jobs
+            and len(self._pending_jobs) < self.PREFETCH_UPLOAD_URLS
+        ):
+            event = self._unprefetched_jobs.popleft()
+            self._pending_jobs.append((event, self._request_upload_url(event)))
 
-        # Start it.
+    def _start_upload_jobs(self):
+        self._prefetch_upload_urls()
+        while len(self._running_jobs) < self._max_jobs:
+            reserve_large = (
+                self._pending_large_jobs
+                and not self._running_large_jobs
+                and len(self._running_jobs) == self._max_jobs - 1
+            )
+            if self._pending_jobs and not reserve_large:
+                self._start_upload_job(*self._pending_jobs.popleft(), large=False)
+            elif (
+                self._pending_large_jobs
+                and len(self._running_large_jobs) < self._max_large_jobs
+            ):
+                event, _ = self._pending_large_jobs.popleft()
+                url_response = self._request_upload_url(event)
+                self._start_upload_job(event, url_response, large=True)
+            else:
+                break
+        self._prefetch_upload_urls()
+
+    def _start_upload_job(self, event, url_response, large):
         job = upload_job.UploadJob(
             self._event_queue,
             self._stats,
             self._api,
+            url_response,
             self._file_stream,
             self.silent,
             event.save_name,
@@ -139,7 +231,15 @@ class StepUpload(object):
             event.digest,
         )
         self._running_jobs[event.save_name] = job
-        job.start()
+        if large:
+            self._running_large_jobs.add(event.save_name)
+        self._pool.submit(self._run_job, job)
+
+    def _run_job(self, job):
+        try:
+            job.run()
+        except Exception:
+            logger.exception("Upload job failed: %s", job.save_name)
 
     def _init_artifact(self, artifact_id):
         self._artifacts[artifact_id] = {
@@ -163,6 +263,7 @@ class StepUpload(object):
                 callback()
 
     def start(self):
+        self._upload_urls.start()
         self._thread.start()
 
     def is_alive(self):
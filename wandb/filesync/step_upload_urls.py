@@ -0,0 +1,163 @@
+"""Batching upload url requests for run files to our API."""
+
+import collections
+import logging
+import threading
+import time
+from six.moves import queue
+
+# Request for a signed url to upload a run file to.
+RequestUploadUrl = collections.namedtuple(
+    "RequestUploadUrl", ("save_name", "response_queue")
+)
+
+RequestFinish = collections.namedtuple("RequestFinish", ())
+
+ResponseUploadUrl = collections.namedtuple(
+    "ResponseUploadUrl", ("upload_url", "upload_headers", "error")
+)
+
+logger = logging.getLogger(__name__)
+
+
+class StepUploadUrls(object):
+    """A thread that batches requests for run file upload urls.
+
+    Any number of upload jobs may call upload_url() in parallel. Requests made
+    within `batch_time` of each other are sent to the backend in a single
+    upload_urls() call, with the project looked up once.
+    """
+
+    def __init__(self, api, batch_time, inter_event_time, max_batch_size):
+        self._api = api
+        self._inter_event_time = inter_event_time
+        self._batch_time = batch_time
+        self._max_batch_size = max_batch_size
+        self._project = None
+        self._request_queue = queue.Queue()
+        self._thread = threading.Thread(target=self._thread_body)
+        self._thread.daemon = True
+
+    def _thread_body(self):
+        while True:
+            request = self._request_queue.get()
+            if isinstance(request, RequestFinish):
+                break
+            finish, batch = self._gather_batch(request)
+            try:
+                responses = self._responses(batch)
+            except Exception as e:
+                logger.exception("Failed to get upload urls")
+                responses = [ResponseUploadUrl(None, None, e)] * len(batch)
+            for url_request, response in zip(batch, responses):
+                url_request.response_queue.put(response)
+            if finish:
+                break
+
+    def _gather_batch(self, first_request):
+        batch_start_time = time.time()
+        batch = [first_request]
+        while True:
+            try:
+                request = self._request_queue.get(
+                    block=True, timeout=self._inter_event_time
+                )
+                if isinstance(request, RequestFinish):
+                    return True, batch
+                batch.append(request)
+                remaining_time = self._batch_time - (time.time() - batch_start_time)
+                if remaining_time < 0 or len(batch) >= self._max_batch_size:
+                    break
+            except queue.Empty:
+                break
+        return False, batch
+
+    def _responses(self, batch):
+        """Returns a ResponseUploadUrl for each request in `batch`."""
+        upload_headers, result = self._upload_urls(batch)
+        responses = []
+        for url_request in batch:
+            file_info = result.get(url_request.save_name)
+            if file_info is None:
+                error = KeyError(url_request.save_name)
+                responses.append(ResponseUploadUrl(None, None, error))
+            else:
+                responses.append(
+                    ResponseUploadUrl(file_info["url"], upload_headers, None)
+                )
+        return responses
+
+    def _upload_urls(self, batch):
+        """Execute the upload_urls API call.
+
+        Arguments:
+            batch: List of RequestUploadUrl objects
+        Returns:
+            (upload_headers, file_info) where file_info is a dict of
+                (save_name: file) pairs with a url key for each requested file.
+        """
+        if self._project is None:
+            self._project = self._api.get_project()
+        save_names = list(collections.OrderedDict.fromkeys(r.save_name for r in batch))
+        _, upload_headers, result = self._api.upload_urls(self._project, save_names)
+        return upload_headers, result
+
+    def upload_url_async(self, save_name):
+        """Request a url to upload the run file `save_name` to.
+
+        Returns:
+            A PendingUploadUrl whose get() returns the ResponseUploadUrl.
+        """
+        response_queue = queue.Queue()
+        self._request_queue.put(RequestUploadUrl(save_name, response_queue))
+        return PendingUploadUrl(self, response_queue)
+
+    def upload_url(self, save_name):
+        """Returns the url and headers to upload the run file `save_name` with."""
+        response = self.upload_url_async(save_name).get()
+        if response.error is not None:
+            raise response.error
+        return response.upload_url, response.upload_headers
+
+    def start(self):
+        self._thread.start()
+
+    def finish(self):
+        self._request_queue.put(RequestFinish())
+
+    def is_alive(self):
+        return self._thread.is_alive()
+
+    def shutdown(self):
+        self.finish()
+        self._thread.join()
+
+
+class PendingUploadUrl(object):
+    """The response to a request made with StepUploadUrls.upload_url_async."""
+
+    # seconds between checks that the StepUploadUrls thread is still running
+    POLL_INTERVAL = 1.0
+
+    def __init__(self, step_upload_urls, response_queue):
+        self._step_upload_urls = step_upload_urls
+        self._response_queue = response_queue
+
+    def get(self):
+        """Waits for the response.
+
+        Returns an error response, rather than blocking forever, if the thread
+        stopped without answering the request.
+        """
+        while True:
+            try:
+                return self._response_queue.get(timeout=self.POLL_INTERVAL)
+            except queue.Empty:
+                pass
+            if not self._step_upload_urls.is_alive():
+                # the thread may have answered just before it stopped
+                try:
+                    return self._response_queue.get_nowait()
+                except queue.Empty:
+                    error = RuntimeError("upload url thread is not running")
+                    return ResponseUploadUrl(None, None, error)
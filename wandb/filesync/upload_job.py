@@ -1,7 +1,6 @@
 import collections
 import os
 import logging
-import threading
 
 import wandb
 
@@ -9,12 +8,13 @@ EventJobDone = collections.namedtuple("EventJobDone", ("job", "success"))
 logger = logging.getLogger(__name__)
 
 
-class UploadJob(threading.Thread):
+class UploadJob(object):
     def __init__(
         self,
         done_queue,
         stats,
         api,
+        upload_url_response,
         file_stream,
         silent,
         save_name,
@@ -25,11 +25,13 @@ class UploadJob(threading.Thread):
         save_fn,
         digest,
     ):
-        """A file upload thread.
+        """A file upload, run by one of StepUpload's workers.
 
         Arguments:
             done_queue: queue.Queue in which to put an EventJobDone event when
                 the upload finishes.
+            upload_url_response: PendingUploadUrl for the upload url requested
+                from StepUploadUrls for this file, or None to request it directly.
             push_function: function(save_name, actual_path) which actually uploads
                 the file.
             save_name: string logical location of the file relative to the run
@@ -39,6 +41,7 @@ class UploadJob(threading.Thread):
         self._done_queue = done_queue
         self._stats = stats
         self._api = api
+        self._upload_url_response = upload_url_response
         self._file_stream = file_stream
         self.silent = silent
         self.save_name = save_name
@@ -48,7 +51,6 @@ class UploadJob(threading.Thread):
         self.copied = copied
         self.save_fn = save_fn
         self.digest = digest
-        super(UploadJob, self).__init__()
 
     def run(self):
         success = False
@@ -57,6 +59,11 @@ class UploadJob(threading.Thread):
         finally:
             if self.copied and os.path.isfile(self.save_path):
                 os.remove(self.save_path)
+            if success:
+                # artifact files are tracked by their local path
+                self._stats.set_file_completed(
+                    self.save_path if self.save_fn else self.save_name
+                )
             self._done_queue.put(EventJobDone(self, success))
             if success:
                 self._file_stream.push_success(self.artifact_id, self.save_name)
@@ -108,10 +115,18 @@ class UploadJob(threading.Thread):
             # The classic file upload flow. We get a signed url and upload the file
             # then the backend handles the cloud storage metadata callback to create the
             # file entry. This flow has aged like a fine wine.
-            project = self._api.get_project()
-            _, upload_headers, result = self._api.upload_urls(project, [self.save_name])
-            file_info = result[self.save_name]
-            upload_url = file_info["url"]
+            if self._upload_url_response is not None:
+                response = self._upload_url_response.get()
+                if response.error is not None:
+                    raise response.error
+                upload_url = response.upload_url
+                upload_headers = response.upload_headers
+            else:
+                project = self._api.get_project()
+                _, upload_headers, result = self._api.upload_urls(
+                    project, [self.save_name]
+                )
+                upload_url = result[self.save_name]["url"]
 
         if upload_url is None:
             logger.info("Skipped uploading %s", self.save_path)
@@ -0,0 +1,9 @@
+"""
+module old
+"""
+
+
+def __getattr__(name):
+    from wandb.sdk.lib.lazyloader import import_submodule
+
+    return import_submodule(__name__, name)
@@ -767,7 +767,9 @@ class SummaryRecord(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     UPDATE_FIELD_NUMBER: builtins.int
     REMOVE_FIELD_NUMBER: builtins.int
+    DELTA_FIELD_NUMBER: builtins.int
     _INFO_FIELD_NUMBER: builtins.int
+    delta: builtins.bool = ...
 
     @property
     def update(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___SummaryItem]: ...
@@ -782,10 +784,11 @@ class SummaryRecord(google.protobuf.message.Message):
         *,
         update : typing.Optional[typing.Iterable[global___SummaryItem]] = ...,
         remove : typing.Optional[typing.Iterable[global___SummaryItem]] = ...,
+        delta : builtins.bool = ...,
         _info : typing.Optional[wandb.proto.wandb_base_pb2._RecordInfo] = ...,
         ) -> None: ...
     def HasField(self, field_name: typing_extensions.Literal[u"_info",b"_info"]) -> builtins.bool: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"remove",b"remove",u"update",b"update"]) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"_info",b"_info",u"delta",b"delta",u"remove",b"remove",u"update",b"update"]) -> None: ...
 global___SummaryRecord = SummaryRecord
 
 class SummaryItem(google.protobuf.message.Message):
@@ -1553,17 +1556,53 @@ global___NetworkStatusRequest = NetworkStatusRequest
 class NetworkStatusResponse(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     NETWORK_RESPONSES_FIELD_NUMBER: builtins.int
+    FILE_STREAM_STATUS_FIELD_NUMBER: builtins.int
 
     @property
     def network_responses(self) -> google.protobuf.internal.containers.RepeatedCompositeFieldContainer[global___HttpResponse]: ...
 
+    @property
+    def file_stream_status(self) -> global___FileStreamStatus: ...
+
     def __init__(self,
         *,
         network_responses : typing.Optional[typing.Iterable[global___HttpResponse]] = ...,
+        file_stream_status : typing.Optional[global___FileStreamStatus] = ...,
         ) -> None: ...
-    def ClearField(self, field_name: typing_extensions.Literal[u"network_responses",b"network_responses"]) -> None: ...
+    def HasField(self, field_name: typing_extensions.Literal[u"file_stream_status",b"file_stream_status"]) -> builtins.bool: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"file_stream_status",b"file_stream_status",u"network_responses",b"network_responses"]) -> None: ...
 global___NetworkStatusResponse = NetworkStatusResponse
 
+class FileStreamStatus(google.protobuf.message.Message):
+    DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
+    QUEUE_DEPTH_FIELD_NUMBER: builtins.int
+    PENDING_BYTES_FIELD_NUMBER: builtins.int
+    DROPPED_CHUNKS_FIELD_NUMBER: builtins.int
+    COALESCED_CHUNKS_FIELD_NUMBER: builtins.int
+    POSTS_FIELD_NUMBER: builtins.int
+    FAILED_POSTS_FIELD_NUMBER: builtins.int
+    SENT_BYTES_FIELD_NUMBER: builtins.int
+    queue_depth: builtins.int = ...
+    pending_bytes: builtins.int = ...
+    dropped_chunks: builtins.int = ...
+    coalesced_chunks: builtins.int = ...
+    posts: builtins.int = ...
+    failed_posts: builtins.int = ...
+    sent_bytes: builtins.int = ...
+
+    def __init__(self,
+        *,
+        queue_depth : builtins.int = ...,
+        pending_bytes : builtins.int = ...,
+        dropped_chunks : builtins.int = ...,
+        coalesced_chunks : builtins.int = ...,
+        posts : builtins.int = ...,
+        failed_posts : builtins.int = ...,
+        sent_bytes : builtins.int = ...,
+        ) -> None: ...
+    def ClearField(self, field_name: typing_extensions.Literal[u"coalesced_chunks",b"coalesced_chunks",u"dropped_chunks",b"dropped_chunks",u"failed_posts",b"failed_posts",u"pending_bytes",b"pending_bytes",u"posts",b"posts",u"queue_depth",b"queue_depth",u"sent_bytes",b"sent_bytes"]) -> None: ...
+global___FileStreamStatus = FileStreamStatus
+
 class HttpResponse(google.protobuf.message.Message):
     DESCRIPTOR: google.protobuf.descriptor.Descriptor = ...
     HTTP_STATUS_CODE_FIELD_NUMBER: builtins.int
@@ -4,6 +4,8 @@
 module sdk
 """
 
+import types
+
 from . import wandb_helper as helper  # noqa: F401
 from .wandb_alerts import AlertLevel  # noqa: F401
 from .wandb_artifacts import Artifact  # noqa: F401
@@ -19,3 +21,9 @@ from .wandb_setup import setup, teardown  # noqa: F401
 from .wandb_summary import Summary  # noqa: F401
 from .wandb_sweep import controller, sweep  # noqa: F401
 from .wandb_watch import unwatch, watch  # noqa: F401
+
+
+def __getattr__(name: str) -> types.ModuleType:
+    from wandb.sdk.lib.lazyloader import import_submodule
+
+    return import_submodule(__name__, name)
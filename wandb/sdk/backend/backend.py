@@ -20,7 +20,6 @@ import wandb
 
 from ..interface.interface import InterfaceBase
 from ..interface.interface_queue import InterfaceQueue
-from ..internal.internal import wandb_internal
 from ..wandb_manager import _Manager
 from ..wandb_settings import Settings
 
@@ -182,6 +181,8 @@ class Backend(object):
             self._ensure_launched_manager()
             return
 
+        from ..internal.internal import wandb_internal
+
         self.record_q = self._multiprocessing.Queue()
         self.result_q = self._multiprocessing.Queue()
         user_pid = os.getpid()
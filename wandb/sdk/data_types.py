@@ -1,4 +1,6 @@
 import codecs
+from concurrent.futures import Future, ThreadPoolExecutor
+import functools
 import hashlib
 import io
 import json
@@ -10,8 +12,10 @@ import platform
 import re
 import shutil
 import sys
+import threading
 from typing import (
     Any,
+    Callable,
     cast,
     ClassVar,
     Dict,
@@ -29,7 +33,7 @@ from pkg_resources import parse_version
 import six
 from six.moves.collections_abc import Sequence as SixSequence
 import wandb
-from wandb import util
+from wandb import env, util
 from wandb._globals import _datatypes_callback
 from wandb.compat import tempfile
 from wandb.util import has_num
@@ -46,6 +50,7 @@ if TYPE_CHECKING:  # pragma: no cover
     import matplotlib  # type: ignore
     import plotly  # type: ignore
     import PIL  # type: ignore
+    import PIL.Image  # type: ignore
     import rdkit.Chem  # type: ignore
     import torch  # type: ignore
     from typing import TextIO
@@ -72,6 +77,41 @@ _MEDIA_TMP = tempfile.TemporaryDirectory("wandb-media")
 _DATA_FRAMES_SUBDIR = os.path.join("media", "data_frames")
 SYS_PLATFORM = platform.system()
 
+_MEDIA_ENCODE_POOL: Optional[ThreadPoolExecutor] = None
+_MEDIA_ENCODE_POOL_WORKERS = 0
+_MEDIA_ENCODE_POOL_LOCK = threading.Lock()
+
+
+def _media_encode_pool() -> Optional[ThreadPoolExecutor]:
+    """Returns the shared pool media files are encoded on, or None when media
+    should be encoded synchronously (the default).
+
+    The pool is opt-in with WANDB_MEDIA_ENCODE_THREADS, which is read on every
+    call so a later run can resize or turn off the pool.  Threads are enough
+    here: PIL's encoders, zlib and hashlib all release the GIL while they
+    work, so encodes overlap with each other and with the training loop.
+    """
+    global _MEDIA_ENCODE_POOL, _MEDIA_ENCODE_POOL_WORKERS
+    workers = env.get_media_encode_threads()
+    with _MEDIA_ENCODE_POOL_LOCK:
+        if workers != _MEDIA_ENCODE_POOL_WORKERS:
+            if _MEDIA_ENCODE_POOL is not None:
+                # encodes already submitted still finish and resolve
+                _MEDIA_ENCODE_POOL.shutdown(wait=False)
+                _MEDIA_ENCODE_POOL = None
+            if workers:
+                _MEDIA_ENCODE_POOL = ThreadPoolExecutor(
+                    max_workers=workers, thread_name_prefix="MediaEncode"
+                )
+            _MEDIA_ENCODE_POOL_WORKERS = workers
+        return _MEDIA_ENCODE_POOL
+
+
+def _hash_file(path: str) -> Tuple[str, int]:
+    with open(path, "rb") as f:
+        sha256 = hashlib.sha256(f.read()).hexdigest()
+    return sha256, os.path.getsize(path)
+
 
 def _get_max_cli_version() -> Union[str, None]:
     _, server_info = wandb.api.viewer_server_info()
@@ -434,10 +474,12 @@ class Media(WBValue):
     _extension: Optional[str]
     _sha256: Optional[str]
     _size: Optional[int]
+    _pending_file: Optional[Tuple[Future, str, bool, Optional[str]]]
 
     def __init__(self, caption: Optional[str] = None) -> None:
         super(Media, self).__init__()
         self._path = None
+        self._pending_file = None
         # The run under which this object is bound, if any.
         self._run = None
         self._caption = caption
@@ -455,9 +497,44 @@ class Media(WBValue):
                 )
             )
 
-        with open(self._path, "rb") as f:
-            self._sha256 = hashlib.sha256(f.read()).hexdigest()
-        self._size = os.path.getsize(self._path)
+        self._sha256, self._size = _hash_file(self._path)
+
+    def _set_file_async(
+        self,
+        path: str,
+        write: Callable[[str], None],
+        is_tmp: bool = False,
+        extension: Optional[str] = None,
+    ) -> None:
+        """Calls `write(path)` to produce the file, then sets it like `_set_file`.
+
+        When a media encoding pool is configured the write and hash happen on
+        the pool and this returns immediately; the file is resolved the first
+        time something needs it (see `_resolve_file`).
+        """
+        pool = _media_encode_pool()
+        if pool is None:
+            write(path)
+            self._set_file(path, is_tmp, extension)
+            return
+
+        def encode() -> Tuple[str, int]:
+            write(path)
+            return _hash_file(path)
+
+        self._pending_file = (pool.submit(encode), path, is_tmp, extension)
+
+    def _resolve_file(self) -> None:
+        """Waits for a file started with `_set_file_async`, raising any error
+        the encoder hit."""
+        if self._pending_file is None:
+            return
+        future, path, is_tmp, extension = self._pending_file
+        self._pending_file = None
+        self._sha256, self._size = future.result()
+        self._path = path
+        self._is_tmp = is_tmp
+        self._extension = extension
 
     @classmethod
     def get_media_subdir(cls: Type["Media"]) -> str:
@@ -476,6 +553,7 @@ class Media(WBValue):
         return self._run is not None
 
     def file_is_set(self) -> bool:
+        self._resolve_file()
         return self._path is not None and self._sha256 is not None
 
     def bind_to_run(
@@ -647,6 +725,9 @@ class Media(WBValue):
 
     def __eq__(self, other: object) -> bool:
         """Likely will need to override for any more complicated media objects"""
+        if isinstance(other, self.__class__):
+            self._resolve_file()
+            other._resolve_file()
         return (
             isinstance(other, self.__class__)
             and hasattr(self, "_sha256")
@@ -1245,12 +1326,18 @@ class Video(BatchableMedia):
         tensor = self._prepare_video(self.data)
         _, self._height, self._width, self._channels = tensor.shape
 
-        # encode sequence of images into gif string
-        clip = mpy.ImageSequenceClip(list(tensor), fps=self._fps)
-
         filename = os.path.join(
             _MEDIA_TMP.name, util.generate_id() + "." + self._format
         )
+        self._set_file_async(
+            filename,
+            functools.partial(self._write_clip, mpy, list(tensor)),
+            is_tmp=True,
+        )
+
+    def _write_clip(self, mpy: Any, frames: List["np.ndarray"], filename: str) -> None:
+        # encode sequence of images into gif string
+        clip = mpy.ImageSequenceClip(frames, fps=self._fps)
         if TYPE_CHECKING:
             kwargs: Dict[str, Optional[bool]] = {}
         try:  # older versions of moviepy do not support logger argument
@@ -1274,7 +1361,6 @@ class Video(BatchableMedia):
                     clip.write_gif(filename, **kwargs)
                 else:
                     clip.write_videofile(filename, **kwargs)
-        self._set_file(filename, is_tmp=True)
 
     @classmethod
     def get_media_subdir(cls: Type["Video"]) -> str:
@@ -2001,6 +2087,9 @@ class Image(BatchableMedia):
         mode: (string) The PIL mode for an image. Most common are "L", "RGB",
             "RGBA". Full explanation at https://pillow.readthedocs.io/en/4.2.x/handbook/concepts.html#concept-modes.
         caption: (string) Label for display of image.
+        file_type: (string) The format to encode array, tensor and PIL image data
+            in: "png" (the default), "jpg" or lossless "webp".  The PNG compression
+            level can be set with WANDB_IMAGE_PNG_COMPRESS_LEVEL (0-9).
 
     Examples:
         ### Create a wandb.Image from a numpy array
@@ -2040,6 +2129,7 @@ class Image(BatchableMedia):
 
     # PIL limit
     MAX_DIMENSION = 65500
+    FILE_TYPES = ("png", "jpg", "jpeg", "webp")
 
     _log_type = "image-file"
 
@@ -2062,6 +2152,7 @@ class Image(BatchableMedia):
         classes: Optional[Union["Classes", Sequence[dict]]] = None,
         boxes: Optional[Union[Dict[str, "BoundingBoxes2D"], Dict[str, dict]]] = None,
         masks: Optional[Union[Dict[str, "ImageMask"], Dict[str, dict]]] = None,
+        file_type: Optional[str] = None,
     ) -> None:
         super(Image, self).__init__()
         # TODO: We should remove grouping, it's a terrible name and I don't
@@ -2076,6 +2167,13 @@ class Image(BatchableMedia):
         self._boxes = None
         self._masks = None
 
+        if file_type is not None and file_type not in Image.FILE_TYPES:
+            raise ValueError(
+                "wandb.Image file_type must be one of {}".format(
+                    ", ".join(Image.FILE_TYPES)
+                )
+            )
+
         # Allows the user to pass an Image object as the first parameter and have a perfect copy,
         # only overriding additional metdata passed in. If this pattern is compelling, we can generalize.
         if isinstance(data_or_path, Image):
@@ -2083,7 +2181,7 @@ class Image(BatchableMedia):
         elif isinstance(data_or_path, six.string_types):
             self._initialize_from_path(data_or_path)
         else:
-            self._initialize_from_data(data_or_path, mode)
+            self._initialize_from_data(data_or_path, mode, file_type)
 
         self._set_initialization_meta(grouping, caption, classes, boxes, masks)
 
@@ -2151,6 +2249,7 @@ class Image(BatchableMedia):
         self._free_ram()
 
     def _initialize_from_wbimage(self, wbimage: "Image") -> None:
+        wbimage._resolve_file()
         self._grouping = wbimage._grouping
         self._caption = wbimage._caption
         self._width = wbimage._width
@@ -2181,7 +2280,12 @@ class Image(BatchableMedia):
         ext = os.path.splitext(path)[1][1:]
         self.format = ext
 
-    def _initialize_from_data(self, data: "ImageDataType", mode: str = None,) -> None:
+    def _initialize_from_data(
+        self,
+        data: "ImageDataType",
+        mode: Optional[str] = None,
+        file_type: Optional[str] = None,
+    ) -> None:
         pil_image = util.get_module(
             "PIL.Image",
             required='wandb.Image needs the PIL package. To get it, run "pip install pillow".',
@@ -2211,10 +2315,17 @@ class Image(BatchableMedia):
                 self.to_uint8(data), mode=mode or self.guess_mode(data)
             )
 
-        tmp_path = os.path.join(_MEDIA_TMP.name, str(util.generate_id()) + ".png")
-        self.format = "png"
-        self._image.save(tmp_path, transparency=None)
-        self._set_file(tmp_path, is_tmp=True)
+        self.format = file_type or "png"
+        tmp_path = os.path.join(
+            _MEDIA_TMP.name, str(util.generate_id()) + "." + self.format
+        )
+        image = self._image
+        if image is data and _media_encode_pool() is not None:
+            # the caller may keep drawing on its own PIL image after this returns
+            image = image.copy()
+        self._set_file_async(
+            tmp_path, functools.partial(_save_image, image, self.format), is_tmp=True
+        )
 
     @classmethod
     def from_json(
@@ -2388,12 +2499,12 @@ class Image(BatchableMedia):
                 )
 
         num_images_to_log = len(seq)
-        width, height = seq[0].image.size  # type: ignore
+        width, height = seq[0]._width, seq[0]._height
         format = jsons[0]["format"]
 
         def size_equals_image(image: "Image") -> bool:
-            img_width, img_height = image.image.size  # type: ignore
-            return img_width == width and img_height == height  # type: ignore
+            # sizes are recorded at init, so this doesn't reload images from disk
+            return image._width == width and image._height == height
 
         sizes_match = all(size_equals_image(img) for img in seq)
         if not sizes_match:
@@ -2511,12 +2622,15 @@ class Image(BatchableMedia):
         return res
 
     def _free_ram(self) -> None:
-        if self._path is not None:
+        # Once the image has a file, or an encode that will write one, the
+        # pixels can be reloaded from disk on demand.
+        if self._path is not None or self._pending_file is not None:
             self._image = None
 
     @property
-    def image(self) -> Optional["PIL.Image"]:
+    def image(self) -> Optional["PIL.Image.Image"]:
         if self._image is None:
+            self._resolve_file()
             if self._path is not None:
                 pil_image = util.get_module(
                     "PIL.Image",
@@ -2527,6 +2641,23 @@ class Image(BatchableMedia):
         return self._image
 
 
+def _save_image(image: "PIL.Image.Image", file_type: str, path: str) -> None:
+    if file_type == "png":
+        kwargs: Dict[str, Any] = {"transparency": None}
+        compress_level = env.get_image_png_compress_level()
+        if compress_level is not None:
+            kwargs["compress_level"] = compress_level
+    elif file_type == "webp":
+        if image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if "A" in image.mode else "RGB")
+        kwargs = {"lossless": True}
+    else:
+        if image.mode not in ("RGB", "L"):
+            image = image.convert("RGB")
+        kwargs = {"quality": 95}
+    image.save(path, **kwargs)
+
+
 class Plotly(Media):
     """
     Wandb class for plotly plots.
@@ -19,10 +19,11 @@ from typing import (
 import wandb
 from wandb import env
 from wandb import util
-from wandb.data_types import WBValue
+from wandb.filesync import digest_cache
 
 
 if TYPE_CHECKING:
+    from wandb.data_types import WBValue
     import wandb.filesync.step_prepare.StepPrepare as StepPrepare  # type: ignore
 
 
@@ -37,15 +38,11 @@ def b64_string_to_hex(string):
 
 
 def md5_hash_file(path):
-    hash_md5 = hashlib.md5()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(64 * 1024), b""):
-            hash_md5.update(chunk)
-    return hash_md5
+    return util.md5_hash_file(path)
 
 
 def md5_file_b64(path: str) -> str:
-    return base64.b64encode(md5_hash_file(path).digest()).decode("ascii")
+    return digest_cache.md5_file(path)
 
 
 def md5_file_hex(path: str) -> str:
@@ -486,7 +483,7 @@ class Artifact(object):
         """
         raise NotImplementedError
 
-    def add(self, obj: WBValue, name: str):
+    def add(self, obj: "WBValue", name: str):
         """Adds wandb.WBValue `obj` to the artifact.
 
         ```
@@ -553,7 +550,7 @@ class Artifact(object):
         """
         raise NotImplementedError
 
-    def get(self, name: str) -> WBValue:
+    def get(self, name: str) -> "WBValue":
         """
         Gets the WBValue object located at the artifact relative `name`.
 
@@ -666,7 +663,7 @@ class Artifact(object):
         """
         raise NotImplementedError
 
-    def __getitem__(self, name: str) -> Optional[WBValue]:
+    def __getitem__(self, name: str) -> Optional["WBValue"]:
         """
         Gets the WBValue object located at the artifact relative `name`.
 
@@ -697,7 +694,7 @@ class Artifact(object):
         """
         raise NotImplementedError
 
-    def __setitem__(self, name: str, item: WBValue):
+    def __setitem__(self, name: str, item: "WBValue"):
         """
         Adds `item` to the artifact at path `name`
 
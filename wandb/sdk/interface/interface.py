@@ -17,7 +17,6 @@ from typing import Any, Iterable, Optional, Tuple, Union
 from typing import TYPE_CHECKING
 
 import six
-from wandb import data_types
 from wandb.proto import wandb_internal_pb2 as pb
 from wandb.proto import wandb_telemetry_pb2 as tpb
 from wandb.util import (
@@ -258,6 +257,8 @@ class InterfaceBase(object):
                 )
             return json_value
         else:
+            from wandb import data_types
+
             friendly_value, converted = json_friendly(  # type: ignore
                 data_types.val_to_json(
                     self._run, path_from_root, value, namespace="summary"
@@ -492,6 +493,8 @@ class InterfaceBase(object):
     def publish_history(
         self, data: dict, step: int = None, run: "Run" = None, publish_step: bool = True
     ) -> None:
+        from wandb import data_types
+
         run = run or self._run
         data = data_types.history_dict_to_json(run, data, step=step)
         history = pb.HistoryRecord()
@@ -0,0 +1,11 @@
+"""
+module internal
+"""
+
+import types
+
+
+def __getattr__(name: str) -> types.ModuleType:
+    from wandb.sdk.lib.lazyloader import import_submodule
+
+    return import_submodule(__name__, name)
@@ -15,6 +15,16 @@ header :=
   ident: char[4]
   magic: uint16
   version: uint8
+
+Writes are buffered and handed to the file a block at a time, the remainder
+is written on flush() and close().  A crash loses what wasn't flushed yet, so
+writers flush the records they can't afford to lose.  Optionally a side index is written next to
+the log with one entry per record:
+
+index_entry :=
+  offset: uint64       // file offset of the first chunk of the record
+  length: uint32       // bytes used in the log, including chunk headers
+  type: uint16         // field number of the record_type oneof, 0 if unknown
 """
 from __future__ import print_function
 
@@ -24,6 +34,7 @@ import struct
 import zlib
 
 import wandb
+from wandb.proto import wandb_internal_pb2  # type: ignore
 
 logger = logging.getLogger(__name__)
 
@@ -42,6 +53,17 @@ LEVELDBLOG_HEADER_MAGIC = (
 )
 LEVELDBLOG_HEADER_VERSION = 0
 
+RECORD_HEADER = struct.Struct("<IHB")
+
+INDEX_SUFFIX = ".idx"
+INDEX_ENTRY = struct.Struct("<QIH")
+
+_RECORD_TYPE_NUMBERS = {
+    f.name: f.number
+    for f in wandb_internal_pb2.Record.DESCRIPTOR.oneofs_by_name["record_type"].fields
+}
+_RECORD_TYPE_NAMES = {v: k for k, v in _RECORD_TYPE_NUMBERS.items()}
+
 try:
     bytes("", "ascii")
 
@@ -64,6 +86,16 @@ class DataStore(object):
         self._index = 0
         self._size_bytes = 0
 
+        # write side: pending bytes of the log and of the side index
+        self._buf = bytearray()
+        self._index_fp = None
+        self._index_buf = bytearray()
+
+        # read side: current block, its file offset and a view over it
+        self._block = b""
+        self._block_offset = 0
+        self._block_view = memoryview(self._block)
+
         self._crc = [0] * (LEVELDBLOG_LAST + 1)
         for x in range(1, LEVELDBLOG_LAST + 1):
             self._crc[x] = zlib.crc32(strtobytes(chr(x))) & 0xFFFFFFFF
@@ -72,11 +104,13 @@ class DataStore(object):
             wandb._assert_is_internal_process
         ), "DataStore can only be used in the internal process"
 
-    def open_for_write(self, fname):
+    def open_for_write(self, fname, index=False):
         self._fname = fname
         logger.info("open: %s", fname)
         open_flags = "xb"
         self._fp = open(fname, open_flags)
+        if index:
+            self._index_fp = open(fname + INDEX_SUFFIX, "wb")
         self._write_header()
 
     def open_for_append(self, fname):
@@ -91,10 +125,63 @@ class DataStore(object):
         logger.info("open for scan: %s", fname)
         self._fp = open(fname, "rb")
         self._index = 0
+        self._block = b""
+        self._block_offset = 0
+        self._block_view = memoryview(self._block)
         self._size_bytes = os.stat(fname).st_size
         self._opened_for_scan = True
         self._read_header()
 
+    def _read(self, length):
+        """Read up to `length` bytes at the scan position as a memoryview.
+
+        The file is read a block at a time.  Records never span blocks, so a
+        read only needs more data when the current block was short (the end
+        of a file that may still be growing).
+        """
+        pos = self._index - self._block_offset
+        if pos >= LEVELDBLOG_BLOCK_LEN:
+            # move to the block that holds the scan position
+            self._block_offset = self._index - self._index % LEVELDBLOG_BLOCK_LEN
+            self._fp.seek(self._block_offset)
+            self._block = self._fp.read(LEVELDBLOG_BLOCK_LEN)
+            self._block_view = memoryview(self._block)
+            pos = self._index - self._block_offset
+        elif pos + length > len(self._block) and (
+            len(self._block) < LEVELDBLOG_BLOCK_LEN
+        ):
+            self._block += self._fp.read(LEVELDBLOG_BLOCK_LEN - len(self._block))
+            self._block_view = memoryview(self._block)
+        return self._block_view[pos : pos + length]
+
+    def seek(self, offset):
+        """Position the scanner at a record offset, e.g. one from scan_index()."""
+        assert self._opened_for_scan, "file not open for scanning"
+        self._index = offset
+        # force the block holding offset to be read on the next scan
+        self._block_offset = offset - LEVELDBLOG_BLOCK_LEN
+
+    def scan_index(self):
+        """Return [(offset, length, record_type)] from the side index.
+
+        Returns None when the log was written without an index.  Entries
+        pointing past the end of the log (e.g. from a crashed writer) are
+        dropped.
+        """
+        try:
+            with open(self._fname + INDEX_SUFFIX, "rb") as f:
+                data = f.read()
+        except (IOError, OSError):
+            return None
+        size = os.stat(self._fname).st_size
+        entries = []
+        usable = len(data) - len(data) % INDEX_ENTRY.size
+        for offset, length, type_number in INDEX_ENTRY.iter_unpack(data[:usable]):
+            if offset + length > size:
+                break
+            entries.append((offset, length, _RECORD_TYPE_NAMES.get(type_number)))
+        return entries
+
     def in_last_block(self):
         """When reading, we want to know if we're in the last block to
            handle in progress writes"""
@@ -104,19 +191,26 @@ class DataStore(object):
         assert self._opened_for_scan, "file not open for scanning"
         # TODO(jhr): handle some assertions as file corruption issues
         # assume we have enough room to read header, checked by caller?
-        header = self._fp.read(LEVELDBLOG_HEADER_LEN)
-        if len(header) == 0:
-            return None
-        assert (
-            len(header) == LEVELDBLOG_HEADER_LEN
-        ), "record header is {} bytes instead of the expected {}".format(
-            len(header), LEVELDBLOG_HEADER_LEN
-        )
-        fields = struct.unpack("<IHB", header)
-        checksum, dlength, dtype = fields
+        pos = self._index - self._block_offset
+        if pos + LEVELDBLOG_HEADER_LEN > len(self._block):
+            # header is not in the part of the block read so far
+            header = self._read(LEVELDBLOG_HEADER_LEN)
+            if len(header) == 0:
+                return None
+            assert (
+                len(header) == LEVELDBLOG_HEADER_LEN
+            ), "record header is {} bytes instead of the expected {}".format(
+                len(header), LEVELDBLOG_HEADER_LEN
+            )
+            pos = self._index - self._block_offset
+        checksum, dlength, dtype = RECORD_HEADER.unpack_from(self._block, pos)
         # check len, better fit in the block
         self._index += LEVELDBLOG_HEADER_LEN
-        data = self._fp.read(dlength)
+        start = pos + LEVELDBLOG_HEADER_LEN
+        if start + dlength <= len(self._block):
+            data = self._block_view[start : start + dlength]
+        else:
+            data = self._read(dlength)
         checksum_computed = zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
         assert (
             checksum == checksum_computed
@@ -125,13 +219,28 @@ class DataStore(object):
         return dtype, data
 
     def scan_data(self):
+        # fast path: a FULL record already in the current block
+        block = self._block
+        pos = self._index - self._block_offset
+        if pos + LEVELDBLOG_HEADER_LEN <= len(block):
+            checksum, dlength, dtype = RECORD_HEADER.unpack_from(block, pos)
+            start = pos + LEVELDBLOG_HEADER_LEN
+            end = start + dlength
+            if dtype == LEVELDBLOG_FULL and end <= len(block):
+                data = block[start:end]
+                assert (
+                    checksum == zlib.crc32(data, self._crc[dtype]) & 0xFFFFFFFF
+                ), "record checksum is invalid, data may be corrupt"
+                self._index += LEVELDBLOG_HEADER_LEN + dlength
+                return data
+
         # TODO(jhr): handle some assertions as file corruption issues
         # how much left in the block.  if less than header len, read as pad,
         offset = self._index % LEVELDBLOG_BLOCK_LEN
         space_left = LEVELDBLOG_BLOCK_LEN - offset
         if space_left < LEVELDBLOG_HEADER_LEN:
             pad_check = strtobytes("\x00" * space_left)
-            pad = self._fp.read(space_left)
+            pad = self._read(space_left)
             # verify they are zero
             assert pad == pad_check, "invald padding"
             self._index += space_left
@@ -141,13 +250,14 @@ class DataStore(object):
             return None
         dtype, data = record
         if dtype == LEVELDBLOG_FULL:
-            return data
+            return data.tobytes()
 
         assert (
             dtype == LEVELDBLOG_FIRST
         ), "expected record to be type {} but found {}".format(LEVELDBLOG_FIRST, dtype)
+        # copy out of the block before later chunks replace it
+        data = bytearray(data)
         while True:
-            offset = self._index % LEVELDBLOG_BLOCK_LEN
             record = self.scan_record()
             if record is None:  # eof
                 return None
@@ -161,7 +271,7 @@ class DataStore(object):
                 LEVELDBLOG_MIDDLE, dtype
             )
             data += new_data
-        return data
+        return bytes(data)
 
     def _write_header(self):
         data = struct.pack(
@@ -175,11 +285,11 @@ class DataStore(object):
         ), "header size is {} bytes, expected {}".format(
             len(data), LEVELDBLOG_HEADER_LEN
         )
-        self._fp.write(data)
+        self._buf += data
         self._index += len(data)
 
     def _read_header(self):
-        header = self._fp.read(LEVELDBLOG_HEADER_LEN)
+        header = self._read(LEVELDBLOG_HEADER_LEN)
         assert (
             len(header) == LEVELDBLOG_HEADER_LEN
         ), "header is {} bytes instead of the expected {}".format(
@@ -208,9 +318,9 @@ class DataStore(object):
         checksum = zlib.crc32(s, self._crc[dtype]) & 0xFFFFFFFF
         # logger.info("write_record: index=%d len=%d dtype=%d",
         #     self._index, dlength, dtype)
-        self._fp.write(struct.pack("<IHB", checksum, dlength, dtype))
+        self._buf += RECORD_HEADER.pack(checksum, dlength, dtype)
         if dlength:
-            self._fp.write(s)
+            self._buf += s
         self._index += LEVELDBLOG_HEADER_LEN + len(s)
 
     def _write_data(self, s):
@@ -226,7 +336,7 @@ class DataStore(object):
         #     self._index, offset, data_left)
         if space_left < LEVELDBLOG_HEADER_LEN:
             pad = "\x00" * space_left
-            self._fp.write(strtobytes(pad))
+            self._buf += strtobytes(pad)
             self._index += space_left
             offset = 0
             space_left = LEVELDBLOG_BLOCK_LEN
@@ -254,11 +364,42 @@ class DataStore(object):
 
             # write last and flush the entire block to disk
             self._write_record(s[data_used:], LEVELDBLOG_LAST)
-            self._fp.flush()
-            os.fsync(self._fp.fileno())
+            self.flush(fsync=True)
 
+        self._write_blocks()
         return file_offset, self._index - file_offset, flush_index, flush_offset
 
+    def _write_blocks(self):
+        """Hand every completed block in the write buffer to the file."""
+        if len(self._buf) < LEVELDBLOG_BLOCK_LEN:
+            return
+        # the buffer ends at self._index, keep the trailing partial block
+        keep = self._index % LEVELDBLOG_BLOCK_LEN
+        count = len(self._buf) - keep
+        self._fp.write(self._buf[:count])
+        self._fp.flush()
+        del self._buf[:count]
+        self._write_index()
+
+    def _write_index(self):
+        if self._index_fp and self._index_buf:
+            self._index_fp.write(self._index_buf)
+            del self._index_buf[:]
+
+    def flush(self, fsync=False):
+        """Write out all buffered data, and with `fsync` make sure it's on disk."""
+        if self._fp is None or self._opened_for_scan:
+            return
+        if self._buf:
+            self._fp.write(self._buf)
+            del self._buf[:]
+        self._fp.flush()
+        if fsync:
+            os.fsync(self._fp.fileno())
+        self._write_index()
+        if self._index_fp:
+            self._index_fp.flush()
+
     def write(self, obj):
         """Write a protocol buffer.
 
@@ -274,9 +415,18 @@ class DataStore(object):
         s = obj.SerializeToString()
         assert len(s) == raw_size, "invalid serialization"
         ret = self._write_data(s)
+        if self._index_fp:
+            file_offset, length, _, _ = ret
+            record_type = obj.WhichOneof("record_type")
+            self._index_buf += INDEX_ENTRY.pack(
+                file_offset, length, _RECORD_TYPE_NUMBERS.get(record_type, 0)
+            )
         return ret
 
     def close(self):
         if self._fp is not None:
             logger.info("close: %s", self._fname)
+            self.flush()
             self._fp.close()
+        if self._index_fp is not None:
+            self._index_fp.close()
@@ -1,7 +1,10 @@
 import base64
 import binascii
 import collections
+from concurrent import futures
+import gzip
 import itertools
+import json
 import logging
 import os
 import sys
@@ -9,6 +12,7 @@ import random
 import requests
 import threading
 import time
+import zlib
 from typing import TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple
 
 import wandb
@@ -24,11 +28,23 @@ logger = logging.getLogger(__name__)
 
 Chunk = collections.namedtuple("Chunk", ("filename", "data"))
 
+
+def _chunk_size(data):
+    """Returns the number of bytes chunk data takes up once utf-8 encoded."""
+    if isinstance(data, bytes):
+        return len(data)
+    return len(data.encode("utf-8"))
+
+
 if TYPE_CHECKING:
     from typing import Any, List, Dict
 
 
 class DefaultFilePolicy(object):
+    # when True only the most recent pending chunk of the file is ever sent,
+    # so older queued chunks can be dropped before processing
+    latest_only = False
+
     def __init__(self, start_chunk_id=0):
         self._chunk_id = start_chunk_id
 
@@ -62,6 +78,8 @@ class JsonlFilePolicy(DefaultFilePolicy):
 
 
 class SummaryFilePolicy(DefaultFilePolicy):
+    latest_only = True
+
     def process_chunks(self, chunks):
         data = chunks[-1].data
         if len(data) > util.MAX_LINE_BYTES:
@@ -247,12 +265,56 @@ class BinaryFilePolicy(DefaultFilePolicy):
         return {"offset": self._offset, "content": enc, "encoding": "base64"}
 
 
+class PostStats(object):
+    """Byte and latency counters for posts made to the streaming endpoint."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.posts = 0
+        self.failed_posts = 0
+        self.payload_bytes = 0
+        self.sent_bytes = 0
+        self.latency_total = 0.0
+        self.latency_max = 0.0
+        self.latency_last = 0.0
+
+    def add(self, payload_bytes, sent_bytes, latency, failed=False):
+        with self._lock:
+            self.posts += 1
+            self.failed_posts += int(failed)
+            self.payload_bytes += payload_bytes
+            self.sent_bytes += sent_bytes
+            self.latency_total += latency
+            self.latency_max = max(self.latency_max, latency)
+            self.latency_last = latency
+
+    def summary(self):
+        with self._lock:
+            return {
+                "posts": self.posts,
+                "failed_posts": self.failed_posts,
+                "payload_bytes": self.payload_bytes,
+                "sent_bytes": self.sent_bytes,
+                "latency_total": self.latency_total,
+                "latency_max": self.latency_max,
+                "latency_last": self.latency_last,
+            }
+
+
 class FileStreamApi(object):
     """Pushes chunks of files to our streaming endpoint.
 
     This class is used as a singleton. It has a thread that serializes access to
     the streaming endpoint and performs rate-limiting and batching.
 
+    Request bodies can optionally be compressed (`compression="gzip"` or
+    `"deflate"`) and up to `max_inflight` file posts may be outstanding at
+    once. Posts that touch the same file are still sent in order.
+
+    Besides the rate limit, pending chunks are flushed as soon as the backlog
+    reaches `MAX_ITEMS_PER_PUSH` items or `BACKLOG_FLUSH_BYTES` bytes, and
+    superseded chunks of `latest_only` files are coalesced while they wait.
+
     TODO: Differentiate between binary/text encoding.
     """
 
@@ -262,10 +324,36 @@ class FileStreamApi(object):
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
     MAX_ITEMS_PER_PUSH = 10000
-
-    def __init__(self, api, run_id, start_time, settings=None):
+    BACKLOG_FLUSH_BYTES = 4 * 1024 * 1024
+    COMPRESSION_TYPES = ("gzip", "deflate")
+
+    def __init__(
+        self,
+        api,
+        run_id,
+        start_time,
+        settings=None,
+        compression=None,
+        max_inflight=None,
+    ):
         if settings is None:
             settings = dict()
+        if compression is None:
+            compression = env.get_file_stream_compression()
+        if compression and compression not in self.COMPRESSION_TYPES:
+            logger.warning("Unsupported file stream compression: %s", compression)
+            compression = None
+        if max_inflight is None:
+            max_inflight = env.get_file_stream_max_inflight()
+        self._compression = compression
+        self._max_inflight = max(1, max_inflight)
+        self._stats = PostStats()
+        # guards state shared with post workers (dropped chunks, dynamic settings)
+        self._lock = threading.Lock()
+        self._pool = None
+        self._inflight = threading.BoundedSemaphore(self._max_inflight)
+        # last pending post for each file, used to keep per-file ordering
+        self._file_tails = {}
         # NOTE: exc_info is set in thread_except_body context and readable by calling threads
         self._exc_info = None
         self._settings = settings
@@ -284,6 +372,9 @@ class FileStreamApi(object):
         )
         self._file_policies = {}
         self._dropped_chunks = 0
+        self._coalesced_chunks = 0
+        # bytes pushed but not yet handed to a post
+        self._pending_bytes = 0
         self._queue = queue.Queue()
         self._thread = threading.Thread(target=self._thread_except_body)
         # It seems we need to make this a daemon thread to get sync.py's atexit handler to run, which
@@ -304,8 +395,43 @@ class FileStreamApi(object):
 
     def start(self):
         self._init_endpoint()
+        if self._max_inflight > 1:
+            self._pool = futures.ThreadPoolExecutor(
+                max_workers=self._max_inflight, thread_name_prefix="FileStreamPost"
+            )
         self._thread.start()
 
+    def stats(self):
+        """Return byte and latency counters for posts made so far."""
+        return self._stats.summary()
+
+    def status(self):
+        """Return backlog and drop counters along with the post stats."""
+        status = self._stats.summary()
+        with self._lock:
+            status.update(
+                queue_depth=self._queue.qsize(),
+                pending_bytes=self._pending_bytes,
+                dropped_chunks=self._dropped_chunks,
+                coalesced_chunks=self._coalesced_chunks,
+            )
+        return status
+
+    def _get_dropped_chunks(self):
+        with self._lock:
+            return self._dropped_chunks
+
+    def _backlogged(self):
+        return (
+            self._queue.qsize() >= self.MAX_ITEMS_PER_PUSH
+            or self._pending_bytes >= self.BACKLOG_FLUSH_BYTES
+        )
+
+    def _release_pending(self, num_bytes, coalesced=0):
+        with self._lock:
+            self._pending_bytes -= num_bytes
+            self._coalesced_chunks += coalesced
+
     def set_default_file_policy(self, filename, file_policy):
         """Set an upload policy for a file unless one has already been set."""
         if filename not in self._file_policies:
@@ -337,15 +463,17 @@ class FileStreamApi(object):
         # read all the stuff that queue'd up since last time.
         #
         # If we have more than MAX_ITEMS_PER_PUSH in the queue then the push thread
-        # will get behind and data will buffer up in the queue.
-        return util.read_many_from_queue(
-            self._queue, self.MAX_ITEMS_PER_PUSH, self.rate_limit_seconds()
-        )
+        # will get behind and data will buffer up in the queue, so don't wait
+        # for the rate limit once a backlog has formed.
+        timeout = 0 if self._backlogged() else self.rate_limit_seconds()
+        return util.read_many_from_queue(self._queue, self.MAX_ITEMS_PER_PUSH, timeout)
 
     def _thread_body(self):
         posted_data_time = time.time()
         posted_anything_time = time.time()
         ready_chunks = []
+        # index into ready_chunks of the pending chunk for latest_only files
+        latest_chunks = {}
         uploaded = set()
         finished = None
         while finished is None:
@@ -354,32 +482,43 @@ class FileStreamApi(object):
                 if isinstance(item, self.Finish):
                     finished = item
                 elif isinstance(item, self.Preempting):
-                    request_with_retry(
-                        self._client.post,
-                        self._endpoint,
-                        json={
+                    self._post(
+                        {
                             "complete": False,
                             "preempting": True,
-                            "dropped": self._dropped_chunks,
+                            "dropped": self._get_dropped_chunks(),
                             "uploaded": list(uploaded),
-                        },
+                        }
                     )
                     uploaded = set()
                 elif isinstance(item, self.PushSuccess):
                     uploaded.add(item.save_name)
                 else:
                     # item is Chunk
-                    ready_chunks.append(item)
+                    policy = self._file_policies.get(item.filename)
+                    index = latest_chunks.get(item.filename)
+                    if index is not None:
+                        self._release_pending(_chunk_size(ready_chunks[index].data), 1)
+                        ready_chunks[index] = item
+                    else:
+                        if policy is not None and policy.latest_only:
+                            latest_chunks[item.filename] = len(ready_chunks)
+                        ready_chunks.append(item)
 
             cur_time = time.time()
 
             if ready_chunks and (
-                finished or cur_time - posted_data_time > self.rate_limit_seconds()
+                finished
+                or self._backlogged()
+                or len(ready_chunks) >= self.MAX_ITEMS_PER_PUSH
+                or cur_time - posted_data_time > self.rate_limit_seconds()
             ):
                 posted_data_time = cur_time
                 posted_anything_time = cur_time
+                self._release_pending(sum(_chunk_size(c.data) for c in ready_chunks))
                 success = self._send(ready_chunks, uploaded=uploaded)
                 ready_chunks = []
+                latest_chunks = {}
                 if success:
                     uploaded = set()
 
@@ -393,30 +532,31 @@ class FileStreamApi(object):
                 # list of uploaded files, don't reset the `uploaded`
                 # list. Retry publishing the list on the next attempt.
                 if not isinstance(
-                    request_with_retry(
-                        self._client.post,
-                        self._endpoint,
-                        json={
+                    self._post(
+                        {
                             "complete": False,
                             "failed": False,
-                            "dropped": self._dropped_chunks,
+                            "dropped": self._get_dropped_chunks(),
                             "uploaded": list(uploaded),
-                        },
+                        }
                     ),
                     Exception,
                 ):
                     uploaded = set()
 
+        # all file chunks have to land before the run is marked complete
+        if self._pool:
+            self._pool.shutdown(wait=True)
+            self._file_tails = {}
+
         # post the final close message. (item is self.Finish instance now)
-        request_with_retry(
-            self._client.post,
-            self._endpoint,
-            json={
+        self._post(
+            {
                 "complete": True,
                 "exitcode": int(finished.exitcode),
-                "dropped": self._dropped_chunks,
+                "dropped": self._get_dropped_chunks(),
                 "uploaded": list(uploaded),
-            },
+            }
         )
 
     def _thread_except_body(self):
@@ -437,7 +577,8 @@ class FileStreamApi(object):
                 "Dropped streaming file chunk (see wandb/debug-internal.log)"
             )
             logging.exception("dropped chunk %s" % response)
-            self._dropped_chunks += 1
+            with self._lock:
+                self._dropped_chunks += 1
         else:
             parsed: dict = None
             try:
@@ -447,7 +588,73 @@ class FileStreamApi(object):
             if isinstance(parsed, dict):
                 limits = parsed.get("limits")
                 if isinstance(limits, dict):
-                    self._api.dynamic_settings.update(limits)
+                    with self._lock:
+                        self._api.dynamic_settings.update(limits)
+
+    def _encode(self, payload):
+        """Returns the request body and headers for a json payload."""
+        body = json.dumps(payload).encode("utf-8")
+        headers = {"Content-Type": "application/json"}
+        if self._compression == "gzip":
+            headers["Content-Encoding"] = "gzip"
+            return len(body), gzip.compress(body), headers
+        if self._compression == "deflate":
+            headers["Content-Encoding"] = "deflate"
+            return len(body), zlib.compress(body), headers
+        return len(body), body, headers
+
+    def _post(self, payload, **kwargs):
+        """Post a json payload to the streaming endpoint and record its stats."""
+        payload_bytes, body, headers = self._encode(payload)
+        start = time.time()
+        response = request_with_retry(
+            self._client.post, self._endpoint, data=body, headers=headers, **kwargs
+        )
+        self._stats.add(
+            payload_bytes,
+            len(body),
+            time.time() - start,
+            failed=isinstance(response, Exception),
+        )
+        return response
+
+    def _post_files(self, fs, wait_for=()):
+        if wait_for:
+            futures.wait(wait_for)
+        try:
+            self._handle_response(
+                self._post(
+                    {"files": fs, "dropped": self._get_dropped_chunks()},
+                    retry_callback=self._api.retry_callback,
+                )
+            )
+        finally:
+            if self._pool:
+                self._inflight.release()
+
+    def _submit_files(self, fs):
+        # bound the number of posts in flight, this blocks the stream thread
+        self._inflight.acquire()
+        # forget files whose last post has landed so finished files don't pile up
+        for f in [f for f, tail in six.iteritems(self._file_tails) if tail.done()]:
+            del self._file_tails[f]
+        wait_for = [self._file_tails[f] for f in fs if f in self._file_tails]
+        future = self._pool.submit(self._post_files, fs, wait_for)
+        future.add_done_callback(self._post_files_done)
+        for f in fs:
+            self._file_tails[f] = future
+
+    def _post_files_done(self, future):
+        # errors of pooled posts are raised by finish(), like the stream thread's
+        if future.cancelled():
+            return
+        e = future.exception()
+        if e is None or self._exc_info:
+            return
+        exc_info = (type(e), e, e.__traceback__)
+        self._exc_info = exc_info
+        logger.error("generic exception in filestream post", exc_info=exc_info)
+        util.sentry_exc(exc_info)
 
     def _send(self, chunks, uploaded=None):
         uploaded = list(uploaded or [])
@@ -464,27 +671,28 @@ class FileStreamApi(object):
             if not files[filename]:
                 del files[filename]
 
-        for fs in file_stream_utils.split_files(files, max_bytes=util.MAX_LINE_BYTES):
-            self._handle_response(
-                request_with_retry(
-                    self._client.post,
-                    self._endpoint,
-                    json={"files": fs, "dropped": self._dropped_chunks},
-                    retry_callback=self._api.retry_callback,
-                )
-            )
+        if self._pool:
+            # post each file separately so a slow file does not hold up the others
+            for filename, file_data in six.iteritems(files):
+                for fs in file_stream_utils.split_files(
+                    {filename: file_data}, max_bytes=util.MAX_LINE_BYTES
+                ):
+                    self._submit_files(fs)
+        else:
+            for fs in file_stream_utils.split_files(
+                files, max_bytes=util.MAX_LINE_BYTES
+            ):
+                self._post_files(fs)
 
         if uploaded:
             if isinstance(
-                request_with_retry(
-                    self._client.post,
-                    self._endpoint,
-                    json={
+                self._post(
+                    {
                         "complete": False,
                         "failed": False,
-                        "dropped": self._dropped_chunks,
+                        "dropped": self._get_dropped_chunks(),
                         "uploaded": uploaded,
-                    },
+                    }
                 ),
                 Exception,
             ):
@@ -507,6 +715,8 @@ class FileStreamApi(object):
             chunk_id: TODO: change to 'offset'
             chunk: File data.
         """
+        with self._lock:
+            self._pending_bytes += _chunk_size(data)
         self._queue.put(Chunk(filename, data))
 
     def push_success(self, artifact_id, save_name):
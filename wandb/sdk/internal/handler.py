@@ -20,6 +20,7 @@ from typing import (
     List,
     Optional,
     Sequence,
+    Set,
     Tuple,
     TYPE_CHECKING,
 )
@@ -55,6 +56,8 @@ def _dict_nested_set(target: Dict[str, Any], key_list: Sequence[str], v: Any) ->
 
 class HandleManager(object):
     _consolidated_summary: SummaryDict
+    _summary_dirty: Set[str]
+    _summary_removed: Set[str]
     _sampled_history: Dict[str, sample.UniformSampleAccumulator]
     _settings: SettingsStatic
     _record_q: "Queue[Record]"
@@ -101,6 +104,9 @@ class HandleManager(object):
 
         # keep track of summary from key/val updates
         self._consolidated_summary = dict()
+        # top level summary keys changed since the last summary was sent
+        self._summary_dirty = set()
+        self._summary_removed = set()
         self._sampled_history = dict()
         self._metric_defines = dict()
         self._metric_globs = dict()
@@ -192,20 +198,45 @@ class HandleManager(object):
             update = summary.update.add()
             update.key = k
             update.value_json = json.dumps(v)
+        self._summary_dirty.clear()
+        self._summary_removed.clear()
         record = wandb_internal_pb2.Record(summary=summary)
         if flush:
             self._dispatch_record(record)
         elif not self._settings._offline:
             self._sender_q.put(record)
 
-    def _save_history(self, record: Record) -> None:
-        for item in record.history.item:
+    def _save_summary_delta(self) -> None:
+        """Send only the summary keys that changed since the last summary record."""
+        if not self._summary_dirty and not self._summary_removed:
+            return
+        if self._settings._offline:
+            # deltas are not persisted, the full summary is written on FLUSH_SUM
+            self._summary_dirty.clear()
+            self._summary_removed.clear()
+            return
+        summary = wandb_internal_pb2.SummaryRecord(delta=True)
+        for k in self._summary_dirty:
+            update = summary.update.add()
+            update.key = k
+            update.value_json = json.dumps(self._consolidated_summary[k])
+        for k in self._summary_removed:
+            remove = summary.remove.add()
+            remove.key = k
+        self._summary_dirty.clear()
+        self._summary_removed.clear()
+        record = wandb_internal_pb2.Record(summary=summary)
+        self._sender_q.put(record)
+
+    def _save_history(self, history_dict: Dict[str, Any]) -> None:
+        sampled_history = self._sampled_history
+        for k, v in six.iteritems(history_dict):
             # TODO(jhr) save nested keys?
-            k = item.key
-            v = json.loads(item.value_json)
             if isinstance(v, numbers.Real):
-                self._sampled_history.setdefault(k, sample.UniformSampleAccumulator())
-                self._sampled_history[k].add(v)
+                sampled = sampled_history.get(k)
+                if sampled is None:
+                    sampled = sampled_history[k] = sample.UniformSampleAccumulator()
+                sampled.add(v)
 
     def _update_summary_metrics(
         self,
@@ -346,10 +377,12 @@ class HandleManager(object):
         if not self._metric_defines:
             history_dict = self._update_summary_media_objects(history_dict)
             self._consolidated_summary.update(history_dict)
+            self._summary_dirty.update(history_dict)
             return True
         updated = False
         for k, v in six.iteritems(history_dict):
             if self._update_summary_list(kl=[k], v=v):
+                self._summary_dirty.add(k)
                 updated = True
         return updated
 
@@ -441,6 +474,8 @@ class HandleManager(object):
                 item.value_json = json.dumps(v)
 
     def handle_history(self, record: Record) -> None:
+        # decode the history items once, the resulting dict is shared by step
+        # assignment, sampling, defined metrics and summary updates
         history_dict = proto_util.dict_from_proto_list(record.history.item)
 
         # Inject _runtime if it is not present
@@ -450,11 +485,11 @@ class HandleManager(object):
 
         self._history_update(record, history_dict)
         self._dispatch_record(record)
-        self._save_history(record)
+        self._save_history(history_dict)
 
         updated = self._update_summary(history_dict)
         if updated:
-            self._save_summary(self._consolidated_summary)
+            self._save_summary_delta()
 
     def handle_summary(self, record: Record) -> None:
         summary = record.summary
@@ -476,6 +511,8 @@ class HandleManager(object):
 
             # use the last element of the key to write the leaf:
             target[key[-1]] = json.loads(item.value_json)
+            self._summary_dirty.add(key[0])
+            self._summary_removed.discard(key[0])
 
         for item in summary.remove:
             if len(item.nested_key) > 0:
@@ -495,8 +532,13 @@ class HandleManager(object):
 
             # use the last element of the key to erase the leaf:
             del target[key[-1]]
+            if len(key) > 1:
+                self._summary_dirty.add(key[0])
+            else:
+                self._summary_dirty.discard(key[0])
+                self._summary_removed.add(key[0])
 
-        self._save_summary(self._consolidated_summary)
+        self._save_summary_delta()
 
     def handle_exit(self, record: Record) -> None:
         if self._track_time is not None:
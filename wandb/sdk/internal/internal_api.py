@@ -5,7 +5,6 @@ from gql.transport.requests import RequestsHTTPTransport  # type: ignore
 import datetime
 import ast
 import os
-from pkg_resources import parse_version  # type: ignore
 import json
 import yaml
 import re
@@ -14,6 +13,7 @@ import logging
 import requests
 import socket
 import sys
+import threading
 
 if os.name == "posix" and sys.version_info[0] < 3:
     import subprocess32 as subprocess  # type: ignore
@@ -23,6 +23,7 @@ else:
 from copy import deepcopy
 import six
 from six import BytesIO
+from six.moves import urllib
 import wandb
 from wandb import __version__
 from wandb import env
@@ -56,6 +57,13 @@ class Api(object):
     """
 
     HTTP_TIMEOUT = env.get_http_timeout(10)
+    # storage hosts whose connections are kept open for reuse
+    UPLOAD_POOL_SIZE = 64
+    # connections kept open to each storage host, one per concurrent upload
+    # job; uploads past it wait for a free connection
+    UPLOAD_CONNECTIONS_PER_HOST = 64
+    # only ask the storage server what it kept of a failed upload past this size
+    RESUMABLE_UPLOAD_MIN_BYTES = 8 * 1024 * 1024
 
     def __init__(
         self,
@@ -115,6 +123,9 @@ class Api(object):
         self.upload_file_retry = normalize_exceptions(
             retry.retriable(retry_timedelta=retry_timedelta)(self.upload_file)
         )
+        self._upload_session = None
+        self._upload_session_lock = threading.Lock()
+        self._upload_env_settings = {}
         self._client_id_mapping = {}
 
         (
@@ -1552,9 +1563,56 @@ class Api(object):
 
         return path, response
 
+    @property
+    def upload_session(self):
+        """The session storage uploads share, so they reuse pooled connections"""
+        with self._upload_session_lock:
+            if self._upload_session is None:
+                session = requests.Session()
+                # requests reads the environment once per host in _upload_put
+                # instead of on every request
+                session.trust_env = False
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=self.UPLOAD_POOL_SIZE,
+                    pool_maxsize=self.UPLOAD_CONNECTIONS_PER_HOST,
+                    pool_block=True,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._upload_session = session
+            return self._upload_session
+
+    def _upload_put(self, url, **kwargs):
+        """PUTs to storage on the upload session
+
+        A requests session looks up proxies, CA bundles and netrc auth in the
+        environment on every request, which costs more than a small upload
+        itself. The upload session doesn't; the settings a session would use are
+        looked up once per host with requests' own environment handling.
+        """
+        host = urllib.parse.urlsplit(url)[:2]
+        settings = self._upload_env_settings.get(host)
+        if settings is None:
+            settings = requests.Session().merge_environment_settings(
+                url, {}, None, None, None
+            )
+            auth = requests.utils.get_netrc_auth(url)
+            if auth:
+                settings["auth"] = auth
+            if env.ssl_disabled():
+                settings["verify"] = False
+            self._upload_env_settings[host] = settings
+        kwargs = dict(settings, **kwargs)
+        return self.upload_session.put(url, **kwargs)
+
     def upload_file(self, url, file, callback=None, extra_headers={}):
         """Uploads a file to W&B with failure resumption
 
+        The file is uploaded from its current position. When an upload to a
+        resumable upload session fails part way the storage server is asked how much
+        of it was kept, and the file is left there so that the next attempt only
+        sends the rest. Otherwise it's rewound to the start.
+
         Arguments:
             url (str): The url to download
             file (str): The path to the file you want to upload
@@ -1567,29 +1625,73 @@ class Api(object):
         extra_headers = extra_headers.copy()
         response = None
         progress = Progress(file, callback=callback)
+        length = progress.offset + len(progress)
+        if progress.offset:
+            extra_headers["Content-Range"] = "bytes %i-%i/%i" % (
+                progress.offset,
+                length - 1,
+                length,
+            )
         try:
-            response = requests.put(url, data=progress, headers=extra_headers)
+            response = self._upload_put(url, data=progress, headers=extra_headers)
             response.raise_for_status()
+            if response.status_code == 308:
+                # a resumable upload session that didn't get the whole file
+                raise requests.exceptions.HTTPError(
+                    "Incomplete upload", response=response
+                )
         except requests.exceptions.RequestException as e:
-            logger.error("upload_file exception {}: {}".format(url, e))
-            request_headers = e.request.headers if e.request is not None else ""
-            logger.error("upload_file request headers: {}".format(request_headers))
-            response_content = e.response.content if e.response is not None else ""
-            logger.error("upload_file response body: {}".format(response_content))
-            status_code = e.response.status_code if e.response != None else 0
-            # We need to rewind the file for the next retry (the file passed in is seeked to 0)
-            progress.rewind()
-            # Retry errors from cloud storage or local network issues
-            if status_code in (308, 408, 409, 429, 500, 502, 503, 504) or isinstance(
-                e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+            offset = 0
+            if (
+                self._is_transient_upload_error(e)
+                and self._is_resumable_session(url)
+                and progress.offset + progress.bytes_read
+                >= self.RESUMABLE_UPLOAD_MIN_BYTES
             ):
-                e = retry.TransientError(exc=e)
-                six.reraise(type(e), e, sys.exc_info()[2])
-            else:
-                util.sentry_reraise(e)
+                offset = self._uploaded_bytes(url, length)
+            # Leave the file where the next retry should start sending from
+            progress.rewind(offset)
+            self._reraise_upload_error(url, e)
 
         return response
 
+    def _is_resumable_session(self, url):
+        """Whether `url` is a resumable upload session, which can be asked how much
+        of an upload it kept. Asking a plain signed url would overwrite the object
+        with an empty body."""
+        query = urllib.parse.parse_qs(urllib.parse.urlsplit(url).query)
+        return "upload_id" in query
+
+    def _uploaded_bytes(self, url, length):
+        """Asks the storage server how many bytes of an interrupted upload it kept"""
+        try:
+            response = self._status_request(url, length)
+        except requests.exceptions.RequestException:
+            return 0
+        if response.status_code != 308:
+            return 0
+        match = re.match(r"bytes=0-(\d+)$", response.headers.get("Range", ""))
+        return int(match.group(1)) + 1 if match else 0
+
+    def _is_transient_upload_error(self, e):
+        status_code = e.response.status_code if e.response is not None else 0
+        return status_code in (308, 408, 409, 429, 500, 502, 503, 504) or isinstance(
+            e, (requests.exceptions.Timeout, requests.exceptions.ConnectionError)
+        )
+
+    def _reraise_upload_error(self, url, e):
+        logger.error("upload_file exception {}: {}".format(url, e))
+        request_headers = e.request.headers if e.request is not None else ""
+        logger.error("upload_file request headers: {}".format(request_headers))
+        response_content = e.response.content if e.response is not None else ""
+        logger.error("upload_file response body: {}".format(response_content))
+        # Retry errors from cloud storage or local network issues
+        if self._is_transient_upload_error(e):
+            e = retry.TransientError(exc=e)
+            six.reraise(type(e), e, sys.exc_info()[2])
+        else:
+            util.sentry_reraise(e)
+
     @normalize_exceptions
     def register_agent(self, host, sweep_id=None, project_name=None, entity=None):
         """Register a new agent
@@ -2131,6 +2233,8 @@ class Api(object):
         distributed_id=None,
         is_user_created=False,
     ):
+        from pkg_resources import parse_version  # type: ignore
+
         # TODO: Ignore clientID and sequenceClientID if server can't handle it
         _, server_info = self.viewer_server_info()
         max_cli_version = server_info.get("cliVersionInfo", {}).get(
@@ -2601,9 +2705,10 @@ class Api(object):
 
     def _status_request(self, url, length):
         """Ask google how much we've uploaded"""
-        return requests.put(
-            url=url,
+        return self._upload_put(
+            url,
             headers={"Content-Length": "0", "Content-Range": "bytes */%i" % length},
+            allow_redirects=False,
         )
 
     def _flatten_edges(self, response):
@@ -10,7 +10,12 @@ from wandb.errors import CommError
 
 
 class Progress(object):
-    """A helper class for displaying progress"""
+    """A helper class for displaying progress
+
+    Reads `file` from its current position, `offset`, up to its end. The
+    callback is passed the number of bytes read and the position reached in the
+    file.
+    """
 
     ITER_BYTES = 1024 * 1024
 
@@ -23,7 +28,8 @@ class Progress(object):
 
         self.callback = callback
         self.bytes_read = 0
-        self.len = os.fstat(file.fileno()).st_size
+        self.offset = file.tell()
+        self.len = os.fstat(file.fileno()).st_size - self.offset
 
     def read(self, size=-1):
         """Read bytes and call the callback"""
@@ -41,13 +47,14 @@ class Progress(object):
             )
         # Growing files are also likely to be bad, but our code didn't break
         # on those in the past so it's riskier to make that an error now.
-        self.callback(len(bites), self.bytes_read)
+        self.callback(len(bites), self.offset + self.bytes_read)
         return bites
 
-    def rewind(self):
-        self.callback(0, -self.bytes_read)
+    def rewind(self, offset=0):
+        """Seek back to `offset` in the file, for the next attempt of an upload"""
+        self.callback(offset - self.offset - self.bytes_read, offset)
         self.bytes_read = 0
-        self.file.seek(0)
+        self.file.seek(offset)
 
     def __iter__(self):
         return self
@@ -3,10 +3,22 @@
 sample.
 """
 
+from array import array
 import math
+from typing import Any, List, Optional, Union
 
 
 class UniformSampleAccumulator(object):
+    """Keep a bounded, roughly uniform sample of a stream of numbers.
+
+    Samples are stored in a single preallocated array so the memory used per
+    tracked key is fixed by `min_samples`. The array holds 64-bit ints until a
+    float is kept, then doubles, since a mix of ints and floats is reported as
+    floats anyway. It goes back to ints once every float kept has been evicted.
+    It is turned into a list the first time a value neither array can hold
+    exactly is kept.
+    """
+
     def __init__(self, min_samples=None):
         self._samples = min_samples or 64
         # force power of 2 samples
@@ -21,22 +33,23 @@ class UniformSampleAccumulator(object):
         self._buckets_bits = int(math.log(self._buckets, 2))
         self._buckets_mask = (1 << self._buckets_bits + 1) - 1
         self._buckets_index = 0
-        self._bucket = []
         self._index = [0] * self._buckets
         self._count = 0
-        self._log2 = [0]
+        self._typecode: Optional[str] = "q"
+        # floats kept in each bucket while the samples are stored as doubles
+        self._floats = [0] * self._buckets
 
-        # pre-allocate buckets
-        for _ in range(self._buckets):
-            self._bucket.append([0] * self._max)
-        # compute integer log2
-        self._log2 += [int(math.log(i, 2)) for i in range(1, 2 ** self._buckets + 1)]
+        # pre-allocate buckets, bucket b starts at offset b * self._max
+        self._bucket: Union["array[Any]", List[Any]] = array(
+            "q", bytes(8 * self._buckets * self._max)
+        )
 
     def _show(self):
         print("=" * 20)
         for b in range(self._buckets):
             b = (b + self._buckets_index) % self._buckets
-            vals = [self._bucket[b][i] for i in range(self._index[b])]
+            start = b * self._max
+            vals = list(self._bucket[start : start + self._index[b]])
             print("{}: {}".format(b, vals))
 
     def add(self, val):
@@ -44,18 +57,51 @@ class UniformSampleAccumulator(object):
         cnt = self._count
         if cnt & self._mask:
             return
-        b = cnt >> self._shift
-        b = self._log2[b]  # b = int(math.log(b, 2))
+        b = (cnt >> self._shift).bit_length() - 1  # b = int(math.log(b, 2))
         if b >= self._buckets:
             self._index[self._buckets_index] = 0
+            if self._floats[self._buckets_index]:
+                self._floats[self._buckets_index] = 0
+                if self._typecode == "d" and not any(self._floats):
+                    self._store_ints()
             self._buckets_index = (self._buckets_index + 1) % self._buckets
             self._shift += 1
             self._mask = (self._mask << 1) | 1
             b += self._buckets - 1
         b = (b + self._buckets_index) % self._buckets
-        self._bucket[b][self._index[b]] = val
+        self._store(b, b * self._max + self._index[b], val)
         self._index[b] += 1
 
+    def _store(self, b, pos, val):
+        if self._typecode == "q":
+            if type(val) is int and -(2 ** 63) <= val < 2 ** 63:
+                self._bucket[pos] = val
+                return
+            if isinstance(val, float):
+                self._bucket = array("d", self._bucket)
+                self._typecode = "d"
+            else:
+                self._bucket = list(self._bucket)
+                self._typecode = None
+        elif self._typecode == "d" and not (
+            isinstance(val, float) or type(val) is int and abs(val) <= 2 ** 53
+        ):
+            self._bucket = list(self._bucket)
+            self._typecode = None
+        if self._typecode == "d" and isinstance(val, float):
+            self._floats[b] += 1
+        self._bucket[pos] = val
+
+    def _store_ints(self):
+        # only ints are left, copy the kept samples back into an int array
+        bucket = array("q", bytes(8 * len(self._bucket)))
+        for b in range(self._buckets):
+            start = b * self._max
+            end = start + self._index[b]
+            bucket[start:end] = array("q", map(int, self._bucket[start:end]))
+        self._bucket = bucket
+        self._typecode = "q"
+
     def get(self):
         full = []
         sampled = []
@@ -63,11 +109,14 @@ class UniformSampleAccumulator(object):
         for b in range(self._buckets):
             max_num = 2 ** b
             b = (b + self._buckets_index) % self._buckets
+            start = b * self._max
+            vals = list(self._bucket[start : start + self._index[b]])
             modb = self._index[b] // max_num
-            for i in range(self._index[b]):
-                if not modb or i % modb == 0:
-                    sampled.append(self._bucket[b][i])
-                full.append(self._bucket[b][i])
+            if modb:
+                sampled.extend(vals[::modb])
+            else:
+                sampled.extend(vals)
+            full.extend(vals)
         if len(sampled) < self._samples:
             return tuple(full)
         return tuple(sampled)
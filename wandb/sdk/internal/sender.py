@@ -53,6 +53,9 @@ logger = logging.getLogger(__name__)
 DictWithValues = NewType("DictWithValues", Dict[str, Any])
 DictNoValues = NewType("DictNoValues", Dict[str, Any])
 
+# minimum time between rewrites of the full summary when receiving deltas
+SUMMARY_DEBOUNCE_SECONDS = 1.0
+
 
 def _framework_priority(
     imp: telemetry.TelemetryImports,
@@ -150,6 +153,8 @@ class SendManager(object):
         self._config_metric_pbdict_list: List[Dict[int, Any]] = []
         self._metadata_summary: Dict[str, Any] = defaultdict()
         self._cached_summary: Dict[str, Any] = dict()
+        self._summary_needs_debounce: bool = False
+        self._summary_time: float = 0.0
         self._config_metric_index_dict: Dict[str, int] = {}
         self._config_metric_dict: Dict[str, wandb_internal_pb2.MetricRecord] = {}
 
@@ -313,6 +318,8 @@ class SendManager(object):
     def debounce(self) -> None:
         if self._config_needs_debounce:
             self._debounce_config()
+        if self._summary_needs_debounce:
+            self._update_summary()
 
     def _debounce_config(self) -> None:
         config_value_dict = self._config_format(self._consolidated_config)
@@ -341,6 +348,16 @@ class SendManager(object):
                 break
             except Exception as e:
                 logger.warning("Error emptying retry queue: {}".format(e))
+        if self._fs:
+            fs_status = self._fs.status()
+            status = status_resp.file_stream_status
+            status.queue_depth = fs_status["queue_depth"]
+            status.pending_bytes = fs_status["pending_bytes"]
+            status.dropped_chunks = fs_status["dropped_chunks"]
+            status.coalesced_chunks = fs_status["coalesced_chunks"]
+            status.posts = fs_status["posts"]
+            status.failed_posts = fs_status["failed_posts"]
+            status.sent_bytes = fs_status["sent_bytes"]
         self._result_q.put(result)
 
     def send_request_login(self, record: "Record") -> None:
@@ -817,11 +834,24 @@ class SendManager(object):
         self._save_history(history_dict)
 
     def send_summary(self, record: "Record") -> None:
-        summary_dict = proto_util.dict_from_proto_list(record.summary.update)
-        self._cached_summary = summary_dict
-        self._update_summary()
+        summary = record.summary
+        if not summary.delta:
+            self._cached_summary = proto_util.dict_from_proto_list(summary.update)
+            self._update_summary()
+            return
+
+        # coalesce deltas, the full summary is only rewritten when it is due
+        for item in summary.update:
+            self._cached_summary[item.key] = json.loads(item.value_json)
+        for item in summary.remove:
+            self._cached_summary.pop(item.key, None)
+        self._summary_needs_debounce = True
+        if time.time() - self._summary_time >= SUMMARY_DEBOUNCE_SECONDS:
+            self._update_summary()
 
     def _update_summary(self) -> None:
+        self._summary_needs_debounce = False
+        self._summary_time = time.time()
         summary_dict = self._cached_summary.copy()
         summary_dict.pop("_wandb", None)
         if self._metadata_summary:
@@ -1068,6 +1098,8 @@ class SendManager(object):
 
     def finish(self) -> None:
         logger.info("shutting down sender")
+        if self._summary_needs_debounce:
+            self._update_summary()
         # if self._tb_watcher:
         #     self._tb_watcher.finish()
         if self._dir_watcher:
@@ -1,12 +1,16 @@
 #
 from __future__ import absolute_import
 
+from abc import ABC, abstractmethod
 import json
+import logging
+import os
 import platform
 import subprocess
 import threading
 import time
-from typing import Dict, List, Optional, Union
+from collections import deque
+from typing import Deque, Dict, List, Optional, Sequence, Set, Tuple, Type, Union
 
 import psutil
 import wandb
@@ -18,8 +22,10 @@ from ..interface.interface_queue import InterfaceQueue
 from ..lib import telemetry
 
 
+logger = logging.getLogger(__name__)
+
 GPUHandle = object
-SamplerDict = Dict[str, List[float]]
+SampleDict = Dict[str, float]
 StatsDict = Dict[str, Union[float, Dict[str, float]]]
 
 
@@ -63,118 +69,71 @@ def gpu_in_use_by_this_process(gpu_handle: GPUHandle) -> bool:
     return len(pids_using_device & our_pids) > 0
 
 
-class SystemStats(object):
+def _nvml_gpu_count() -> int:
+    try:
+        pynvml.nvmlInit()
+        return int(pynvml.nvmlDeviceGetCount())
+    except pynvml.NVMLError:
+        return 0
 
-    _pid: int
-    _interface: InterfaceQueue
-    sampler: SamplerDict
-    samples: int
-    _thread: Optional[threading.Thread]
-    gpu_count: int
 
-    def __init__(self, pid: int, interface: InterfaceQueue) -> None:
-        try:
-            pynvml.nvmlInit()
-            self.gpu_count = pynvml.nvmlDeviceGetCount()
-        except pynvml.NVMLError:
-            self.gpu_count = 0
-        # self.run = run
+class Collector(ABC):
+    """A source of system metrics.
+
+    Every collector is sampled on its own thread every `interval` seconds, so a
+    slow one does not delay the others. The samples taken between two flushes
+    are reduced with `aggregates` (any of "mean", "min", "max" and "last"): the
+    first one is reported under the metric's own key and the others as
+    `<key>.<aggregate>`.
+    """
+
+    name = "collector"
+    interval: float = 2.0
+    aggregates: Tuple[str, ...] = ("mean",)
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
         self._pid = pid
         self._interface = interface
-        self.sampler = {}
-        self.samples = 0
-        self._shutdown = False
-        self._telem = telemetry.TelemetryRecord()
-        if psutil:
-            net = psutil.net_io_counters()
-            self.network_init = {"sent": net.bytes_sent, "recv": net.bytes_recv}
-        else:
-            wandb.termlog(
-                "psutil not installed, only GPU stats will be reported.  Install with pip install psutil"
-            )
-        self._thread = None
-        self._tpu_profiler = None
 
-        if tpu.is_tpu_available():
-            try:
-                self._tpu_profiler = tpu.get_profiler()
-            except Exception as e:
-                wandb.termlog("Error initializing TPUProfiler: " + str(e))
+    def is_available(self) -> bool:
+        return True
+
+    def get_aggregates(self, key: str) -> Tuple[str, ...]:
+        return self.aggregates
 
     def start(self) -> None:
-        if self._thread is None:
-            self._shutdown = False
-            self._thread = threading.Thread(target=self._thread_body)
-            self._thread.name = "StatsThr"
-            self._thread.daemon = True
-        if not self._thread.is_alive():
-            self._thread.start()
-        if self._tpu_profiler:
-            self._tpu_profiler.start()
+        pass
 
-    @property
-    def proc(self) -> psutil.Process:
-        return psutil.Process(pid=self._pid)
+    def stop(self) -> None:
+        pass
 
-    @property
-    def sample_rate_seconds(self) -> float:
-        """Sample system stats every this many seconds, defaults to 2, min is 0.5"""
-        return 2
-        # return max(0.5, self._api.dynamic_settings["system_sample_seconds"])
+    @abstractmethod
+    def sample(self) -> SampleDict:
+        raise NotImplementedError
 
-    @property
-    def samples_to_average(self) -> int:
-        """The number of samples to average before pushing, defaults to 15 valid range (2:30)"""
-        return 15
-        # return min(30, max(2, self._api.dynamic_settings["system_samples"]))
 
-    def _thread_body(self) -> None:
-        while True:
-            stats = self.stats()
-            for stat, value in stats.items():
-                if isinstance(value, (int, float)):
-                    self.sampler[stat] = self.sampler.get(stat, [])
-                    self.sampler[stat].append(value)
-            self.samples += 1
-            if self._shutdown or self.samples >= self.samples_to_average:
-                self.flush()
-                if self._shutdown:
-                    break
-            seconds = 0.0
-            while seconds < self.sample_rate_seconds:
-                time.sleep(0.1)
-                seconds += 0.1
-                if self._shutdown:
-                    self.flush()
-                    return
+_collectors: List[Type[Collector]] = []
 
-    def shutdown(self) -> None:
-        self._shutdown = True
-        try:
-            if self._thread is not None:
-                self._thread.join()
-        finally:
-            self._thread = None
-        if self._tpu_profiler:
-            self._tpu_profiler.stop()
 
-    def flush(self) -> None:
-        stats = self.stats()
-        for stat, value in stats.items():
-            # TODO: a bit hacky, we assume all numbers should be averaged.  If you want
-            # max for a stat, you must put it in a sub key, like ["network"]["sent"]
-            if isinstance(value, (float, int)):
-                # samples = list(self.sampler.get(stat, [stats[stat]]))
-                samples = list(self.sampler.get(stat, [value]))
-                stats[stat] = round(sum(samples) / len(samples), 2)
-        # self.run.events.track("system", stats, _wandb=True)
-        if self._interface:
-            self._interface.publish_stats(stats)
-        self.samples = 0
-        self.sampler = {}
+def register_collector(cls: Type[Collector]) -> Type[Collector]:
+    """Adds a collector class to the ones `SystemStats` uses by default."""
+    _collectors.append(cls)
+    return cls
 
-    def stats(self) -> StatsDict:
-        stats: StatsDict = {}
+
+@register_collector
+class NvidiaGPUCollector(Collector):
+    name = "gpu"
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
+        super(NvidiaGPUCollector, self).__init__(pid, interface)
+        self.gpu_count = _nvml_gpu_count()
+
+    def is_available(self) -> bool:
+        return self.gpu_count > 0
+
+    def sample(self) -> SampleDict:
+        stats: SampleDict = {}
         for i in range(0, self.gpu_count):
             handle = pynvml.nvmlDeviceGetHandleByIndex(i)
             try:
@@ -222,56 +181,600 @@ class SystemStats(object):
 
             except pynvml.NVMLError:
                 pass
+        return stats
+
 
+@register_collector
+class AppleGPUCollector(Collector):
+    name = "apple_gpu"
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
+        super(AppleGPUCollector, self).__init__(pid, interface)
+        self._telem = telemetry.TelemetryRecord()
+
+    def is_available(self) -> bool:
         # On Apple M1 systems let's look for the gpu
-        if (
+        return (
             platform.system() == "Darwin"
             and platform.processor() == "arm"
-            and self.gpu_count == 0
-        ):
-            try:
-                out = subprocess.check_output([util.apple_gpu_stats_binary(), "--json"])
-                m1_stats = json.loads(out.split(b"\n")[0])
-                stats["gpu.0.gpu"] = m1_stats["utilization"]
-                stats["gpu.0.memoryAllocated"] = m1_stats["mem_used"]
-                stats["gpu.0.temp"] = m1_stats["temperature"]
-                stats["gpu.0.powerWatts"] = m1_stats["power"]
-                stats["gpu.0.powerPercent"] = (
-                    m1_stats["power"] / M1_MAX_POWER_WATTS
-                ) * 100
-                # TODO: this stat could be useful eventually, it was consistently
-                # 0 in my experimentation and requires a frontend change
-                # so leaving it out for now.
-                # stats["gpu.0.cpuWaitMs"] = m1_stats["cpu_wait_ms"]
+            and _nvml_gpu_count() == 0
+        )
 
-                if self._interface and not self._telem.env.m1_gpu:
-                    self._telem.env.m1_gpu = True
-                    self._interface._publish_telemetry(self._telem)
+    def sample(self) -> SampleDict:
+        stats: SampleDict = {}
+        try:
+            out = subprocess.check_output([util.apple_gpu_stats_binary(), "--json"])
+            m1_stats = json.loads(out.split(b"\n")[0])
+            stats["gpu.0.gpu"] = m1_stats["utilization"]
+            stats["gpu.0.memoryAllocated"] = m1_stats["mem_used"]
+            stats["gpu.0.temp"] = m1_stats["temperature"]
+            stats["gpu.0.powerWatts"] = m1_stats["power"]
+            stats["gpu.0.powerPercent"] = (m1_stats["power"] / M1_MAX_POWER_WATTS) * 100
+            # TODO: this stat could be useful eventually, it was consistently
+            # 0 in my experimentation and requires a frontend change
+            # so leaving it out for now.
+            # stats["gpu.0.cpuWaitMs"] = m1_stats["cpu_wait_ms"]
+
+            if self._interface and not self._telem.env.m1_gpu:
+                self._telem.env.m1_gpu = True
+                self._interface._publish_telemetry(self._telem)
+
+        except (OSError, ValueError, TypeError, subprocess.CalledProcessError) as e:
+            wandb.termwarn("GPU stats error {}".format(e))
+        return stats
 
-            except (OSError, ValueError, TypeError, subprocess.CalledProcessError) as e:
-                wandb.termwarn("GPU stats error {}".format(e))
-                pass
 
-        if psutil:
-            net = psutil.net_io_counters()
-            sysmem = psutil.virtual_memory()
-            stats["cpu"] = psutil.cpu_percent()
-            stats["memory"] = sysmem.percent
-            stats["network"] = {
-                "sent": net.bytes_sent - self.network_init["sent"],
-                "recv": net.bytes_recv - self.network_init["recv"],
-            }
-            # TODO: maybe show other partitions, will likely need user to configure
-            stats["disk"] = psutil.disk_usage("/").percent
-            stats["proc.memory.availableMB"] = sysmem.available / 1048576.0
+@register_collector
+class CPUCollector(Collector):
+    name = "cpu"
+    aggregates = ("mean", "min", "max")
+
+    def sample(self) -> SampleDict:
+        return {"cpu": psutil.cpu_percent()}
+
+
+@register_collector
+class CPUCoresCollector(Collector):
+    name = "cpu_cores"
+
+    def sample(self) -> SampleDict:
+        return {
+            "cpu.{}.cpu_percent".format(i): percent
+            for i, percent in enumerate(psutil.cpu_percent(percpu=True))
+        }
+
+
+@register_collector
+class MemoryCollector(Collector):
+    name = "memory"
+    aggregates = ("mean", "max")
+
+    def sample(self) -> SampleDict:
+        sysmem = psutil.virtual_memory()
+        return {
+            "memory": sysmem.percent,
+            "proc.memory.availableMB": sysmem.available / 1048576.0,
+        }
+
+
+# (process info field, stat name, divisor)
+_PROCESS_STATS = (
+    ("cpu", "cpu.percent", 1),
+    ("threads", "cpu.threads", 1),
+    ("rss", "memory.rssMB", 1048576.0),
+    ("uss", "memory.ussMB", 1048576.0),
+    ("fds", "fds", 1),
+    ("read", "io.readMB", 1048576.0),
+    ("write", "io.writeMB", 1048576.0),
+)
+
+
+def _process_info(proc: psutil.Process, uss: bool = False) -> Dict[str, float]:
+    """Samples a process, leaving out what the platform or permissions don't provide
+
+    USS is only sampled if `uss` is set, since memory_full_info() reads every
+    memory mapping of the process.
+    """
+    info: Dict[str, float] = {}
+    with proc.oneshot():
+        info["cpu"] = proc.cpu_percent()
+        info["threads"] = proc.num_threads()
+        info["rss"] = proc.memory_info().rss
+        if uss:
+            try:
+                full_info = proc.memory_full_info()
+                if hasattr(full_info, "uss"):
+                    info["uss"] = full_info.uss
+            except psutil.AccessDenied:
+                pass
+        try:
+            if hasattr(proc, "num_fds"):
+                info["fds"] = proc.num_fds()
+            if hasattr(proc, "io_counters"):
+                io = proc.io_counters()
+                info["read"] = io.read_bytes
+                info["write"] = io.write_bytes
+        except psutil.AccessDenied:
+            pass
+    return info
+
+
+class ProcessTree(object):
+    """Tracks resource usage of a process and all of its descendants.
+
+    Children are enumerated every `refresh_interval` seconds instead of on every
+    sample, and at most `max_samples` of them are sampled per call, round robin,
+    reusing the last sample of the others. This keeps the cost of a sample bounded
+    however many DataLoader workers or subprocesses there are. The USS of each
+    process is sampled at most once every `refresh_interval` seconds too.
+    """
+
+    def __init__(
+        self, pid: int, refresh_interval: float = 10.0, max_samples: int = 32
+    ) -> None:
+        self.root = psutil.Process(pid)
+        self.refresh_interval = refresh_interval
+        self.max_samples = max_samples
+        self.children: Dict[int, psutil.Process] = {}
+        self.info: Dict[int, Dict[str, float]] = {}
+        self._root_info: Dict[str, float] = {}
+        self._uss_sampled: Dict[int, float] = {}
+        self._pending: Deque[int] = deque()
+        self._last_refresh: Optional[float] = None
+
+    def refresh(self) -> None:
+        children = {}
+        for child in self.root.children(recursive=True):
+            known = self.children.get(child.pid)
+            # keep the known Process, it remembers the cpu times of the last sample
+            children[child.pid] = known if known == child else child
+        new = [
+            pid for pid, child in children.items() if self.children.get(pid) != child
+        ]
+        for pid in self.children:
+            if pid not in children or pid in new:
+                self.info.pop(pid, None)
+                self._uss_sampled.pop(pid, None)
+        # new children are sampled first
+        self._pending = deque(
+            new + [pid for pid in self._pending if pid in children and pid not in new]
+        )
+        self.children = children
+        self._last_refresh = time.time()
+
+    def sample(self) -> Tuple[Dict[str, float], Dict[int, Dict[str, float]]]:
+        """Returns the info of the root process and of each child"""
+        if (
+            self._last_refresh is None
+            or time.time() - self._last_refresh >= self.refresh_interval
+        ):
+            self.refresh()
+        self._root_info = self._process_info(self.root, self._root_info)
+        for _ in range(min(self.max_samples, len(self._pending))):
+            pid = self._pending.popleft()
             try:
-                stats["proc.memory.rssMB"] = self.proc.memory_info().rss / 1048576.0
-                stats["proc.memory.percent"] = self.proc.memory_percent()
-                stats["proc.cpu.threads"] = self.proc.num_threads()
+                self.info[pid] = self._process_info(
+                    self.children[pid], self.info.get(pid)
+                )
             except psutil.NoSuchProcess:
+                del self.children[pid]
+                self.info.pop(pid, None)
+                self._uss_sampled.pop(pid, None)
+                continue
+            except psutil.AccessDenied:
                 pass
-        if self._tpu_profiler:
-            tpu_utilization = self._tpu_profiler.get_tpu_utilization()
-            if tpu_utilization is not None:
-                stats["tpu"] = tpu_utilization
+            self._pending.append(pid)
+        return self._root_info, dict(self.info)
+
+    def _process_info(
+        self, proc: psutil.Process, last: Optional[Dict[str, float]]
+    ) -> Dict[str, float]:
+        now = time.time()
+        sampled = self._uss_sampled.get(proc.pid)
+        uss = sampled is None or now - sampled >= self.refresh_interval
+        info = _process_info(proc, uss=uss)
+        if uss:
+            self._uss_sampled[proc.pid] = now
+        elif last and "uss" in last:
+            info["uss"] = last["uss"]
+        return info
+
+
+def _add_process_stats(stats: SampleDict, prefix: str, info: Dict[str, float]) -> None:
+    for field, name, divisor in _PROCESS_STATS:
+        if field in info:
+            stats["{}.{}".format(prefix, name)] = info[field] / divisor
+
+
+@register_collector
+class ProcessCollector(Collector):
+    """Our process, the sum over its process tree, and its first children.
+
+    Each child is given the lowest slot that no running child has, and the
+    children in the first `max_reported_children` slots are reported as
+    `proc.child.<slot>.*`. Children that replace ones that exited, like the
+    DataLoader workers of each epoch, take over their slots, so the number of
+    keys stays bounded.
+    """
+
+    name = "proc"
+    aggregates = ("mean", "max")
+    max_reported_children = 8
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
+        super(ProcessCollector, self).__init__(pid, interface)
+        self._tree: Optional[ProcessTree] = None
+        self._slots: Dict[int, int] = {}
+
+    def _update_slots(self, pids: Set[int]) -> None:
+        self._slots = {pid: slot for pid, slot in self._slots.items() if pid in pids}
+        used = set(self._slots.values())
+        slot = 0
+        for pid in sorted(pids):
+            if pid in self._slots:
+                continue
+            while slot in used:
+                slot += 1
+            self._slots[pid] = slot
+            used.add(slot)
+
+    def get_aggregates(self, key: str) -> Tuple[str, ...]:
+        # I/O is counted in bytes since each process started
+        if key.endswith((".readMB", ".writeMB")):
+            return ("last",)
+        return self.aggregates
+
+    def sample(self) -> SampleDict:
+        stats: SampleDict = {}
+        try:
+            if self._tree is None:
+                self._tree = ProcessTree(self._pid)
+            root, children = self._tree.sample()
+            stats["proc.memory.percent"] = self._tree.root.memory_percent()
+        except psutil.NoSuchProcess:
+            return stats
+        _add_process_stats(stats, "proc", root)
+
+        total = dict(root)
+        for info in children.values():
+            for field, value in info.items():
+                total[field] = total.get(field, 0) + value
+        _add_process_stats(stats, "proc.tree", total)
+        stats["proc.tree.processes"] = 1 + len(self._tree.children)
+
+        self._update_slots(set(self._tree.children))
+        for pid, info in children.items():
+            slot = self._slots.get(pid)
+            if slot is not None and slot < self.max_reported_children:
+                _add_process_stats(stats, "proc.child.{}".format(slot), info)
+        return stats
+
+
+@register_collector
+class DiskCollector(Collector):
+    name = "disk"
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
+        super(DiskCollector, self).__init__(pid, interface)
+        self._last: Optional[Tuple[float, int, int]] = None
+
+    def sample(self) -> SampleDict:
+        # TODO: maybe show other partitions, will likely need user to configure
+        stats: SampleDict = {"disk": psutil.disk_usage("/").percent}
+        io = psutil.disk_io_counters()
+        if io is not None:
+            now = time.time()
+            if self._last is not None and now > self._last[0]:
+                last_time, last_read, last_write = self._last
+                elapsed = (now - last_time) * 1048576.0
+                stats["disk.readMBps"] = (io.read_bytes - last_read) / elapsed
+                stats["disk.writeMBps"] = (io.write_bytes - last_write) / elapsed
+            self._last = (now, io.read_bytes, io.write_bytes)
+        return stats
+
+
+@register_collector
+class NetworkCollector(Collector):
+    name = "network"
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
+        super(NetworkCollector, self).__init__(pid, interface)
+        net = psutil.net_io_counters()
+        self.network_init = {"sent": net.bytes_sent, "recv": net.bytes_recv}
+        self._last = (time.time(), net.bytes_sent, net.bytes_recv)
+
+    def get_aggregates(self, key: str) -> Tuple[str, ...]:
+        # bytes sent and received are totals since the run started
+        if key in ("network.sent", "network.recv"):
+            return ("last",)
+        return self.aggregates
+
+    def sample(self) -> SampleDict:
+        net = psutil.net_io_counters()
+        now = time.time()
+        stats: SampleDict = {
+            "network.sent": net.bytes_sent - self.network_init["sent"],
+            "network.recv": net.bytes_recv - self.network_init["recv"],
+        }
+        last_time, last_sent, last_recv = self._last
+        if now > last_time:
+            elapsed = (now - last_time) * 1048576.0
+            stats["network.sentMBps"] = (net.bytes_sent - last_sent) / elapsed
+            stats["network.recvMBps"] = (net.bytes_recv - last_recv) / elapsed
+        self._last = (now, net.bytes_sent, net.bytes_recv)
+        return stats
+
+
+@register_collector
+class CgroupCollector(Collector):
+    """Memory and CPU usage of the cgroup (e.g. container) we run in against its limits."""
+
+    name = "cgroup"
+    interval = 10.0
+    root = "/sys/fs/cgroup"
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
+        super(CgroupCollector, self).__init__(pid, interface)
+        self._last_usage: Optional[Tuple[float, float]] = None
+
+    def _read(self, *names: str) -> Optional[str]:
+        for name in names:
+            try:
+                with open(os.path.join(self.root, name)) as f:
+                    return f.read().strip()
+            except (IOError, OSError):
+                continue
+        return None
+
+    def memory_limit(self) -> Optional[float]:
+        """Memory limit in bytes, or None if unlimited"""
+        value = self._read("memory.max", "memory/memory.limit_in_bytes")
+        if value is None or value == "max":
+            return None
+        limit = float(value)
+        # cgroup v1 reports a huge number instead of no limit
+        if limit >= psutil.virtual_memory().total:
+            return None
+        return limit
+
+    def cpu_limit(self) -> Optional[float]:
+        """CPU limit in cores, or None if unlimited"""
+        cpu_max = self._read("cpu.max")
+        if cpu_max is not None:
+            quota, _, period = cpu_max.partition(" ")
+            if quota == "max":
+                return None
+            return float(quota) / float(period or 100000)
+        cfs_quota = self._read("cpu/cpu.cfs_quota_us", "cpu,cpuacct/cpu.cfs_quota_us")
+        cfs_period = self._read(
+            "cpu/cpu.cfs_period_us", "cpu,cpuacct/cpu.cfs_period_us"
+        )
+        if cfs_quota is None or cfs_period is None or float(cfs_quota) <= 0:
+            return None
+        return float(cfs_quota) / float(cfs_period)
+
+    def cpu_usage(self) -> Optional[float]:
+        """Total CPU time used by the cgroup in seconds"""
+        stat = self._read("cpu.stat")
+        if stat is not None:
+            for line in stat.splitlines():
+                key, _, value = line.partition(" ")
+                if key == "usage_usec":
+                    return float(value) / 1e6
+        usage = self._read("cpuacct/cpuacct.usage", "cpu,cpuacct/cpuacct.usage")
+        return float(usage) / 1e9 if usage is not None else None
+
+    def is_available(self) -> bool:
+        return platform.system() == "Linux" and (
+            self.memory_limit() is not None or self.cpu_limit() is not None
+        )
+
+    def sample(self) -> SampleDict:
+        stats: SampleDict = {}
+        memory_limit = self.memory_limit()
+        if memory_limit is not None:
+            stats["cgroup.memory.limitMB"] = memory_limit / 1048576.0
+            used = self._read("memory.current", "memory/memory.usage_in_bytes")
+            if used is not None:
+                stats["cgroup.memory.usedMB"] = float(used) / 1048576.0
+                stats["cgroup.memory.percent"] = float(used) / memory_limit * 100
+        cpu_limit = self.cpu_limit()
+        if cpu_limit is not None:
+            stats["cgroup.cpu.limit"] = cpu_limit
+            usage = self.cpu_usage()
+            now = time.time()
+            if usage is not None:
+                if self._last_usage is not None and now > self._last_usage[0]:
+                    last_time, last_usage = self._last_usage
+                    stats["cgroup.cpu.percent"] = (
+                        (usage - last_usage) / (now - last_time) / cpu_limit * 100
+                    )
+                self._last_usage = (now, usage)
+        return stats
+
+
+@register_collector
+class TPUCollector(Collector):
+    name = "tpu"
+
+    def __init__(self, pid: int, interface: Optional[InterfaceQueue] = None) -> None:
+        super(TPUCollector, self).__init__(pid, interface)
+        self._tpu_profiler = None
+        if tpu.is_tpu_available():
+            try:
+                self._tpu_profiler = tpu.get_profiler()
+            except Exception as e:
+                wandb.termlog("Error initializing TPUProfiler: " + str(e))
+
+    def is_available(self) -> bool:
+        return self._tpu_profiler is not None
+
+    def start(self) -> None:
+        assert self._tpu_profiler is not None
+        self._tpu_profiler.start()
+
+    def stop(self) -> None:
+        assert self._tpu_profiler is not None
+        self._tpu_profiler.stop()
+
+    def sample(self) -> SampleDict:
+        assert self._tpu_profiler is not None
+        tpu_utilization = self._tpu_profiler.get_tpu_utilization()
+        if tpu_utilization is None:
+            return {}
+        return {"tpu": tpu_utilization}
+
+
+class _Aggregate(object):
+    __slots__ = ("count", "total", "min", "max", "last")
+
+    def __init__(self, value: float) -> None:
+        self.count = 1
+        self.total = self.min = self.max = self.last = value
+
+    def add(self, value: float) -> None:
+        self.count += 1
+        self.total += value
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        self.last = value
+
+    def get(self, aggregate: str) -> float:
+        if aggregate == "mean":
+            return self.total / self.count
+        return getattr(self, aggregate)  # type: ignore
+
+
+class SystemStats(object):
+
+    _pid: int
+    _interface: InterfaceQueue
+    _collectors: List[Collector]
+    sampler: Dict[Collector, Dict[str, _Aggregate]]
+    _thread: Optional[threading.Thread]
+    _collector_threads: List[threading.Thread]
+
+    def __init__(
+        self,
+        pid: int,
+        interface: InterfaceQueue,
+        collectors: Optional[Sequence[Collector]] = None,
+    ) -> None:
+        # self.run = run
+        self._pid = pid
+        self._interface = interface
+        if collectors is None:
+            collectors = [cls(pid=pid, interface=interface) for cls in _collectors]
+        self._collectors = [c for c in collectors if c.is_available()]
+        self.sampler = {}
+        self._lock = threading.Lock()
+        self._failed: Set[str] = set()
+        self._shutdown = threading.Event()
+        self._thread = None
+        self._collector_threads = []
+
+    def start(self) -> None:
+        if self._thread is not None:
+            return
+        self._shutdown.clear()
+        for collector in self._collectors:
+            collector.start()
+        self._thread = threading.Thread(target=self._thread_body)
+        self._thread.name = "StatsThr"
+        self._collector_threads = [
+            threading.Thread(
+                target=self._collector_body,
+                args=(collector,),
+                name="StatsThr-{}".format(collector.name),
+            )
+            for collector in self._collectors
+        ]
+        for thread in [self._thread] + self._collector_threads:
+            thread.daemon = True
+            thread.start()
+
+    @property
+    def proc(self) -> psutil.Process:
+        return psutil.Process(pid=self._pid)
+
+    @property
+    def sample_rate_seconds(self) -> float:
+        """Sample system stats every this many seconds, defaults to 2, min is 0.5"""
+        return 2
+        # return max(0.5, self._api.dynamic_settings["system_sample_seconds"])
+
+    @property
+    def samples_to_average(self) -> int:
+        """The number of samples to average before pushing, defaults to 15 valid range (2:30)"""
+        return 15
+        # return min(30, max(2, self._api.dynamic_settings["system_samples"]))
+
+    def _sample(self, collector: Collector) -> SampleDict:
+        try:
+            return collector.sample()
+        except Exception:
+            if collector.name not in self._failed:
+                self._failed.add(collector.name)
+                logger.exception("Error collecting %s stats", collector.name)
+            return {}
+
+    def _collect(self, collector: Collector) -> None:
+        """Takes one sample from `collector` and adds it to its aggregates"""
+        sample = self._sample(collector)
+        with self._lock:
+            aggregates = self.sampler.setdefault(collector, {})
+            for key, value in sample.items():
+                if key in aggregates:
+                    aggregates[key].add(value)
+                else:
+                    aggregates[key] = _Aggregate(value)
+
+    def _collector_body(self, collector: Collector) -> None:
+        while not self._shutdown.is_set():
+            start = time.time()
+            self._collect(collector)
+            self._shutdown.wait(max(0, collector.interval - (time.time() - start)))
+
+    def _thread_body(self) -> None:
+        flush_seconds = self.sample_rate_seconds * self.samples_to_average
+        while not self._shutdown.wait(flush_seconds):
+            self.flush()
+
+    def shutdown(self) -> None:
+        self._shutdown.set()
+        try:
+            if self._thread is not None:
+                self._thread.join()
+                # a collector stuck in a slow call only delays shutdown up to its interval
+                for collector, thread in zip(self._collectors, self._collector_threads):
+                    thread.join(timeout=collector.interval)
+                self.flush()
+        finally:
+            self._thread = None
+            self._collector_threads = []
+        for collector in self._collectors:
+            collector.stop()
+
+    def flush(self) -> None:
+        with self._lock:
+            sampler, self.sampler = self.sampler, {}
+        stats: StatsDict = {}
+        for collector, aggregates in sampler.items():
+            for key, aggregate in aggregates.items():
+                for i, name in enumerate(collector.get_aggregates(key)):
+                    value = aggregate.get(name)
+                    if isinstance(value, float):
+                        value = round(value, 2)
+                    stats[key if i == 0 else "{}.{}".format(key, name)] = value
+        # self.run.events.track("system", stats, _wandb=True)
+        if self._interface and stats:
+            self._interface.publish_stats(stats)
+
+    def stats(self) -> StatsDict:
+        """Takes one sample from every collector"""
+        stats: StatsDict = {}
+        for collector in self._collectors:
+            stats.update(self._sample(collector))
         return stats
@@ -11,6 +11,10 @@ from . import datastore
 
 logger = logging.getLogger(__name__)
 
+# records put on disk as soon as they are written, rather than on the next
+# debounce, since they mark where the run is in its lifecycle
+SYNC_RECORD_TYPES = ("run", "exit", "preempting", "final")
+
 
 class WriteManager(object):
     def __init__(
@@ -23,7 +27,7 @@ class WriteManager(object):
 
     def open(self):
         self._ds = datastore.DataStore()
-        self._ds.open_for_write(self._settings.sync_file)
+        self._ds.open_for_write(self._settings.sync_file, index=True)
 
     def write(self, record):
         if not self._ds:
@@ -33,10 +37,13 @@ class WriteManager(object):
         assert record_type
 
         self._ds.write(record)
+        if record_type in SYNC_RECORD_TYPES:
+            self._ds.flush(fsync=True)
 
     def finish(self):
         if self._ds:
             self._ds.close()
 
     def debounce(self) -> None:
-        pass
+        if self._ds:
+            self._ds.flush()
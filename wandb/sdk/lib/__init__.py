@@ -1,7 +1,14 @@
 #
+import types
+
 from . import lazyloader  # noqa: F401
 from .disabled import RunDisabled, SummaryDisabled
 
+
+def __getattr__(name: str) -> types.ModuleType:
+    return lazyloader.import_submodule(__name__, name)
+
+
 __all__ = [
     "RunDisabled",
     "SummaryDisabled",
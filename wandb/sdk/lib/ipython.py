@@ -20,6 +20,10 @@ def toggle_button(what="run"):
 
 
 def _get_python_type():
+    # We can only be running under IPython if it's already been imported,
+    # and importing it just to check is slow.
+    if "IPython" not in sys.modules:
+        return "python"
     try:
         from IPython import get_ipython  # type: ignore
 
@@ -10,6 +10,7 @@ from __future__ import print_function
 from __future__ import unicode_literals
 
 import importlib
+import importlib.util
 import sys
 import types
 
@@ -70,3 +71,23 @@ class LazyLoader(types.ModuleType):
         # print("dir")
         module = self._load()
         return dir(module)
+
+
+def import_submodule(package: str, name: str) -> types.ModuleType:
+    """Import the submodule `name` of `package` when it's first accessed.
+
+    Meant to be called from a package's module `__getattr__`, so that its
+    submodules are still attributes of it when `import wandb` hasn't imported
+    them yet. Raises AttributeError if there's no such submodule, or if it
+    can't be imported because a dependency of it isn't installed, so that
+    `hasattr` and `getattr` with a default keep working.
+    """
+    fullname = "{}.{}".format(package, name)
+    if name.startswith("__") or importlib.util.find_spec(fullname) is None:
+        raise AttributeError("module {!r} has no attribute {!r}".format(package, name))
+    try:
+        return importlib.import_module(fullname)
+    except ImportError as e:
+        raise AttributeError(
+            "module {!r} has no attribute {!r} ({})".format(package, name, e)
+        ) from e
@@ -6,7 +6,9 @@ try:
 except ImportError:  # windows
     pty = tty = termios = fcntl = None  # type: ignore
 
-from collections import defaultdict
+import abc
+import codecs
+from collections import defaultdict, deque
 import itertools
 import logging
 import os
@@ -17,40 +19,9 @@ import sys
 import threading
 import time
 
-from six.moves import queue
+import six
 import wandb
-
-
-class _Numpy:  # fallback in case numpy is not available
-    def where(self, x):
-        return ([i for i in range(len(x)) if x[i]],)
-
-    def diff(self, x):
-        return [x[i + 1] - x[i] for i in range(len(x) - 1)]
-
-    def arange(self, x):
-        class Arr(list):
-            def __getitem__(self, s):
-                if isinstance(s, slice):
-                    self._start = s.start
-                    return self
-                return super(Arr, self).__getitem__(s)
-
-            def __getslice__(self, i, j):
-                self._start = i
-                return self
-
-            def __iadd__(self, i):  # type: ignore
-                for j in range(self._start, len(self)):
-                    self[j] += i
-
-        return Arr(range(x))
-
-
-try:
-    import numpy as np  # type: ignore
-except ImportError:
-    np = _Numpy()
+from wandb import env
 
 
 logger = logging.getLogger("wandb")
@@ -63,11 +34,13 @@ ANSI_OSC_RE = re.compile("\001?\033\\]([^\a]*)(\a)\002?")
 
 _LAST_WRITE_TOKEN = b"L@stWr!t3T0k3n"
 
-SEP_RE = re.compile(
-    "\r|\n|"
-    # Unprintable ascii characters:
-    + "|".join([chr(i) for i in range(2 ** 8) if repr(chr(i)).startswith("'\\x")])
+# Unprintable ascii characters:
+_UNPRINTABLE = "|".join(
+    [chr(i) for i in range(2 ** 8) if repr(chr(i)).startswith("'\\x")]
 )
+SEP_RE = re.compile("\r|\n|" + _UNPRINTABLE)
+# Separators other than newlines; text without them takes a fast path
+NON_NEWLINE_SEP_RE = re.compile("\r|" + _UNPRINTABLE)
 
 ANSI_FG = list(map(str, itertools.chain(range(30, 40), range(90, 98))))
 ANSI_BG = list(map(str, itertools.chain(range(40, 50), range(100, 108))))
@@ -169,8 +142,143 @@ class Char(object):
                 return False
         return True
 
+    def style(self):
+        """Returns every attribute but `data` as a hashable tuple"""
+        return (
+            self.fg,
+            self.bg,
+            self.bold,
+            self.italics,
+            self.underscore,
+            self.blink,
+            self.strikethrough,
+            self.reverse,
+        )
+
 
 _defchar = Char()
+_defstyle = _defchar.style()
+
+
+def _style_codes(prev, style):
+    """ANSI codes switching the style of the following characters from `prev` to `style`"""
+    codes = []
+    if style[0] != prev[0]:
+        codes.append(_get_char(style[0]))
+    if style[1] != prev[1]:
+        codes.append(_get_char(style[1]))
+    for k, on, prev_on in zip(Char.__slots__[3:], style[2:], prev[2:]):
+        if on != prev_on:
+            codes.append(_get_char(ANSI_STYLES_REV[k if on else "/" + k]))
+    return "".join(codes)
+
+
+class Line(object):
+    """
+    A single line of the terminal, stored as a string and a run-length encoded list of styles.
+
+    `runs` is a list of [end, style] pairs in increasing `end` order: characters of `text` before
+    the first `end` have the first style, and so on. Adjacent runs never share a style.
+    """
+
+    __slots__ = ("text", "runs")
+
+    def __init__(self, text="", style=_defstyle):
+        self.text = text
+        self.runs = [[len(text), style]] if text else []
+
+    def write(self, x, data, style):
+        """Overwrites the line with `data` starting at column `x`"""
+        if not data:
+            return
+        text = self.text
+        end = x + len(data)
+        if x > len(text):
+            self._set_style(len(text), x, _defstyle)
+            text += " " * (x - len(text))
+        self.text = text[:x] + data + text[end:]
+        self._set_style(x, end, style)
+
+    def erase(self, start, end=None):
+        """Resets columns `start` to `end` (or the end of the line) to blank default characters"""
+        if end is None or end >= len(self.text):
+            self.text = self.text[:start]
+            self._truncate_runs(start)
+        elif start < end:
+            self.write(start, " " * (end - start), _defstyle)
+
+    def _truncate_runs(self, end):
+        runs = self.runs
+        while runs and (len(runs) > 1 and runs[-2][0] >= end):
+            runs.pop()
+        if not end:
+            del runs[:]
+        elif runs:
+            runs[-1][0] = min(runs[-1][0], end)
+
+    def _set_style(self, start, end, style):
+        runs = self.runs
+        if not runs or start >= runs[-1][0]:
+            # appending, the common case
+            if runs and runs[-1][1] == style:
+                runs[-1][0] = end
+            else:
+                runs.append([end, style])
+            return
+        new_runs = []
+        run_start = 0
+        inserted = False
+        for run_end, run_style in runs:
+            if run_end <= start:
+                new_runs.append([run_end, run_style])
+            else:
+                if run_start < start:
+                    new_runs.append([start, run_style])
+                if not inserted:
+                    new_runs.append([end, style])
+                    inserted = True
+                if run_end > end:
+                    new_runs.append([run_end, run_style])
+            run_start = run_end
+        if not inserted:
+            new_runs.append([end, style])
+        self.runs = [new_runs[0]]
+        for run in new_runs[1:]:
+            if run[1] == self.runs[-1][1]:
+                self.runs[-1][0] = run[0]
+            else:
+                self.runs.append(run)
+
+    def __len__(self):
+        """Length of the line, ignoring trailing blank default characters"""
+        runs = self.runs
+        for i in range(len(runs) - 1, -1, -1):
+            end, style = runs[i]
+            if style != _defstyle:
+                return end
+            start = runs[i - 1][0] if i else 0
+            stripped = len(self.text[start:end].rstrip(" "))
+            if stripped:
+                return start + stripped
+        return 0
+
+    def render(self, length=None):
+        """Returns the first `length` characters of the line with the ANSI codes needed to style them"""
+        if length is None:
+            length = len(self)
+        text = self.text
+        out = []
+        prev = _defstyle
+        start = 0
+        for end, style in self.runs:
+            if start >= length:
+                break
+            if style != prev:
+                out.append(_style_codes(prev, style))
+                prev = style
+            out.append(text[start : min(end, length)])
+            start = end
+        return "".join(out)
 
 
 class Cursor(object):
@@ -194,14 +302,15 @@ class Cursor(object):
 
 class TerminalEmulator(object):
     """
-    An FSM emulating a terminal. Characters are stored in a 2D matrix (buffer) indexed by the cursor.
+    An FSM emulating a terminal. Text is stored in a buffer of `Line`s indexed by the cursor's row.
     """
 
     _MAX_LINES = 100
 
     def __init__(self):
-        self.buffer = defaultdict(lambda: defaultdict(lambda: _defchar))
+        self.buffer = defaultdict(Line)
         self.cursor = Cursor()
+        self._style = None  # Cache of self.cursor.char.style()
         self._num_lines = None  # Cache
 
         # For diffing:
@@ -242,14 +351,7 @@ class TerminalEmulator(object):
     def _get_line_len(self, n):
         if n not in self.buffer:
             return 0
-        line = self.buffer[n]
-        if not line:
-            return 0
-        n = max(line.keys())
-        for i in range(n, -1, -1):
-            if line[i] != _defchar:
-                return i + 1
-        return 0
+        return len(self.buffer[n])
 
     @property
     def num_lines(self):
@@ -267,7 +369,7 @@ class TerminalEmulator(object):
 
     def display(self):
         return [
-            [self.buffer[i][j].data for j in range(self._get_line_len(i))]
+            list(self.buffer[i].text[: self._get_line_len(i)])
             for i in range(self.num_lines)
         ]
 
@@ -288,15 +390,11 @@ class TerminalEmulator(object):
     def erase_line(self, mode=0):
         curr_line = self.buffer[self.cursor.y]
         if mode == 0:
-            for i in range(self.cursor.x, self._get_line_len(self.cursor.y)):
-                if i in curr_line:
-                    del curr_line[i]
+            curr_line.erase(self.cursor.x)
         elif mode == 1:
-            for i in range(self.cursor.x + 1):
-                if i in curr_line:
-                    del curr_line[i]
+            curr_line.erase(0, self.cursor.x + 1)
         else:
-            curr_line.clear()
+            curr_line.erase(0)
 
     def insert_lines(self, n=1):
         for i in range(self.num_lines - 1, self.cursor.y, -1):
@@ -306,15 +404,25 @@ class TerminalEmulator(object):
                 del self.buffer[i]
 
     def _write_plain_text(self, plain_text):
-        self.buffer[self.cursor.y].update(
-            [
-                (self.cursor.x + i, self.cursor.char.copy(data=c))
-                for i, c in enumerate(plain_text)
-            ]
-        )
+        if not plain_text:
+            return
+        if self._style is None:
+            self._style = self.cursor.char.style()
+        if self.cursor.x == 0 and self.cursor.y not in self.buffer:
+            # fresh line, e.g. plain newline terminated output
+            self.buffer[self.cursor.y] = Line(plain_text, self._style)
+        else:
+            self.buffer[self.cursor.y].write(self.cursor.x, plain_text, self._style)
         self.cursor.x += len(plain_text)
 
     def _write_text(self, text):
+        if not NON_NEWLINE_SEP_RE.search(text):
+            lines = text.split("\n")
+            for line in lines[:-1]:
+                self._write_plain_text(line)
+                self.linefeed()
+            self._write_plain_text(lines[-1])
+            return
         prev_end = 0
         for match in SEP_RE.finditer(text):
             start, end = match.span()
@@ -336,6 +444,9 @@ class TerminalEmulator(object):
 
     def write(self, data):
         self._num_lines = None  # invalidate cache
+        if "\033" not in data:
+            self._write_text(data)
+            return
         data = self._remove_osc(data)
         prev_end = 0
         for match in ANSI_CSI_RE.finditer(data):
@@ -348,6 +459,7 @@ class TerminalEmulator(object):
         self._write_text(data[prev_end:])
 
     def _handle_csi(self, csi, params, command):
+        self._style = None
         try:
             if command == "m":
                 p = params.split(";")[0]
@@ -399,48 +511,9 @@ class TerminalEmulator(object):
             pass
 
     def _get_line(self, n):
-        line = self.buffer[n]
-        line_len = self._get_line_len(n)
-        # We have to loop through each character in the line and check if foreground, background and
-        # other attributes (italics, bold, underline, etc) of the ith character are different from those of the
-        # (i-1)th character. If different, the appropriate ascii character for switching the color/attribute
-        # should be appended to the output string before appending the actual character. This loop and subsequent
-        # checks can be expensive, especially because 99% of terminal output use default colors and formatting. Even
-        # in outputs that do contain colors and styles, its unlikely that they will change on a per character basis.
-
-        # So instead we create a character list without any ascii codes (`out`), and a list of all the foregrounds
-        # in the line (`fgs`) on which we call np.diff() and np.where() to find the indices where the foreground change,
-        # and insert the ascii characters in the output list (`out`) on those indices. All of this is the done ony if
-        # there are more than 1 foreground color in the line in the first place (`if len(set(fgs)) > 1 else None`).
-        # Same logic is repeated for background colors and other attributes.
-
-        out = [line[i].data for i in range(line_len)]
-
-        # for dynamic insert using original indices
-        idxs = np.arange(line_len)
-        insert = lambda i, c: (out.insert(idxs[i], c), idxs[i:].__iadd__(1))  # noqa
-
-        fgs = [int(_defchar.fg)] + [int(line[i].fg) for i in range(line_len)]
-        [
-            insert(i, _get_char(line[int(i)].fg)) for i in np.where(np.diff(fgs))[0]
-        ] if len(set(fgs)) > 1 else None
-        bgs = [int(_defchar.bg)] + [int(line[i].bg) for i in range(line_len)]
-        [
-            insert(i, _get_char(line[int(i)].bg)) for i in np.where(np.diff(bgs))[0]
-        ] if len(set(bgs)) > 1 else None
-        attrs = {
-            k: [False] + [line[i][k] for i in range(line_len)]
-            for k in Char.__slots__[3:]
-        }
-        [
-            [
-                insert(i, _get_char(ANSI_STYLES_REV[k if line[int(i)][k] else "/" + k]))
-                for i in np.where(np.diff(v))[0]
-            ]
-            for k, v in attrs.items()
-            if any(v)
-        ]
-        return "".join(out)
+        # Styles are stored once per run of characters, so ANSI codes only need to be emitted
+        # between runs rather than checked for each character.
+        return self.buffer[n].render(self._get_line_len(n))
 
     def read(self):
         num_lines = self.num_lines
@@ -473,7 +546,7 @@ class TerminalEmulator(object):
             shift = num_lines - self._MAX_LINES
             for i in range(shift, num_lines):
                 self.buffer[i - shift] = self.buffer[i]
-            for i in range(self._MAX_LINES, max(self.buffer.keys())):
+            for i in range(self._MAX_LINES, max(self.buffer.keys()) + 1):
                 if i in self.buffer:
                     del self.buffer[i]
             self.cursor.y -= min(self.cursor.y, shift)
@@ -484,20 +557,77 @@ class TerminalEmulator(object):
 
 
 _MIN_CALLBACK_INTERVAL = 2  # seconds
+# Captured output waiting to be emulated is capped, dropping the oldest writes past this size
+_MAX_BUFFERED_OUTPUT = 32 * 1024 * 1024
+# Output left over when the redirect is stopped is logged unprocessed past this size (chars or bytes)
+_MAX_FINAL_EMULATOR_WRITE = 10 * 1024 * 1024
+
 
+class _OutputBuffer(object):
+    """
+    Bounded buffer of captured writes. Any thread can `put`, a single consumer drains everything
+    pending at once with `get`. The consumer is only notified if it is waiting, so writes from
+    the user's thread just append under a lock.
+    """
 
+    def __init__(self, max_size=_MAX_BUFFERED_OUTPUT):
+        self._max_size = max_size
+        self._chunks = deque()
+        self._size = 0
+        self._cond = threading.Condition(threading.Lock())
+        self._waiting = False
+        self.dropped = 0
+        self.stopped = threading.Event()
+
+    def put(self, data):
+        with self._cond:
+            self._chunks.append(data)
+            self._size += len(data)
+            while self._size > self._max_size and len(self._chunks) > 1:
+                self._size -= len(self._chunks.popleft())
+                self.dropped += 1
+            if self._waiting:
+                self._cond.notify()
+
+    def get(self, timeout=None):
+        """
+        Waits up to `timeout` seconds (forever if None) for data or `stop()`.
+        Returns (chunks, stopped). Once stopped is True, no more data will arrive.
+        """
+        with self._cond:
+            if not self._chunks and not self.stopped.is_set():
+                self._waiting = True
+                self._cond.wait(timeout)
+                self._waiting = False
+            chunks = list(self._chunks)
+            self._chunks.clear()
+            self._size = 0
+            return chunks, self.stopped.is_set()
+
+    def stop(self):
+        with self._cond:
+            self.stopped.set()
+            self._cond.notify()
+
+
+@six.add_metaclass(abc.ABCMeta)
 class RedirectBase(object):
-    def __init__(self, src, cbs=()):
+    def __init__(self, src, cbs=(), flush_interval=None):
         """
         # Arguments
 
         `src`: Source stream to be redirected. "stdout" or "stderr".
         `cbs`: tuple/list of callbacks. Each callback should take exactly 1 argument (bytes).
+        `flush_interval`: Seconds between calls to the callbacks while running. Defaults to
+            WANDB_CONSOLE_FLUSH_INTERVAL, or 2.
 
         """
         assert hasattr(sys, src)
         self.src = src
         self.cbs = cbs
+        if flush_interval is None:
+            flush_interval = env.get_console_flush_interval(_MIN_CALLBACK_INTERVAL)
+        self.flush_interval = flush_interval
 
     @property
     def src_stream(self):
@@ -522,6 +652,63 @@ class RedirectBase(object):
             return
         _redirects[self.src] = None
 
+    def _start_emulator_thread(self):
+        self._buffer = _OutputBuffer()
+        # Offline runs only need the final state of the console
+        self._periodic_flush = not wandb.run or wandb.run._settings.mode == "online"
+        self._emulator_write_thread = threading.Thread(target=self._emulator_write)
+        self._emulator_write_thread.daemon = True
+        self._emulator_write_thread.start()
+
+    def _emulator_write(self):
+        """
+        Feeds captured output to the emulator as it arrives and flushes it every `flush_interval`.
+        Returns once the buffer is stopped and drained.
+        """
+        last_flush = time.time()
+        while True:
+            timeout = None
+            if self._periodic_flush:
+                timeout = max(0, last_flush + self.flush_interval - time.time())
+            data, stopped = self._buffer.get(timeout)
+            if self._buffer.dropped:
+                logger.warning(
+                    "Dropped %d writes to %s, console output is arriving faster than it can be processed",
+                    self._buffer.dropped,
+                    self.src,
+                )
+                self._buffer.dropped = 0
+            if stopped and sum(map(len, data)) > _MAX_FINAL_EMULATOR_WRITE:
+                wandb.termlog("Terminal output too large. Logging without processing.")
+                self.flush()
+                for i, chunk in enumerate(data):
+                    text = self._decode([chunk], final=i == len(data) - 1)
+                    self.flush(text.encode("utf-8"))
+                return
+            if data or stopped:
+                text = self._decode(data, final=stopped)
+                try:
+                    self._emulator.write(text)
+                except Exception:
+                    logger.exception(
+                        "Failed to process %s output, logging it unprocessed", self.src
+                    )
+                    self.flush()
+                    self.flush(text.encode("utf-8"))
+            if stopped:
+                return
+            if self._periodic_flush and time.time() - last_flush >= self.flush_interval:
+                self.flush()
+                last_flush = time.time()
+
+    @abc.abstractmethod
+    def _decode(self, chunks, final=False):
+        """
+        Joins captured chunks into the text given to the emulator. Input split mid-character is
+        held back until the next call; `final` is set on the last call once the redirect stops.
+        """
+        raise NotImplementedError
+
 
 class _WrappedStream(object):
     """
@@ -541,35 +728,15 @@ class StreamWrapper(RedirectBase):
     Patches the write method of current sys.stdout/sys.stderr
     """
 
-    def __init__(self, src, cbs=()):
-        super(StreamWrapper, self).__init__(src=src, cbs=cbs)
+    def __init__(self, src, cbs=(), flush_interval=None):
+        super(StreamWrapper, self).__init__(
+            src=src, cbs=cbs, flush_interval=flush_interval
+        )
         self._installed = False
         self._emulator = TerminalEmulator()
 
-    def _emulator_write(self):
-        while True:
-            if self._queue.empty():
-                if self._stopped.is_set():
-                    return
-                time.sleep(0.5)
-                continue
-            data = []
-            while not self._queue.empty():
-                data.append(self._queue.get())
-            if self._stopped.is_set() and sum(map(len, data)) > 100000:
-                wandb.termlog("Terminal output too large. Logging without processing.")
-                self.flush()
-                [self.flush(line.encode("utf-8")) for line in data]
-                return
-            try:
-                self._emulator.write("".join(data))
-            except Exception:
-                pass
-
-    def _callback(self):
-        while not (self._stopped.is_set() and self._queue.empty()):
-            self.flush()
-            time.sleep(_MIN_CALLBACK_INTERVAL)
+    def _decode(self, chunks, final=False):
+        return "".join(chunks)
 
     def install(self):
         super(StreamWrapper, self).install()
@@ -580,9 +747,12 @@ class StreamWrapper(RedirectBase):
         self._prev_callback_timestamp = time.time()
         self._old_write = old_write
 
+        self._start_emulator_thread()
+        put = self._buffer.put
+
         def write(data):
             self._old_write(data)
-            self._queue.put(data)
+            put(data)
 
         if sys.version_info[0] > 2:
             stream.write = write
@@ -590,17 +760,6 @@ class StreamWrapper(RedirectBase):
             self._old_stream = stream
             setattr(sys, self.src, _WrappedStream(stream, write))
 
-        self._queue = queue.Queue()
-        self._stopped = threading.Event()
-        self._emulator_write_thread = threading.Thread(target=self._emulator_write)
-        self._emulator_write_thread.daemon = True
-        self._emulator_write_thread.start()
-
-        if not wandb.run or wandb.run._settings.mode == "online":
-            self._callback_thread = threading.Thread(target=self._callback)
-            self._callback_thread.daemon = True
-            self._callback_thread.start()
-
         self._installed = True
 
     def flush(self, data=None):
@@ -624,7 +783,7 @@ class StreamWrapper(RedirectBase):
         else:
             setattr(sys, self.src, self._old_stream)
 
-        self._stopped.set()
+        self._buffer.stop()
         self._emulator_write_thread.join(timeout=5)
         if self._emulator_write_thread.is_alive():
             wandb.termlog("Processing terminal ouput (%s)..." % self.src)
@@ -688,8 +847,8 @@ class Redirect(RedirectBase):
     Redirects low level file descriptors.
     """
 
-    def __init__(self, src, cbs=()):
-        super(Redirect, self).__init__(src=src, cbs=cbs)
+    def __init__(self, src, cbs=(), flush_interval=None):
+        super(Redirect, self).__init__(src=src, cbs=cbs, flush_interval=flush_interval)
         self._installed = False
         self._emulator = TerminalEmulator()
 
@@ -711,18 +870,13 @@ class Redirect(RedirectBase):
         self._orig_src = os.fdopen(self._orig_src_fd, "wb", 0)
         os.dup2(self._pipe_write_fd, self.src_fd)
         self._installed = True
-        self._queue = queue.Queue()
         self._stopped = threading.Event()
+        # pipe reads can split a multibyte character, keep its start for the next drain
+        self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self._start_emulator_thread()
         self._pipe_relay_thread = threading.Thread(target=self._pipe_relay)
         self._pipe_relay_thread.daemon = True
         self._pipe_relay_thread.start()
-        self._emulator_write_thread = threading.Thread(target=self._emulator_write)
-        self._emulator_write_thread.daemon = True
-        self._emulator_write_thread.start()
-        if not wandb.run or wandb.run._settings.mode == "online":
-            self._callback_thread = threading.Thread(target=self._callback)
-            self._callback_thread.daemon = True
-            self._callback_thread.start()
 
     def uninstall(self):
         if not self._installed:
@@ -744,6 +898,7 @@ class Redirect(RedirectBase):
         t.start()
         t.join(timeout=10)
 
+        self._buffer.stop()
         self._emulator_write_thread.join(timeout=5)
         if self._emulator_write_thread.is_alive():
             wandb.termlog("Processing terminal ouput (%s)..." % self.src)
@@ -767,10 +922,8 @@ class Redirect(RedirectBase):
                 except Exception:
                     pass  # TODO(frz)
 
-    def _callback(self):
-        while not self._stopped.is_set():
-            self.flush()
-            time.sleep(_MIN_CALLBACK_INTERVAL)
+    def _decode(self, chunks, final=False):
+        return self._decoder.decode(b"".join(chunks), final)
 
     def _pipe_relay(self):
         while True:
@@ -794,28 +947,8 @@ class Redirect(RedirectBase):
                 if i is not None:  # python 3 w/ unbuffered i/o: we need to keep writing
                     while i < len(data):
                         i += self._orig_src.write(data[i:])
-                self._queue.put(data)
+                self._buffer.put(data)
                 if brk:
                     return
             except OSError:
                 return
-
-    def _emulator_write(self):
-        while True:
-            if self._queue.empty():
-                if self._stopped.is_set():
-                    return
-                time.sleep(0.5)
-                continue
-            data = []
-            while not self._queue.empty():
-                data.append(self._queue.get())
-            if self._stopped.is_set() and sum(map(len, data)) > 100000:
-                wandb.termlog("Terminal output too large. Logging without processing.")
-                self.flush()
-                [self.flush(line) for line in data]
-                return
-            try:
-                self._emulator.write(b"".join(data).decode("utf-8"))
-            except Exception:
-                pass
@@ -26,10 +26,8 @@ from six.moves.urllib.parse import quote, urlparse
 import wandb
 from wandb import env
 from wandb import util
-from wandb.apis import InternalApi, PublicApi
-from wandb.apis.public import Artifact as PublicArtifact
+from wandb.apis import InternalApi
 from wandb.compat import tempfile as compat_tempfile
-import wandb.data_types as data_types
 from wandb.errors import CommError
 from wandb.errors.term import termlog, termwarn
 
@@ -52,6 +50,8 @@ from .interface.artifacts import (  # noqa: F401 pylint: disable=unused-import
 if TYPE_CHECKING:
     import google.cloud.storage as gcs_module  # type: ignore
     import boto3  # type: ignore
+    from wandb.apis.public import Api as PublicApi
+    import wandb.data_types as data_types
     import wandb.filesync.step_prepare.StepPrepare as StepPrepare  # type: ignore
 
 # This makes the first sleep 1s, and then doubles it up to total times,
@@ -70,7 +70,7 @@ ARTIFACT_TMP = compat_tempfile.TemporaryDirectory("wandb-artifacts")
 
 
 class _AddedObj(object):
-    def __init__(self, entry: ArtifactEntry, obj: data_types.WBValue):
+    def __init__(self, entry: ArtifactEntry, obj: "data_types.WBValue"):
         self.entry = entry
         self.obj = obj
 
@@ -454,7 +454,7 @@ class Artifact(ArtifactInterface):
 
         return manifest_entries
 
-    def add(self, obj: data_types.WBValue, name: str) -> ArtifactEntry:
+    def add(self, obj: "data_types.WBValue", name: str) -> ArtifactEntry:
         self._ensure_can_add()
 
         # This is a "hack" to automatically rename tables added to
@@ -462,6 +462,8 @@ class Artifact(ArtifactInterface):
         # TODO: figure out a more appropriate convention.
         is_tmp_name = name.startswith("media/tables")
 
+        from wandb import data_types
+
         # Validate that the object is one of the correct wandb.Media types
         # TODO: move this to checking subclass of wandb.Media once all are
         # generally supported
@@ -543,7 +545,7 @@ class Artifact(ArtifactInterface):
             "Cannot load paths from an artifact before it has been logged or in offline mode"
         )
 
-    def get(self, name: str) -> data_types.WBValue:
+    def get(self, name: str) -> "data_types.WBValue":
         if self._logged_artifact:
             return self._logged_artifact.get(name)
 
@@ -703,10 +705,10 @@ class Artifact(ArtifactInterface):
         self._added_local_paths[path] = entry
         return entry
 
-    def __setitem__(self, name: str, item: data_types.WBValue) -> ArtifactEntry:
+    def __setitem__(self, name: str, item: "data_types.WBValue") -> ArtifactEntry:
         return self.add(item, name)
 
-    def __getitem__(self, name: str) -> Optional[data_types.WBValue]:
+    def __getitem__(self, name: str) -> Optional["data_types.WBValue"]:
         return self.get(name)
 
 
@@ -1747,7 +1749,7 @@ class HTTPHandler(StorageHandler):
 class WBArtifactHandler(StorageHandler):
     """Handles loading and storing Artifact reference-type files"""
 
-    _client: Optional[PublicApi]
+    _client: Optional["PublicApi"]
 
     def __init__(self) -> None:
         self._scheme = "wandb-artifact"
@@ -1764,9 +1766,11 @@ class WBArtifactHandler(StorageHandler):
         return self._scheme
 
     @property
-    def client(self) -> PublicApi:
+    def client(self) -> "PublicApi":
         if self._client is None:
-            self._client = PublicApi()
+            from wandb.apis import public
+
+            self._client = public.Api()
         return self._client
 
     def load_path(
@@ -1792,11 +1796,13 @@ class WBArtifactHandler(StorageHandler):
         # rely on the dep_artifact entry's download() method to do its own cache
         # check.
 
+        from wandb.apis import public
+
         # Parse the reference path and download the artifact if needed
         artifact_id = util.host_from_path(manifest_entry.ref)
         artifact_file_path = util.uri_from_path(manifest_entry.ref)
 
-        dep_artifact = PublicArtifact.from_id(
+        dep_artifact = public.Artifact.from_id(
             util.hex_to_b64_id(artifact_id), self.client
         )
         link_target_path: str
@@ -1830,11 +1836,13 @@ class WBArtifactHandler(StorageHandler):
             (list[ArtifactManifestEntry]): A list of manifest entries to store within the artifact
         """
 
+        from wandb.apis import public
+
         # Recursively resolve the reference until a concrete asset is found
         while path is not None and urlparse(path).scheme == self._scheme:
             artifact_id = util.host_from_path(path)
             artifact_file_path = util.uri_from_path(path)
-            target_artifact = PublicArtifact.from_id(
+            target_artifact = public.Artifact.from_id(
                 util.hex_to_b64_id(artifact_id), self.client
             )
 
@@ -1861,7 +1869,7 @@ class WBArtifactHandler(StorageHandler):
 class WBLocalArtifactHandler(StorageHandler):
     """Handles loading and storing Artifact reference-type files"""
 
-    _client: Optional[PublicApi]
+    _client: Optional["PublicApi"]
 
     def __init__(self) -> None:
         self._scheme = "wandb-client-artifact"
@@ -17,8 +17,6 @@ By default, Summary is set to the final value of History.
 
 import time
 
-from wandb.wandb_torch import TorchHistory
-
 
 class History(object):
     """Time series data for Runs. This is essentially a list of dicts where each
@@ -49,6 +47,8 @@ class History(object):
         self._step = self._run.starting_step
 
     def _flush(self):
+        if self._torch:
+            self._torch._flush_tensor_stats()
         if len(self._data) > 0:
             self._data["_step"] = self._step
             self._data["_runtime"] = int(
@@ -69,5 +69,7 @@ class History(object):
     @property
     def torch(self):
         if self._torch is None:
+            from wandb.wandb_torch import TorchHistory
+
             self._torch = TorchHistory(self)
         return self._torch
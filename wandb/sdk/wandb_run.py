@@ -44,8 +44,7 @@ import wandb
 from wandb import errors
 from wandb import trigger
 from wandb._globals import _datatypes_set_callback
-from wandb.apis import internal, public
-from wandb.apis.public import Api as PublicApi
+from wandb.apis import internal
 from wandb.proto.wandb_internal_pb2 import (
     FilePusherStats,
     MetricRecord,
@@ -93,6 +92,7 @@ from .wandb_settings import Settings, SettingsConsole
 from .wandb_setup import _WandbSetup
 
 if TYPE_CHECKING:
+    from wandb.apis.public import Api as PublicApi
     from .data_types import WBValue
     from .wandb_alerts import AlertLevel
 
@@ -2401,6 +2401,8 @@ class Run(object):
             elif ":" in use_as or "/" in use_as:
                 raise ValueError("use_as cannot contain special characters ':' or '/'")
             self._used_artifact_slots.append(use_as)
+        from wandb.apis import public
+
         r = self._run_obj
         api = internal.Api(default_settings={"entity": r.entity, "project": r.project})
         api.set_current_run_id(self.id)
@@ -2648,7 +2650,9 @@ class Run(object):
             )
         return artifact
 
-    def _public_api(self) -> PublicApi:
+    def _public_api(self) -> "PublicApi":
+        from wandb.apis import public
+
         overrides = {"run": self.id}
         run_obj = self._run_obj
         if run_obj is not None:
@@ -2659,6 +2663,8 @@ class Run(object):
     # TODO(jhr): annotate this
     def _assert_can_log_artifact(self, artifact) -> None:  # type: ignore
         if not self._settings._offline:
+            from wandb.apis import public
+
             try:
                 public_api = self._public_api()
                 expected_type = public.Artifact.expected_type(
@@ -2796,6 +2802,8 @@ def restore(
         wandb.CommError: if we can't connect to the wandb backend
         ValueError: if the file is not found or can't find run_path
     """
+    from wandb.apis import public
+
     is_disabled = wandb.run is not None and wandb.run.disabled
     run = None if is_disabled else wandb.run
     if run_path is None:
@@ -2858,11 +2866,11 @@ except AttributeError:
 
 class _LazyArtifact(ArtifactInterface):
 
-    _api: PublicApi
+    _api: "PublicApi"
     _instance: Optional[ArtifactInterface] = None
     _future: Any
 
-    def __init__(self, api: PublicApi, future: Any):
+    def __init__(self, api: "PublicApi", future: Any):
         self._api = api
         self._future = future
 
@@ -2882,6 +2890,8 @@ class _LazyArtifact(ArtifactInterface):
             resp = self._future.get().response.log_artifact_response
             if resp.error_message:
                 raise ValueError(resp.error_message)
+            from wandb.apis import public
+
             self._instance = public.Artifact.from_id(resp.artifact_id, self._api.client)
         assert isinstance(
             self._instance, ArtifactInterface
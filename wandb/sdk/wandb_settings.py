@@ -24,7 +24,6 @@ Override priorities are in the reverse order of non-override settings
 import configparser
 import copy
 from datetime import datetime
-from distutils.util import strtobool
 import enum
 import getpass
 import itertools
@@ -59,6 +58,7 @@ from typing import (
 import six
 import wandb
 from wandb import util
+from wandb.env import strtobool
 from wandb.errors import UsageError
 from wandb.sdk.wandb_config import Config
 from wandb.sdk.wandb_setup import _EarlyLogger
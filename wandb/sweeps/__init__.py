@@ -1,4 +1,5 @@
 from .run import next_run, next_runs, stop_runs, SweepRun, RunState  # noqa
 from .config import SweepConfig, schema_violations_from_proposed_config  # noqa
+from .hyperband_stopping import HyperbandState  # noqa
 
 __version__ = "0.0.6"
@@ -8,6 +8,7 @@ from .config.schema import fill_validate_metric
 from .run import SweepRun, RunState
 from .params import HyperParameter, HyperParameterSet
 from sklearn import gaussian_process as sklearn_gaussian
+from scipy import linalg as scipy_linalg
 from scipy import stats as scipy_stats
 
 from ._types import floating, integer, ArrayLike
@@ -57,18 +58,16 @@ def sigmoid(x: ArrayLike) -> ArrayLike:
 
 
 def random_sample(X_bounds: ArrayLike, num_test_samples: integer) -> ArrayLike:
-    num_hyperparameters = len(X_bounds)
-    test_X = np.empty((int(num_test_samples), num_hyperparameters))
-    for ii in range(num_test_samples):
-        for jj in range(num_hyperparameters):
-            if type(X_bounds[jj][0]) == int:
-                assert type(X_bounds[jj][1]) == int
-                test_X[ii, jj] = np.random.randint(X_bounds[jj][0], X_bounds[jj][1])
-            else:
-                test_X[ii, jj] = (
-                    np.random.uniform() * (X_bounds[jj][1] - X_bounds[jj][0])
-                    + X_bounds[jj][0]
-                )
+    num_test_samples = int(num_test_samples)
+    bounds = np.asarray(X_bounds, dtype=float).reshape(-1, 2)
+    low, high = bounds[:, 0], bounds[:, 1]
+    test_X = (
+        np.random.uniform(size=(num_test_samples, len(bounds))) * (high - low) + low
+    )
+    for jj, (int_low, int_high) in enumerate(X_bounds):
+        if type(int_low) == int:
+            assert type(int_high) == int
+            test_X[:, jj] = np.random.randint(int_low, int_high, size=num_test_samples)
     return test_X
 
 
@@ -164,6 +163,21 @@ def filter_nans(sample_X: ArrayLike, sample_y: ArrayLike) -> ArrayLike:
     return sample_X, sample_y
 
 
+def _improvement(
+    y_pred: ArrayLike, y_pred_std: ArrayLike, min_norm_y: floating
+) -> Tuple[ArrayLike, ArrayLike]:
+    """Probability of improvement and expected improvement over min_norm_y."""
+    # hack for dealing with predicted std of 0
+    epsilon = 0.00000001
+
+    Z = -(y_pred - min_norm_y) / (y_pred_std + epsilon)
+    prob_of_improve: np.ndarray = scipy_stats.norm.cdf(Z)
+    e_i = -(y_pred - min_norm_y) * scipy_stats.norm.cdf(
+        Z
+    ) + y_pred_std * scipy_stats.norm.pdf(Z)
+    return prob_of_improve, e_i
+
+
 def next_sample(
     *,
     sample_X: ArrayLike,
@@ -216,6 +230,52 @@ def next_sample(
         predicted_std: stddev of predicted value
         expected_improvement: expected improvement
     """
+    return next_samples(
+        sample_X=sample_X,
+        sample_y=sample_y,
+        X_bounds=X_bounds,
+        current_X=current_X,
+        nu=nu,
+        max_samples_for_gp=max_samples_for_gp,
+        improvement=improvement,
+        num_points_to_try=num_points_to_try,
+        opt_func=opt_func,
+        test_X=test_X,
+        n=1,
+    )[0]
+
+
+def next_samples(
+    *,
+    sample_X: ArrayLike,
+    sample_y: ArrayLike,
+    X_bounds: Optional[ArrayLike] = None,
+    current_X: Optional[ArrayLike] = None,
+    nu: floating = 1.5,
+    max_samples_for_gp: integer = 100,
+    improvement: floating = 0.01,
+    num_points_to_try: integer = 1000,
+    opt_func: str = "expected_improvement",
+    test_X: Optional[ArrayLike] = None,
+    n: integer = 1,
+) -> List[Tuple[ArrayLike, floating, floating, floating, floating]]:
+    """Calculates a batch of n samples to look at next from a single gaussian process fit.
+
+    The first sample is the one `next_sample` would return. Each following one is
+    chosen after pretending the previous ones returned their predicted value
+    ("kriging believer"). That leaves the predicted mean unchanged and only shrinks
+    the predicted variance around the chosen points, which is updated in place with
+    one rank-one update per sample instead of refitting the gaussian process.
+
+    Args:
+        n: integer, optional, default 1
+            number of samples to return
+        See `next_sample` for the other arguments.
+
+    Returns:
+        A list of n (suggested_X, prob_of_improvement, predicted_y, predicted_std,
+        expected_improvement) tuples, as returned by `next_sample`.
+    """
     # Sanity check the data
     sample_X = np.array(sample_X)
     sample_y = np.array(sample_y)
@@ -243,25 +303,19 @@ def next_sample(
     filtered_X, filtered_y = filter_nans(sample_X, sample_y)
 
     # we can't run this algothim with less than two sample points, so we'll
-    # just return a random point
+    # just return random points
     if filtered_X.shape[0] < 2:
         if test_X is not None:
-            # pick a random row from test_X
-            row = np.random.choice(test_X.shape[0])
-            X = test_X[row, :]
+            # pick random rows from test_X
+            rows = np.random.choice(test_X.shape[0], size=n)
+            random_X = test_X[rows, :]
         else:
-            X = random_sample(X_bounds, 1)[0]
+            random_X = random_sample(X_bounds, n)
         if filtered_X.shape[0] < 1:
             prediction = 0.0
         else:
             prediction = filtered_y[0]
-        return (
-            X,
-            1.0,
-            prediction,
-            np.nan,
-            np.nan,
-        )
+        return [(X, 1.0, prediction, np.nan, np.nan,) for X in random_X]
 
     # build the acquisition function
     gp, y_mean, y_stddev, = train_gaussian_process(
@@ -270,12 +324,17 @@ def next_sample(
     # Look for the minimum value of our fitted-target-function + (kappa * fitted-target-std_dev)
     if test_X is None:  # this is the usual case
         test_X = random_sample(X_bounds, num_points_to_try)
-    y_pred, y_pred_std = gp.predict(test_X, return_std=True)
+
+    # the posterior at test_X, computed as in gp.predict but keeping
+    # V = L^-1 K(X_train, test_X) for the covariance updates below
+    K_trans = gp.kernel_(test_X, gp.X_train_)
+    y_pred = K_trans.dot(gp.alpha_)
+    V = scipy_linalg.solve_triangular(gp.L_, K_trans.T, lower=True)
+    y_pred_var = gp.kernel_.diag(test_X) - np.einsum("ij,ij->j", V, V)
+    y_pred_var = np.maximum(y_pred_var, 0.0)
 
     # best value of y we've seen so far.  i.e. y*
     min_unnorm_y = np.min(filtered_y)
-    # hack for dealing with predicted std of 0
-    epsilon = 0.00000001
 
     """
     if opt_func == "probability_of_improvement":
@@ -284,44 +343,48 @@ def next_sample(
     """
     min_norm_y = (min_unnorm_y - y_mean) / y_stddev
 
-    Z = -(y_pred - min_norm_y) / (y_pred_std + epsilon)
-    prob_of_improve: np.ndarray = scipy_stats.norm.cdf(Z)
-    e_i = -(y_pred - min_norm_y) * scipy_stats.norm.cdf(
-        Z
-    ) + y_pred_std * scipy_stats.norm.pdf(Z)
-
-    """
-    if opt_func == "probability_of_improvement":
-        best_test_X_index = np.argmax(prob_of_improve)
-    else:
-    """
-    best_test_X_index = np.argmax(e_i)
-
-    suggested_X = test_X[best_test_X_index]
-    suggested_X_prob_of_improvement = prob_of_improve[best_test_X_index]
-    suggested_X_predicted_y = y_pred[best_test_X_index] * y_stddev + y_mean
-    suggested_X_predicted_std = y_pred_std[best_test_X_index] * y_stddev
+    suggestions = []
+    # posterior covariance between test_X and each suggestion so far
+    covariances: List[ArrayLike] = []
+    for _ in range(n):
+        y_pred_std = np.sqrt(y_pred_var)
+        prob_of_improve, e_i = _improvement(y_pred, y_pred_std, min_norm_y)
+        if suggestions:
+            e_i[[index for index, _ in suggestions]] = -np.inf
+
+        """
+        if opt_func == "probability_of_improvement":
+            best_test_X_index = np.argmax(prob_of_improve)
+        else:
+        """
+        best = int(np.argmax(e_i))
+        suggestions.append(
+            (
+                best,
+                (
+                    test_X[best],
+                    prob_of_improve[best],
+                    y_pred[best] * y_stddev + y_mean,
+                    y_pred_std[best] * y_stddev,
+                    e_i[best],
+                ),
+            )
+        )
+        if len(suggestions) == n:
+            break
 
-    # recalculate expected improvement
-    min_norm_y = (min_unnorm_y - y_mean) / y_stddev
-    z_best = -(y_pred[best_test_X_index] - min_norm_y) / (
-        y_pred_std[best_test_X_index] + epsilon
-    )
-    suggested_X_expected_improvement = -(
-        y_pred[best_test_X_index] - min_norm_y
-    ) * scipy_stats.norm.cdf(z_best) + y_pred_std[
-        best_test_X_index
-    ] * scipy_stats.norm.pdf(
-        z_best
-    )
+        # condition on the believed observation y_pred[best] at test_X[best]
+        covariance = gp.kernel_(test_X, test_X[best : best + 1])[:, 0] - V.T.dot(
+            V[:, best]
+        )
+        for previous in covariances:
+            covariance -= previous * previous[best]
+        covariance /= np.sqrt(max(covariance[best] + gp.alpha, NUGGET))
+        covariances.append(covariance)
+        y_pred_var = np.maximum(y_pred_var - covariance ** 2, 0.0)
+        min_norm_y = min(min_norm_y, y_pred[best])
 
-    return (
-        suggested_X,
-        suggested_X_prob_of_improvement,
-        suggested_X_predicted_y,
-        suggested_X_predicted_std,
-        suggested_X_expected_improvement,
-    )
+    return [suggestion for _, suggestion in suggestions]
 
 
 def _construct_gp_data(
@@ -428,6 +491,34 @@ def bayes_search_next_run(
     Returns:
         The suggested run.
     """
+    return bayes_search_next_runs(
+        runs, config, validate=validate, n=1, minimum_improvement=minimum_improvement
+    )[0]
+
+
+def bayes_search_next_runs(
+    runs: List[SweepRun],
+    config: Union[dict, SweepConfig],
+    validate: bool = False,
+    n: int = 1,
+    minimum_improvement: floating = 0.1,
+) -> List[SweepRun]:
+    """Suggest a batch of n runs using Bayesian optimization.
+
+    The gaussian process is fit once for the whole batch, see `next_samples`.
+
+    Args:
+        runs: The runs in the sweep.
+        config: The sweep's config.
+        validate: Whether to validate `sweep_config` against the SweepConfig JSONschema.
+           If true, will raise a Validation error if `sweep_config` does not conform to
+           the schema. If false, will attempt to run the sweep with an unvalidated schema.
+        n: The number of runs to suggest.
+        minimum_improvement: The minimium improvement to optimize for. Higher means take more exploratory risks.
+
+    Returns:
+        The suggested runs.
+    """
 
     if validate:
         config = SweepConfig(config)
@@ -437,49 +528,37 @@ def bayes_search_next_run(
     params, sample_X, current_X, y = _construct_gp_data(runs, config)
     X_bounds = [[0.0, 1.0]] * len(params.searchable_params)
 
-    (
-        suggested_X,
-        suggested_X_prob_of_improvement,
-        suggested_X_predicted_y,
-        suggested_X_predicted_std,
-        suggested_X_expected_improvement,
-    ) = next_sample(
+    suggestions = next_samples(
         sample_X=sample_X,
         sample_y=y,
         X_bounds=X_bounds,
         current_X=current_X if len(current_X) > 0 else None,
         improvement=minimum_improvement,
+        n=n,
     )
 
-    # convert the parameters from vector of [0,1] values
-    # to the original ranges
-    for param in params:
-        if param.type == HyperParameter.CONSTANT:
-            continue
-        try_value = suggested_X[params.param_names_to_index[param.name]]
-        param.value = param.ppf(try_value)
-
-    ret_dict = params.to_config()
-    info = {
-        "success_probability": suggested_X_prob_of_improvement,
-        "predicted_value": suggested_X_predicted_y,
-        "predicted_value_std_dev": suggested_X_predicted_std,
-        "expected_improvement": suggested_X_expected_improvement,
-    }
-    return SweepRun(config=ret_dict, search_info=info)
-
-
-def bayes_search_next_runs(
-    runs: List[SweepRun],
-    config: Union[dict, SweepConfig],
-    validate: bool = False,
-    n: int = 1,
-    minimum_improvement: floating = 0.1,
-):
     ret: List[SweepRun] = []
-    for _ in range(n):
-        suggestion = bayes_search_next_run(
-            runs + ret, config, validate, minimum_improvement
-        )
-        ret.append(suggestion)
+    for (
+        suggested_X,
+        suggested_X_prob_of_improvement,
+        suggested_X_predicted_y,
+        suggested_X_predicted_std,
+        suggested_X_expected_improvement,
+    ) in suggestions:
+        # convert the parameters from vector of [0,1] values
+        # to the original ranges
+        for param in params:
+            if param.type == HyperParameter.CONSTANT:
+                continue
+            try_value = suggested_X[params.param_names_to_index[param.name]]
+            param.value = param.ppf(try_value)
+
+        ret_dict = params.to_config()
+        info = {
+            "success_probability": suggested_X_prob_of_improvement,
+            "predicted_value": suggested_X_predicted_y,
+            "predicted_value_std_dev": suggested_X_predicted_std,
+            "expected_improvement": suggested_X_expected_improvement,
+        }
+        ret.append(SweepRun(config=ret_dict, search_info=info))
     return ret
@@ -1,13 +1,15 @@
-import itertools
 import random
 import hashlib
 import yaml
-from typing import Any, List, Optional, Union
+from typing import Any, Dict, List, Optional, Union
 
 from .config.cfg import SweepConfig
 from .run import SweepRun
 from .params import HyperParameter, HyperParameterSet
 
+# values of these types are looked up by equality instead of by their yaml hash
+_SCALAR_TYPES = (str, int, float, bool, type(None))
+
 
 def yaml_hash(value: Any) -> str:
     return hashlib.md5(
@@ -15,6 +17,49 @@ def yaml_hash(value: Any) -> str:
     ).hexdigest()
 
 
+def _value_key(value: Any) -> Any:
+    """A key identifying a parameter value, cheaper to compute than its yaml hash."""
+    # NaN isn't equal to itself, so it's looked up by its hash too
+    if type(value) in _SCALAR_TYPES and value == value:
+        # the type is part of the key so that e.g. 1, 1.0 and True stay distinct
+        return type(value), value
+    return yaml_hash(value)
+
+
+def _mix(value: int, key: int) -> int:
+    value = ((value ^ key) * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 29)
+
+
+class FeistelPermutation(object):
+    """A pseudorandom permutation of range(size) that can be evaluated at any index.
+
+    A balanced Feistel network over the smallest even number of bits that can hold
+    size - 1, with cycle walking to stay in range. Memory is O(1) and each
+    evaluation takes on average fewer than 4 passes through the network.
+    """
+
+    def __init__(self, size: int, seed: Any, rounds: int = 4):
+        self.size = size
+        bits = max(2, (size - 1).bit_length())
+        self._half_bits = (bits + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        rng = random.Random(seed)
+        self._keys = [rng.getrandbits(64) for _ in range(rounds)]
+
+    def __call__(self, index: int) -> int:
+        if not 0 <= index < self.size:
+            raise IndexError("index out of range")
+        value = index
+        while True:
+            left, right = value >> self._half_bits, value & self._half_mask
+            for key in self._keys:
+                left, right = right, left ^ (_mix(right, key) & self._half_mask)
+            value = (left << self._half_bits) | right
+            if value < self.size:
+                return value
+
+
 def grid_search_next_runs(
     runs: List[SweepRun],
     sweep_config: Union[dict, SweepConfig],
@@ -64,53 +109,86 @@ def grid_search_next_runs(
         [p for p in params if p.type == HyperParameter.CATEGORICAL]
     )
 
-    # build an iterator over all combinations of param values
+    # the grid is enumerated lazily: grid point i is the mixed-radix number
+    # whose digits are the indices of each parameter's value, the last parameter
+    # varying fastest like in itertools.product
     param_names = [p.name for p in discrete_params]
     param_values = [p.config["values"] for p in discrete_params]
-    param_hashes = [
-        [yaml_hash(value) for value in p.config["values"]] for p in discrete_params
-    ]
-    value_hash_lookup = {
-        name: dict(zip(hashes, vals))
-        for name, vals, hashes in zip(param_names, param_values, param_hashes)
-    }
-
-    all_param_hashes = list(itertools.product(*param_hashes))
-    if randomize_order:
-        random.shuffle(all_param_hashes)
-
-    param_hashes_seen = set(
-        [
-            tuple(
-                yaml_hash(run.config[name]["value"])
-                for name in param_names
-                if name in run.config
-            )
-            for run in runs
-        ]
-    )
-
-    hash_gen = (
-        hash_val for hash_val in all_param_hashes if hash_val not in param_hashes_seen
+    radices = [len(values) for values in param_values]
+    # a value listed more than once is identified by the index it first appears at
+    value_indices: List[Dict[Any, int]] = []
+    first_indices: List[List[int]] = []
+    for values in param_values:
+        indices: Dict[Any, int] = {}
+        first_indices.append(
+            [indices.setdefault(_value_key(value), i) for i, value in enumerate(values)]
+        )
+        value_indices.append(indices)
+    has_duplicates = any(
+        len(indices) < radix for indices, radix in zip(value_indices, radices)
     )
+    grid_size = 1
+    for radix in radices:
+        grid_size *= radix
+
+    def first_point(point: int) -> int:
+        """The first grid point with the same parameter values as `point`."""
+        first = 0
+        scale = 1
+        for radix, firsts in zip(reversed(radices), reversed(first_indices)):
+            point, index = divmod(point, radix)
+            first += firsts[index] * scale
+            scale *= radix
+        return first
+
+    # grid points already covered by a run, by their first point
+    seen = set()
+    for run in runs:
+        point = 0
+        for name, radix, indices in zip(param_names, radices, value_indices):
+            if name not in run.config:
+                break
+            index = indices.get(_value_key(run.config[name]["value"]))
+            if index is None:
+                break
+            point = point * radix + index
+        else:
+            seen.add(point)
+
+    order = None
+    if randomize_order:
+        # the same permutation for every call on this sweep's parameters
+        order = FeistelPermutation(grid_size, yaml_hash([param_names, param_values]))
 
     retval: List[Optional[SweepRun]] = []
+    cursor = 0
     for _ in range(n):
 
-        # this is O(1)
-        next_hash = next(hash_gen, None)
+        # every point skipped here is in seen or repeats the values of a point
+        # before it, so this is O(len(runs) + n) without duplicate values
+        point = None
+        while cursor < grid_size:
+            candidate = order(cursor) if order is not None else cursor
+            cursor += 1
+            if has_duplicates:
+                candidate = first_point(candidate)
+            if candidate not in seen:
+                point = candidate
+                break
 
         # we have searched over the entire parameter space
-        if next_hash is None:
+        if point is None:
             retval.append(None)
             return retval
 
-        for param, hash_val in zip(discrete_params, next_hash):
-            param.value = value_hash_lookup[param.name][hash_val]
+        seen.add(point)
+        for param, radix, values in zip(
+            reversed(discrete_params), reversed(radices), reversed(param_values)
+        ):
+            point, index = divmod(point, radix)
+            param.value = values[index]
 
         run = SweepRun(config=params.to_config())
         retval.append(run)
 
-        param_hashes_seen.add(next_hash)
-
     return retval
@@ -1,11 +1,13 @@
-from typing import List, Union, Dict, Any
+from typing import List, Union, Dict, Any, Optional, Tuple
 from copy import deepcopy
+from itertools import islice
+import math
 
 import numpy as np
 
 from .config import SweepConfig, fill_validate_early_terminate
 from .config.schema import fill_validate_metric
-from .run import SweepRun, RunState
+from .run import SweepRun, RunState, is_number
 from .config.schema import dereferenced_sweep_config_jsonschema
 
 
@@ -46,10 +48,102 @@ def hyperband_baseline_validate_and_fill(config: Dict) -> Dict:
     return config
 
 
+def _is_valid_metric(value: Any) -> bool:
+    # fast path for the usual types before the general check
+    if type(value) is float:
+        return math.isfinite(value)
+    if type(value) is int:
+        return True
+    return is_number(value)
+
+
+class _RunSummary(object):
+    """What hyperband needs to know about one run's metric history."""
+
+    __slots__ = ("count", "last_row", "length", "minimum", "band_values")
+
+    def __init__(self, num_bands: int) -> None:
+        # number of history rows already processed, and a copy of the last one
+        self.count = 0
+        self.last_row: Optional[dict] = None
+        # number of valid metric values among them
+        self.length = 0
+        self.minimum = np.inf
+        # the metric value at each band's step
+        self.band_values = np.full(num_bands, np.nan)
+
+    def extends(self, history: List[dict]) -> bool:
+        """Whether `history` continues from the rows already processed.
+
+        A sampled history can be resampled between calls, changing earlier rows
+        and usually shrinking; comparing the length and the last processed row
+        catches that without comparing the whole history.
+        """
+        if len(history) < self.count:
+            return False
+        return self.count == 0 or history[self.count - 1] == self.last_row
+
+    def update(
+        self, history: List[dict], metric_name: str, sign: int, bands: List[int]
+    ) -> None:
+        values = [
+            d[metric_name]
+            for d in islice(history, self.count, None)
+            if metric_name in d and _is_valid_metric(d[metric_name])
+        ]
+        if len(history) > self.count:
+            self.count = len(history)
+            self.last_row = dict(history[-1])
+        if not values:
+            return
+        new_values = np.asarray(values, dtype=float) * sign
+        for i, band in enumerate(bands):
+            if self.length <= band < self.length + len(new_values):
+                self.band_values[i] = new_values[band - self.length]
+        self.length += len(new_values)
+        self.minimum = min(self.minimum, new_values.min())
+
+
+class HyperbandState(object):
+    """Run history summaries kept between calls of `hyperband_stop_runs`.
+
+    Pass the same state to every call to only process the part of each run's
+    history that was appended since the previous call. Runs are matched by name,
+    and a run's history is processed again from the start if it got shorter or
+    the last row seen before has changed.
+    """
+
+    def __init__(self) -> None:
+        self._key: Optional[Tuple] = None
+        self._summaries: Dict[str, _RunSummary] = {}
+
+    def summarize(
+        self, runs: List[SweepRun], metric_name: str, sign: int, bands: List[int]
+    ) -> List[_RunSummary]:
+        key = (metric_name, sign, tuple(bands))
+        if key != self._key:
+            self._key = key
+            self._summaries = {}
+        summaries = {}
+        result = []
+        for run in runs:
+            summary = self._summaries.get(run.name) if run.name is not None else None
+            if summary is None or not summary.extends(run.history):
+                summary = _RunSummary(len(bands))
+            summary.update(run.history, metric_name, sign, bands)
+            if run.name is not None:
+                summaries[run.name] = summary
+            result.append(summary)
+        # forget runs that are no longer in the sweep
+        self._summaries = summaries
+        return result
+
+
 def hyperband_stop_runs(
     runs: List[SweepRun],
     config: Union[dict, SweepConfig],
     validate: bool = False,
+    state: Optional[HyperbandState] = None,
 ) -> List[SweepRun]:
     """
     Suggest sweep runs to terminate early using Hyperband: A Novel Bandit-Based Approach to Hyperparameter Optimization
@@ -119,6 +213,9 @@ def hyperband_stop_runs(
         validate: Whether to validate `sweep_config` against the SweepConfig JSONschema.
            If true, will raise a Validation error if `sweep_config` does not conform to
            the schema. If false, will attempt to run the sweep with an unvalidated schema.
+        state: A HyperbandState to reuse between calls. If given, only the history
+           appended to each run since the previous call is processed, unless
+           the rows processed before have changed.
 
     Returns:
         List of runs to stop early.
@@ -174,26 +271,40 @@ def hyperband_stop_runs(
 
     terminate_runs: List[SweepRun] = []
     metric_name = config["metric"]["name"]
+    sign = -1 if config["metric"]["goal"] == "maximize" else 1
 
-    all_run_histories = []  # we're going to look at every run
-    for run in runs:
-        history = run.metric_history(metric_name, filter_invalid=True)
-        if config["metric"]["goal"] == "maximize":
-            history = list(map(lambda x: -x, history))
-        if len(history) > 0:
-            all_run_histories.append(history)
+    if state is None:
+        state = HyperbandState()
+    summaries = state.summarize(runs, metric_name, sign, bands)
+
+    # one row per run with its metric value at every band it reached
+    band_matrix = np.full((len(summaries), len(bands)), np.nan)
+    lengths = np.zeros(len(summaries))
+    minimums = np.full(len(summaries), np.inf)
+    for row, summary in enumerate(summaries):
+        band_matrix[row] = summary.band_values
+        lengths[row] = summary.length
+        minimums[row] = summary.minimum
 
     thresholds = []
     # iterate over the histories at every band and find the threshold for a run to be in the top r percentile
-    for band in bands:
+    for band_values in band_matrix.T:
         # values of metric at iteration number "band"
-        band_values = [h[band] for h in all_run_histories if len(h) > band]
+        band_values = band_values[~np.isnan(band_values)]
         if len(band_values) == 0:
             threshold = np.inf
         else:
-            threshold = sorted(band_values)[int((r) * len(band_values))]
+            k = int((r) * len(band_values))
+            threshold = float(np.partition(band_values, k)[k])
         thresholds.append(threshold)
 
+    # the last band each run has gone past, -1 if none yet
+    closest_bands = (
+        np.searchsorted(np.asarray(bands, dtype=float), lengths, side="left") - 1
+    )
+    threshold_array = np.asarray(thresholds + [0.0])
+    stop = (closest_bands != -1) & (minimums > threshold_array[closest_bands])
+
     info: Dict[str, Any] = {}
     info["lines"] = []
     info["lines"].append(
@@ -211,36 +322,25 @@ def hyperband_stop_runs(
     info["bands"] = bands
     info["thresholds"] = thresholds
 
-    for run in runs:
+    for run, closest_band_index, should_stop, length, minimum in zip(
+        runs, closest_bands, stop, lengths, minimums
+    ):
         if run.state == RunState.running:
-            history = run.metric_history(metric_name, filter_invalid=True)
-            if config["metric"]["goal"] == "maximize":
-                history = list(map(lambda x: -x, history))
-
-            closest_band = -1
-            closest_threshold = 0.0
             bandstr = ""
             termstr = ""
-            for band, threshold in zip(bands, thresholds):
-                if band < len(history):
-                    closest_band = band
-                    closest_threshold = threshold
-                else:
-                    break
-
-            if closest_band != -1:  # no bands apply yet
+            if closest_band_index != -1:  # no bands apply yet
                 bandstr = " (Metric: %f Band: %d Threshold %f)" % (
-                    min(history),
-                    closest_band,
-                    closest_threshold,
+                    minimum,
+                    bands[closest_band_index],
+                    thresholds[closest_band_index],
                 )
-                if min(history) > closest_threshold:
+                if should_stop:
                     terminate_runs.append(run)
                     termstr = " STOP"
 
             run_info = info.copy()
             run_info["lines"].append(
-                "Run: %s Step: %d%s%s" % (run.name, len(history), bandstr, termstr)
+                "Run: %s Step: %d%s%s" % (run.name, length, bandstr, termstr)
             )
             run.early_terminate_info = run_info
 
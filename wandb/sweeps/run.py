@@ -205,6 +205,7 @@ def stop_runs(
     sweep_config: Union[dict, SweepConfig],
     runs: List[SweepRun],
     validate: bool = False,
+    **kwargs,
 ) -> List[SweepRun]:
     """Calculate the runs in a sweep to stop by early termination.
 
@@ -271,6 +272,7 @@ def stop_runs(
         validate: Whether to validate `sweep_config` against the SweepConfig JSONschema.
            If true, will raise a Validation error if `sweep_config` does not conform to
            the schema. If false, will attempt to run the sweep with an unvalidated schema.
+        kwargs: Passed to the early termination algorithm, e.g. `state` for hyperband.
 
 
     Returns:
@@ -291,7 +293,7 @@ def stop_runs(
     et_type = sweep_config["early_terminate"]["type"]
 
     if et_type == "hyperband":
-        return hyperband_stop_runs(runs, sweep_config, validate=validate)
+        return hyperband_stop_runs(runs, sweep_config, validate=validate, **kwargs)
     else:
         raise ValueError(
             f'Invalid early stopping type {et_type}, must be one of ["hyperband"]'
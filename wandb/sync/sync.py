@@ -42,6 +42,41 @@ class _LocalRun(object):
         return self.path
 
 
+class SyncProgress(object):
+    """Record counts and timing for each run being synced."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._runs = {}
+
+    def start(self, sync_item, total_records=None):
+        """Starts tracking a run, `total_records` is its record count if known."""
+        with self._lock:
+            self._runs[sync_item] = dict(
+                records=0, total=total_records, bytes=0, start=time.time(), end=None
+            )
+
+    def add(self, sync_item, num_bytes):
+        with self._lock:
+            run = self._runs[sync_item]
+            run["records"] += 1
+            run["bytes"] += num_bytes
+
+    def finish(self, sync_item):
+        with self._lock:
+            self._runs[sync_item]["end"] = time.time()
+
+    def rate(self, sync_item):
+        with self._lock:
+            run = self._runs[sync_item]
+            elapsed = (run["end"] or time.time()) - run["start"]
+            return run["records"] / elapsed if elapsed > 0 else 0.0
+
+    def status(self):
+        with self._lock:
+            return {k: dict(v) for k, v in self._runs.items()}
+
+
 class SyncThread(threading.Thread):
     def __init__(
         self,
@@ -54,6 +89,8 @@ class SyncThread(threading.Thread):
         mark_synced=None,
         app_url=None,
         sync_tensorboard=None,
+        sync_queue=None,
+        progress=None,
     ):
         threading.Thread.__init__(self)
         # mark this process as internal
@@ -67,6 +104,20 @@ class SyncThread(threading.Thread):
         self._mark_synced = mark_synced
         self._app_url = app_url
         self._sync_tensorboard = sync_tensorboard
+        # workers of a parallel sync share a queue of items to sync
+        self._sync_queue = sync_queue
+        self._progress = progress or SyncProgress()
+
+    def _sync_items(self):
+        if self._sync_queue is None:
+            for sync_item in self._sync_list:
+                yield sync_item
+            return
+        while True:
+            try:
+                yield self._sync_queue.get_nowait()
+            except queue.Empty:
+                return
 
     def _parse_pb(self, data, exit_pb=None):
         pb = wandb_internal_pb2.Record()
@@ -136,7 +187,7 @@ class SyncThread(threading.Thread):
                 return True
         return False
 
-    def _send_tensorboard(self, tb_root, tb_logdirs, send_manager):
+    def _send_tensorboard(self, tb_root, tb_logdirs, send_manager, root_dir):
         if self._entity is None:
             viewer, server_info = send_manager._api.viewer_server_info()
             self._entity = viewer.get("entity")
@@ -164,7 +215,7 @@ class SyncThread(threading.Thread):
         )
         record = send_manager._interface._make_record(run=proto_run)
         settings = wandb.Settings(
-            root_dir=TMPDIR.name,
+            root_dir=root_dir,
             run_id=proto_run.run_id,
             _start_datetime=datetime.datetime.now(),
             _start_time=time.time(),
@@ -221,8 +272,59 @@ class SyncThread(threading.Thread):
             else:
                 raise e
 
+    def _view_index(self, ds, entries):
+        """Print the record types from the index, and skip past them in `ds`"""
+        # the index has every record type, only parse what follows it
+        for _, _, record_type in entries:
+            print("Record:", record_type)
+        offset, length, _ = entries[-1]
+        ds.seek(offset + length)
+
+    def _send_records(self, ds, sm, sync_item):
+        """Send the records left in `ds`, returns whether the run finished"""
+        # save exit for final send
+        exit_pb = None
+        finished = False
+        shown = False
+        while True:
+            data = self._robust_scan(ds)
+            if data is None:
+                break
+            self._progress.add(sync_item, len(data))
+            pb, exit_pb, cont = self._parse_pb(data, exit_pb)
+            if exit_pb is not None:
+                finished = True
+            if cont:
+                continue
+            sm.send(pb)
+            # send any records that were added in previous send
+            while not sm._record_q.empty():
+                data = sm._record_q.get(block=True)
+                sm.send(data)
+
+            if pb.control.req_resp:
+                result = sm._result_q.get(block=True)
+                result_type = result.WhichOneof("result_type")
+                if not shown and result_type == "run_result":
+                    r = result.run_result.run
+                    # TODO(jhr): hardcode until we have settings in sync
+                    url = "{}/{}/{}/runs/{}".format(
+                        self._app_url,
+                        url_quote(r.entity),
+                        url_quote(r.project),
+                        url_quote(r.run_id),
+                    )
+                    if self._sync_queue is None:
+                        print("Syncing: %s ..." % url, end="")
+                    else:
+                        # other workers print too, keep to whole lines
+                        print("Syncing: %s" % url)
+                    sys.stdout.flush()
+                    shown = True
+        return finished
+
     def run(self):
-        for sync_item in self._sync_list:
+        for sync_item in self._sync_items():
             tb_event_files, tb_logdirs, tb_root = self._find_tfevent_files(sync_item)
             if os.path.isdir(sync_item):
                 files = os.listdir(sync_item)
@@ -237,12 +339,17 @@ class SyncThread(threading.Thread):
             sync_tb = self._setup_tensorboard(
                 tb_root, tb_logdirs, tb_event_files, sync_item
             )
-            # If we're syncing tensorboard, let's use a tmp dir for images etc.
-            root_dir = TMPDIR.name if sync_tb else os.path.dirname(sync_item)
-            sm = sender.SendManager.setup(root_dir)
             if sync_tb:
-                self._send_tensorboard(tb_root, tb_logdirs, sm)
+                # a tmp dir for images etc., one per item since other workers
+                # of a parallel sync may be syncing tensorboard too
+                tb_dir = tempfile.TemporaryDirectory(dir=TMPDIR.name)
+                try:
+                    sm = sender.SendManager.setup(tb_dir.name)
+                    self._send_tensorboard(tb_root, tb_logdirs, sm, tb_dir.name)
+                finally:
+                    tb_dir.cleanup()
                 continue
+            sm = sender.SendManager.setup(os.path.dirname(sync_item))
 
             ds = datastore.DataStore()
             try:
@@ -250,48 +357,32 @@ class SyncThread(threading.Thread):
             except AssertionError as e:
                 print(".wandb file is empty ({}), skipping: {}".format(e, sync_item))
                 continue
+            # the side index, if the run was written with one, counts its records
+            entries = ds.scan_index()
+            self._progress.start(
+                sync_item, len(entries) if entries is not None else None
+            )
 
-            # save exit for final send
-            exit_pb = None
-            finished = False
-            shown = False
-            while True:
-                data = self._robust_scan(ds)
-                if data is None:
-                    break
-                pb, exit_pb, cont = self._parse_pb(data, exit_pb)
-                if exit_pb is not None:
-                    finished = True
-                if cont:
-                    continue
-                sm.send(pb)
-                # send any records that were added in previous send
-                while not sm._record_q.empty():
-                    data = sm._record_q.get(block=True)
-                    sm.send(data)
-
-                if pb.control.req_resp:
-                    result = sm._result_q.get(block=True)
-                    result_type = result.WhichOneof("result_type")
-                    if not shown and result_type == "run_result":
-                        r = result.run_result.run
-                        # TODO(jhr): hardcode until we have settings in sync
-                        url = "{}/{}/{}/runs/{}".format(
-                            self._app_url,
-                            url_quote(r.entity),
-                            url_quote(r.project),
-                            url_quote(r.run_id),
-                        )
-                        print("Syncing: %s ..." % url, end="")
-                        sys.stdout.flush()
-                        shown = True
+            if self._view and not self._verbose and entries:
+                self._view_index(ds, entries)
+            finished = self._send_records(ds, sm, sync_item)
             sm.finish()
+            ds.close()
+            self._progress.finish(sync_item)
             # Only mark synced if the run actually finished
             if self._mark_synced and not self._view and finished:
                 synced_file = "{}{}".format(sync_item, SYNCED_SUFFIX)
                 with open(synced_file, "w"):
                     pass
-            print("done.")
+            if self._sync_queue is None:
+                print("done.")
+            else:
+                run = self._progress.status()[sync_item]
+                print(
+                    "done: {} ({} records, {:.1f} records/sec)".format(
+                        sync_item, run["records"], self._progress.rate(sync_item)
+                    )
+                )
 
 
 class SyncManager:
@@ -305,9 +396,14 @@ class SyncManager:
         view=None,
         verbose=None,
         sync_tensorboard=None,
+        parallel=None,
     ):
         self._sync_list = []
         self._thread = None
+        self._threads = []
+        self._parallel = parallel or 1
+        self._progress = SyncProgress()
+        self._report_time = time.time()
         self._project = project
         self._entity = entity
         self._run_id = run_id
@@ -318,14 +414,14 @@ class SyncManager:
         self._sync_tensorboard = sync_tensorboard
 
     def status(self):
-        pass
+        """Return per run progress, keyed by the .wandb file being synced."""
+        return self._progress.status()
 
     def add(self, p):
         self._sync_list.append(os.path.abspath(str(p)))
 
-    def start(self):
-        # create a thread for each file?
-        self._thread = SyncThread(
+    def _make_thread(self, sync_queue=None):
+        return SyncThread(
             sync_list=self._sync_list,
             project=self._project,
             entity=self._entity,
@@ -335,14 +431,41 @@ class SyncManager:
             mark_synced=self._mark_synced,
             app_url=self._app_url,
             sync_tensorboard=self._sync_tensorboard,
+            sync_queue=sync_queue,
+            progress=self._progress,
         )
-        self._thread.start()
+
+    def start(self):
+        num_workers = min(self._parallel, len(self._sync_list))
+        if num_workers <= 1:
+            self._thread = self._make_thread()
+            self._threads = [self._thread]
+        else:
+            sync_queue = queue.Queue()
+            for sync_item in self._sync_list:
+                sync_queue.put(sync_item)
+            self._threads = [self._make_thread(sync_queue) for _ in range(num_workers)]
+            self._thread = self._threads[0]
+        for thread in self._threads:
+            thread.start()
 
     def is_done(self):
-        return not self._thread.is_alive()
+        return not any(thread.is_alive() for thread in self._threads)
 
     def poll(self):
         time.sleep(1)
+        if self._parallel > 1 and time.time() - self._report_time >= 10:
+            self._report_time = time.time()
+            status = self._progress.status()
+            done = sum(1 for run in status.values() if run["end"])
+            records = sum(run["records"] for run in status.values())
+            line = "Synced {} of {} runs, {} records so far".format(
+                done, len(self._sync_list), records
+            )
+            if status and all(run["total"] is not None for run in status.values()):
+                total = sum(run["total"] for run in status.values())
+                line += " of {} in the runs started".format(total)
+            wandb.termlog(line)
         return False
 
 
@@ -267,7 +267,14 @@ class PreInitObject(object):
             raise AttributeError()
 
 
-np = get_module("numpy")
+def _get_numpy():
+    """Returns numpy if it's been imported.
+
+    Objects can only be numpy values once it has, so we don't pay for importing
+    numpy just to check.
+    """
+    return sys.modules.get("numpy")
+
 
 # TODO: Revisit these limits
 VALUE_BYTES_LIMIT = 100000
@@ -449,6 +456,7 @@ def is_plotly_figure_typename(typename):
 
 
 def is_numpy_array(obj):
+    np = _get_numpy()
     return np and isinstance(obj, np.ndarray)
 
 
@@ -546,6 +554,7 @@ def json_friendly(obj):
     elif is_jax_tensor_typename(typename):
         obj = get_jax_tensor(obj)
 
+    np = _get_numpy()
     if is_numpy_array(obj):
         if obj.size == 1:
             obj = obj.flatten()[0]
@@ -624,6 +633,7 @@ def convert_plots(obj):
 
 
 def maybe_compress_history(obj):
+    np = _get_numpy()
     if np and isinstance(obj, np.ndarray) and obj.size > 32:
         return wandb.Histogram(obj, num_bins=32).to_json(), True
     else:
@@ -631,6 +641,7 @@ def maybe_compress_history(obj):
 
 
 def maybe_compress_summary(obj, h5_typename):
+    np = _get_numpy()
     if np and isinstance(obj, np.ndarray) and obj.size > 32:
         return (
             {
@@ -733,6 +744,7 @@ class JSONEncoderUncompressed(json.JSONEncoder):
     This encoder turns numpy like objects with a size > 32 into histograms"""
 
     def default(self, obj):
+        np = _get_numpy()
         if is_numpy_array(obj):
             return obj.tolist()
         elif np and isinstance(obj, np.generic):
@@ -865,12 +877,19 @@ def has_num(dictionary, key):
     return key in dictionary and isinstance(dictionary[key], numbers.Number)
 
 
-def md5_file(path):
+def md5_hash_file(path, block_size=1024 * 1024):
+    """The md5 hash object of the file at `path`, read in blocks of `block_size`"""
     hash_md5 = hashlib.md5()
-    with open(path, "rb") as f:
-        for chunk in iter(lambda: f.read(4096), b""):
-            hash_md5.update(chunk)
-    return base64.b64encode(hash_md5.digest()).decode("ascii")
+    block = bytearray(block_size)
+    view = memoryview(block)
+    with open(path, "rb", buffering=0) as f:
+        for size in iter(lambda: f.readinto(block), 0):
+            hash_md5.update(view[:size])
+    return hash_md5
+
+
+def md5_file(path):
+    return base64.b64encode(md5_hash_file(path).digest()).decode("ascii")
 
 
 def get_log_file_path():
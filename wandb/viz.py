@@ -1,4 +1,3 @@
-from wandb.data_types import Table
 from wandb.errors import Error
 
 
@@ -9,6 +8,8 @@ class Visualize:
 
 
 def visualize(viz_id, value):
+    from wandb.data_types import Table
+
     if not isinstance(value, Table):
         raise Error(
             "visualize value must be Table, not {}".format(type(value).__name__)
@@ -25,6 +26,8 @@ class CustomChart:
 
 
 def create_custom_chart(vega_spec_name, data_table, fields, string_fields):
+    from wandb.data_types import Table
+
     if not isinstance(data_table, Table):
         raise Error(
             "custom chart data_table must be Table, not {}".format(
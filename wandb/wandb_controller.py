@@ -150,6 +150,8 @@ class _WandbController:
                 List[sweeps.SweepRun],
             ]
         ] = None
+        # Run history summaries reused by hyperband stopping across steps
+        self._stopping_state = sweeps.HyperbandState()
         # Program function (used for future jupyter support)
         self._program_function = None
 
@@ -589,8 +591,14 @@ class _WandbController:
     def _stopping(self) -> List[sweeps.SweepRun]:
         if "early_terminate" not in self.sweep_config:
             return []
-        stopper = self._custom_stopping or sweeps.stop_runs
-        stop_runs = stopper(self._sweep_config, self._sweep_runs or [])
+        if self._custom_stopping:
+            stop_runs = self._custom_stopping(
+                self._sweep_config, self._sweep_runs or []
+            )
+        else:
+            stop_runs = sweeps.stop_runs(
+                self._sweep_config, self._sweep_runs or [], state=self._stopping_state,
+            )
 
         debug_lines = "\n".join(
             [
@@ -66,7 +66,13 @@ def log_track_update(log_track):
 
 
 class TorchHistory(object):
-    """History methods specific to PyTorch"""
+    """History methods specific to PyTorch
+
+    Histograms for hooked parameters and gradients on accelerators are computed
+    on the tensor's device without synchronizing and kept in `_pending_stats`
+    until the history row is flushed, at which point all of them are copied to
+    the host at once.
+    """
 
     def __init__(self, history):
         global torch
@@ -76,6 +82,8 @@ class TorchHistory(object):
         self._num_bins = 64
         self._is_cuda_histc_supported = None
         self._jupyter_run = None
+        # name -> device tensor holding bin counts, min, max and finite count
+        self._pending_stats = {}
         self.hook_torch = TorchGraph.hook_torch
 
     def add_log_hooks_to_pytorch_module(
@@ -113,7 +121,7 @@ class TorchHistory(object):
                         data = parameter.data
                     else:
                         data = parameter
-                    self.log_tensor_stats(data.cpu(), "parameters/" + prefix + name)
+                    self._queue_tensor_stats(data, "parameters/" + prefix + name)
 
             log_track_params = log_track_init(log_freq)
             hook = module.register_forward_hook(
@@ -258,6 +266,91 @@ class TorchHistory(object):
             {name: wandb.Histogram(np_histogram=(tensor.tolist(), bins.tolist()))}
         )
 
+    def _queue_tensor_stats(self, tensor, name):
+        """Compute a tensor's histogram on its device, to be logged on flush.
+
+        Tensors the batched path can't handle are logged right away with
+        `log_tensor_stats`.
+        """
+        history = self._history()
+        if (
+            history is None
+            or not history.compute
+            or not hasattr(tensor, "detach")
+            or tensor.is_sparse
+            or not self._should_defer_stats(tensor)
+        ):
+            self.log_tensor_stats(tensor, name)
+            return
+
+        flat = tensor.detach().reshape(-1)
+        if flat.numel() == 0:
+            return
+        # half precision min/max and bin edges are too coarse, bin in float32
+        if not flat.is_floating_point() or flat.dtype in (
+            torch.float16,
+            torch.bfloat16,
+        ):
+            flat = flat.float()
+        self._pending_stats[name] = self._tensor_stats(flat)
+
+    def _should_defer_stats(self, tensor):
+        # reading results back from the cpu is free, only defer on accelerators
+        return tensor.device.type != "cpu"
+
+    def _tensor_stats(self, flat):
+        """Returns bin counts, min, max and the finite count of a 1d tensor.
+
+        Only finite values are counted. Nothing here needs a device sync, the
+        results stay on the tensor's device until `_flush_tensor_stats`.
+        """
+        num_bins = self._num_bins
+        finite = torch.isfinite(flat)
+        tmin = torch.where(finite, flat, flat.new_tensor(float("inf"))).min()
+        tmax = torch.where(finite, flat, flat.new_tensor(float("-inf"))).max()
+        # like histc, widen an empty range by one on each side
+        same = tmin == tmax
+        lo = torch.where(same, tmin - 1, tmin)
+        hi = torch.where(same, tmax + 1, tmax)
+        values = torch.where(finite, flat, lo)
+        index = ((values - lo) * num_bins / (hi - lo)).long().clamp_(0, num_bins - 1)
+        counts = torch.zeros(num_bins, dtype=torch.long, device=flat.device)
+        counts.scatter_add_(0, index, finite.long())
+        return torch.cat(
+            [
+                counts.double(),
+                torch.stack([tmin, tmax]).double(),
+                finite.sum().double().reshape(1),
+            ]
+        )
+
+    def _flush_tensor_stats(self):
+        """Copy pending histograms to the host and add them to the history row."""
+        if not self._pending_stats:
+            return
+        pending, self._pending_stats = self._pending_stats, {}
+        history = self._history()
+        if history is None:
+            return
+
+        # one device to host copy per device
+        by_device = {}
+        for name, stats in pending.items():
+            by_device.setdefault(stats.device, []).append((name, stats))
+        num_bins = self._num_bins
+        row = {}
+        for items in by_device.values():
+            host = torch.stack([stats for _, stats in items]).cpu().tolist()
+            for (name, _), stats in zip(items, host):
+                counts = stats[:num_bins]
+                tmin, tmax, num_finite = stats[num_bins:]
+                # skip if all values are nan or inf
+                if not num_finite:
+                    continue
+                bins = torch.linspace(tmin, tmax, steps=num_bins + 1)
+                row[name] = wandb.Histogram(np_histogram=(counts, bins.tolist()))
+        history._row_update(row)
+
     def _hook_variable_gradient_stats(self, var, name, log_track):
         """Logs a Variable's gradient's distribution statistics next time backward()
         is called on it.
@@ -277,7 +370,7 @@ class TorchHistory(object):
         def _callback(grad, log_track):
             if not log_track_update(log_track):
                 return
-            self.log_tensor_stats(grad.data, name)
+            self._queue_tensor_stats(grad.data, name)
 
         handle = var.register_hook(lambda grad: _callback(grad, log_track))
         self._hook_handles[name] = handle